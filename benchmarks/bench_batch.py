@@ -0,0 +1,40 @@
+"""
+Throughput of slackify_many() across 1..N worker processes versus a serial
+slackify_markdown() loop.
+
+Run with:
+
+    PYTHONPATH=src python benchmarks/bench_batch.py [max_workers]
+"""
+
+import os
+import sys
+import time
+
+from slackify_markdown import slackify_many, slackify_markdown
+
+MESSAGES = [
+    "*Alert* `disk` on **host-{0}** at 9{1}%\n\n- <@U{0}> owns it\n- [runbook](https://example.com/{0})".format(
+        i, i % 10
+    )
+    for i in range(20_000)
+]
+
+
+def _throughput(func) -> float:
+    start = time.perf_counter()
+    func()
+    return len(MESSAGES) / (time.perf_counter() - start)
+
+
+def main(max_workers: int) -> None:
+    serial = _throughput(lambda: [slackify_markdown(m) for m in MESSAGES])
+    print(f"{len(MESSAGES)} messages, {os.cpu_count()} CPUs")
+    print(f"serial loop:   {serial:10.0f} msg/s")
+    for workers in range(1, max_workers + 1):
+        rate = _throughput(lambda: slackify_many(MESSAGES, workers=workers))
+        print(f"workers={workers:<3}    {rate:10.0f} msg/s  ({rate / serial:.2f}x)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else (os.cpu_count() or 1))
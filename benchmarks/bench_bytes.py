@@ -0,0 +1,93 @@
+"""
+UTF-8 in, UTF-8 out: slackify_bytes() on bytes and on a memoryview, against
+decoding, calling slackify_markdown() and encoding. Reports per-call time,
+and from tracemalloc the peak memory of one call as a multiple of the input
+size (roughly how many copies of the input are alive at once) and the number
+of allocations still counted at that peak.
+
+Run with:
+
+    PYTHONPATH=src python benchmarks/bench_bytes.py
+"""
+
+import timeit
+import tracemalloc
+from typing import Callable, Tuple
+
+from corpus import GENERATORS
+from slackify_markdown import slackify_bytes, slackify_markdown
+
+REPEAT = 7
+TIMING_SECONDS = 0.05
+
+
+def _plain_ascii(size: int, seed: int = 0) -> str:
+    # A chat message without markdown: the ASCII fast path.
+    line = "deploy 1234 finished on cluster eu-3, <@U042> ping & check > 5 nodes\n"
+    return line * max(1, size // len(line))
+
+
+def _utf8_plain(size: int, seed: int = 0) -> str:
+    line = "déploiement terminé sur le cluster, <@U042> vérifiez les nœuds\n"
+    return line * max(1, size // len(line))
+
+
+CASES = {
+    "plain ascii": _plain_ascii,
+    "plain utf-8": _utf8_plain,
+    "markdown": GENERATORS["paragraphs"],
+    "log": GENERATORS["log"],
+}
+SIZES = (200, 20_000, 1_000_000)
+
+
+def _via_str(data: bytes) -> bytes:
+    return slackify_markdown(data.decode("utf-8")).encode("utf-8")
+
+
+def _memory(func: Callable[[], object]) -> Tuple[int, int]:
+    func()
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    blocks = sum(
+        stat.count for stat in tracemalloc.take_snapshot().statistics("filename")
+    )
+    tracemalloc.stop()
+    return peak, blocks
+
+
+def _best(func: Callable[[], object]) -> float:
+    number = max(1, int(TIMING_SECONDS / timeit.timeit(func, number=1)))
+    return min(timeit.timeit(func, number=number) / number for _ in range(REPEAT))
+
+
+def main() -> None:
+    print(
+        f"{'case':<12} {'size':>9} {'path':<11} {'per call':>11} {'speedup':>8}"
+        f" {'peak/input':>11}"
+    )
+    for name, generate in CASES.items():
+        for size in SIZES:
+            data = generate(size, seed=1).encode("utf-8")
+            view = memoryview(data)
+            paths = [
+                ("str", lambda: _via_str(data)),
+                ("bytes", lambda: slackify_bytes(data)),
+                ("memoryview", lambda: slackify_bytes(view)),
+            ]
+            assert len({func() for _, func in paths}) == 1
+            baseline = None
+            for path, func in paths:
+                seconds = _best(func)
+                peak, _ = _memory(func)
+                baseline = baseline or seconds
+                print(
+                    f"{name:<12} {len(data):>9} {path:<11} {seconds * 1e6:>9.1f}us"
+                    f" {baseline / seconds:>7.2f}x {peak / len(data):>10.2f}x"
+                )
+
+
+if __name__ == "__main__":
+    main()
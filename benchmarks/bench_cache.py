@@ -0,0 +1,56 @@
+"""
+Replay a skewed (Zipf-like) workload of repeated messages through a
+SlackifyConverter with and without a ConversionCache.
+
+Run with:
+
+    PYTHONPATH=src python benchmarks/bench_cache.py
+"""
+
+import random
+import time
+
+from slackify_markdown import ConversionCache, SlackifyConverter
+
+DISTINCT = 500
+REQUESTS = 20_000
+
+
+def _workload():
+    templates = [
+        "*Alert {0}*: `cpu` above **9{1}%** on host-{0}\n\n- <@U{0}> on call\n- [runbook](https://example.com/{0})".format(
+            i, i % 10
+        )
+        for i in range(DISTINCT)
+    ]
+    rng = random.Random(42)
+    # Weight of rank r is 1/r: a few templates dominate, with a long tail.
+    weights = [1 / (rank + 1) for rank in range(DISTINCT)]
+    return rng.choices(templates, weights=weights, k=REQUESTS)
+
+
+def _replay(converter, workload) -> float:
+    start = time.perf_counter()
+    for markdown in workload:
+        converter.convert(markdown)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    workload = _workload()
+    uncached = _replay(SlackifyConverter(), workload)
+    cached_converter = SlackifyConverter(cache=ConversionCache(max_entries=256))
+    cached = _replay(cached_converter, workload)
+    info = cached_converter.cache_info()
+
+    print(f"{REQUESTS} requests over {DISTINCT} distinct messages")
+    print(f"uncached:  {uncached:7.3f} s")
+    print(f"cached:    {cached:7.3f} s  ({uncached / cached:.1f}x)")
+    print(
+        f"hit rate:  {info.hits / (info.hits + info.misses):.1%}  "
+        f"evictions={info.evictions} bytes={info.bytes}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Per-call overhead of a fresh SlackifyMarkdown(...).slackify() versus a reused
+SlackifyConverter.
+
+Run with:
+
+    PYTHONPATH=src python benchmarks/bench_converter.py
+"""
+
+import timeit
+
+from slackify_markdown import SlackifyConverter
+from slackify_markdown.slackify import SlackifyMarkdown
+
+# Roughly the size of a typical notification message (~200 bytes).
+MESSAGE = (
+    "*Deploy* of `api` to **production** finished.\n\n"
+    "- 3 services restarted\n"
+    "- <@U12345> please verify\n\n"
+    "[Dashboard](https://example.com/dash) for details."
+)
+
+
+def main(number: int = 2000) -> None:
+    converter = SlackifyConverter()
+    assert converter.convert(MESSAGE) == SlackifyMarkdown(MESSAGE).slackify()
+
+    fresh = min(
+        timeit.repeat(
+            lambda: SlackifyMarkdown(MESSAGE).slackify(), number=number, repeat=5
+        )
+    )
+    reused = min(
+        timeit.repeat(lambda: converter.convert(MESSAGE), number=number, repeat=5)
+    )
+
+    print(f"message size:           {len(MESSAGE)} bytes")
+    print(f"fresh parser per call:  {fresh / number * 1e6:8.1f} us/call")
+    print(f"reused converter:       {reused / number * 1e6:8.1f} us/call")
+    print(f"speedup:                {fresh / reused:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
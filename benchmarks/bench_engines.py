@@ -0,0 +1,47 @@
+"""
+Render time of the "tokens" engine (SlackifyMarkdown) versus the "tree"
+engine (SlackifyTreeRenderer) on large documents, with parsing excluded and
+included.
+
+Run with:
+
+    PYTHONPATH=src python benchmarks/bench_engines.py
+"""
+
+import timeit
+
+from corpus import GENERATORS
+from slackify_markdown import SlackifyConverter
+
+SIZE = 500_000
+REPEAT = 2
+
+
+def _best(func) -> float:
+    return min(timeit.repeat(func, number=1, repeat=REPEAT))
+
+
+def main() -> None:
+    tokens = SlackifyConverter()
+    tree = SlackifyConverter(engine="tree")
+    renderer = tokens._md.renderer
+    options = tokens._md.options
+
+    print(
+        f"{'corpus':<14} {'tokens render':>14} {'tree render':>12} {'tokens total':>13} {'tree total':>11}"
+    )
+    for name, generate in GENERATORS.items():
+        text = generate(SIZE, seed=1)
+        parsed = tokens._parse(text)
+        token_render = _best(lambda: renderer.render(parsed, options, {}))
+        tree_render = _best(lambda: tree._tree_renderer.render(parsed))
+        token_total = _best(lambda: tokens.convert(text))
+        tree_total = _best(lambda: tree.convert(text))
+        print(
+            f"{name:<14} {token_render:>13.3f}s {tree_render:>11.3f}s "
+            f"{token_total:>12.3f}s {tree_total:>10.3f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Plain-text fast path on a realistic mix of short chat messages: status
+updates and bot acknowledgements without any markdown, some with mentions,
+and a share of formatted messages that still need the full parse.
+
+Run with:
+
+    PYTHONPATH=src python benchmarks/bench_fastpath.py
+"""
+
+import random
+import timeit
+from typing import List
+
+from slackify_markdown import SlackifyConverter
+from slackify_markdown.fastpath import is_plain_text
+
+MESSAGES = 2000
+REPEAT = 5
+
+_PLAIN = [
+    "Deploy of api-gateway finished in 4m12s",
+    "ok",
+    "Thanks! Looking into it now.",
+    "Build 4821 passed on main",
+    "Rolling back canary in us-east-1, error rate above 2% for 5 minutes",
+    "Ack, paging the on-call owner",
+    "Nightly backup completed: 148 GB, 0 errors",
+]
+_MENTIONS = [
+    "<@U024BE7LH> can you take a look? Latency > 800ms again",
+    "Heads up <!here>: maintenance window starts at 22:00 UTC",
+    "Moved to <#C0G9QF9GW|incidents> & tagged <@U0G9QF9C6>",
+]
+_MARKDOWN = [
+    "*Deploy failed* for `billing-worker`, see <https://ci.example.com/runs/4821|run 4821>",
+    "**Summary**\n- 3 alerts fired\n- 1 page\n- _no_ customer impact",
+    "Runbook: [restart steps](https://wiki.example.com/runbooks/restart)",
+    "> Latency SLO burned 40% of budget\n\nInvestigating `cache` misses",
+]
+
+
+def message_mix(count: int, seed: int = 0) -> List[str]:
+    # Roughly 60% plain, 25% plain with mentions, 15% formatted.
+    rng = random.Random(seed)
+    mix = []
+    for _ in range(count):
+        roll = rng.random()
+        pool = _PLAIN if roll < 0.6 else _MENTIONS if roll < 0.85 else _MARKDOWN
+        mix.append(rng.choice(pool))
+    return mix
+
+
+def main() -> None:
+    messages = message_mix(MESSAGES)
+    fast = SlackifyConverter()
+    full = SlackifyConverter()
+    full._fast_path = False
+    assert [fast.convert(m) for m in messages] == [full.convert(m) for m in messages]
+
+    hits = sum(is_plain_text(m) for m in messages)
+    best = {"full": float("inf"), "fast": float("inf")}
+    for _ in range(REPEAT):
+        for name, converter in (("full", full), ("fast", fast)):
+            elapsed = timeit.timeit(
+                lambda: [converter.convert(m) for m in messages], number=1
+            )
+            best[name] = min(best[name], elapsed)
+
+    print(f"messages: {MESSAGES}, fast-path hits: {hits / MESSAGES:.0%}")
+    for name in ("full", "fast"):
+        print(f"{name:<5} {best[name] / MESSAGES * 1e6:8.1f}us per message")
+    print(f"speedup: {best['full'] / best['fast']:.2f}x")
+    plain = _PLAIN[0]
+    for name, converter in (("full", full), ("fast", fast)):
+        timings = timeit.repeat(
+            lambda: converter.convert(plain), number=2000, repeat=REPEAT
+        )
+        per_call = min(timings) / 2000
+        print(f"plain message, {name:<5} {per_call * 1e6:8.2f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Cold start: wall time of importing slackify_markdown and of the first
+conversion, each in a fresh interpreter, with the import-time budget the
+lazy package import has to stay within.
+
+Every scenario runs ``--runs`` times, interleaved, with bytecode cached in a
+temporary PYTHONPYCACHEPREFIX (as for an installed package). The script
+exits with status 1 if a budgeted scenario takes longer than
+``--budget-ms`` at best, or imports markdown-it, asyncio or
+multiprocessing. Run with:
+
+    PYTHONPATH=src python benchmarks/bench_import.py [--runs 15] [--budget-ms 10]
+
+``--breakdown`` also prints the slowest modules ``-X importtime`` reports
+for each scenario.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Tuple
+
+# Modules that the package import must not load.
+HEAVY_MODULES = (
+    "markdown_it",
+    "asyncio",
+    "multiprocessing",
+    "concurrent.futures.process",
+)
+
+SAMPLE = (
+    "# Release\\n\\nShipped *v2* to [prod](https://example.com), thanks <@U123>!\\n"
+)
+
+# (label, statement, budgeted)
+SCENARIOS: List[Tuple[str, str, bool]] = [
+    ("python -c pass", "pass", False),
+    ("import slackify_markdown", "import slackify_markdown", True),
+    (
+        "from ... import slackify_markdown",
+        "from slackify_markdown import slackify_markdown",
+        True,
+    ),
+    ("from ... import * (every module)", "from slackify_markdown import *", False),
+    ("import + warmup()", "from slackify_markdown import warmup; warmup()", False),
+    (
+        "import + first conversion",
+        f"from slackify_markdown import slackify_markdown; slackify_markdown('{SAMPLE}')",
+        False,
+    ),
+    ("import slackify_markdown.cli", "import slackify_markdown.cli", False),
+]
+
+_CHILD = """\
+import sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+heavy = [name for name in {heavy!r} if name in sys.modules]
+print(elapsed * 1000, ",".join(heavy) or "-")
+"""
+
+
+def run_once(
+    statement: str, env: Dict[str, str], importtime: bool = False
+) -> Tuple[float, str, str]:
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    command += ["-c", _CHILD.format(statement=statement, heavy=HEAVY_MODULES)]
+    result = subprocess.run(
+        command, env=env, check=True, capture_output=True, text=True
+    )
+    elapsed, heavy = result.stdout.split()
+    return float(elapsed), heavy, result.stderr
+
+
+def top_level_imports(importtime_log: str) -> Dict[str, int]:
+    """
+    Cumulative microseconds of the top-level entries of an ``-X importtime``
+    log.
+    """
+    entries = {}
+    for line in importtime_log.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not name.startswith("  "):
+            entries[name.strip()] = int(cumulative)
+    return entries
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=15)
+    parser.add_argument("--budget-ms", type=float, default=10.0)
+    parser.add_argument("--breakdown", action="store_true")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    with tempfile.TemporaryDirectory() as pycache:
+        env["PYTHONPYCACHEPREFIX"] = pycache
+        # Compile and cache everything once before timing.
+        for _, statement, _ in SCENARIOS:
+            run_once(statement, env)
+
+        times: Dict[str, List[float]] = {label: [] for label, _, _ in SCENARIOS}
+        heavy: Dict[str, str] = {}
+        for _ in range(args.runs):
+            for label, statement, _ in SCENARIOS:
+                elapsed, loaded, _ = run_once(statement, env)
+                times[label].append(elapsed)
+                heavy[label] = loaded
+
+        startup = top_level_imports(run_once("pass", env, True)[2])
+        print(
+            f"{'scenario':<36} {'best ms':>8} {'median ms':>10}  heavy modules loaded"
+        )
+        failures = []
+        for label, statement, budgeted in SCENARIOS:
+            best = min(times[label])
+            print(
+                f"{label:<36} {best:>8.2f} {statistics.median(times[label]):>10.2f}  {heavy[label]}"
+            )
+            if budgeted and best > args.budget_ms:
+                failures.append(
+                    f"{label}: {best:.2f} ms > {args.budget_ms:g} ms budget"
+                )
+            if budgeted and heavy[label] != "-":
+                failures.append(f"{label}: imports {heavy[label]}")
+            if args.breakdown:
+                # The statement's own imports, slowest first.
+                imports = top_level_imports(run_once(statement, env, True)[2])
+                slowest = sorted(
+                    (cumulative, name)
+                    for name, cumulative in imports.items()
+                    if name not in startup
+                )[::-1]
+                for cumulative, name in slowest[:5]:
+                    print(f"    {cumulative / 1000:>8.2f} ms  {name}")
+
+    if failures:
+        print("\nover budget:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Cost of mirroring edits of a long message: IncrementalSlackifier.update()
+versus re-running slackify_markdown() on the whole edited text, for one
+changed line at a random position per edit.
+
+Run with:
+
+    PYTHONPATH=src python benchmarks/bench_incremental.py
+"""
+
+import random
+import time
+from typing import List
+
+from slackify_markdown import IncrementalSlackifier, slackify_markdown
+
+SECTION = (
+    "## Step {0}\n\n"
+    "Run the **migration** with `tool --step {0}` and check <@U{0}>'s notes.\n\n"
+    "- verify the _output_\n- compare with [docs](https://example.com/{0})\n\n"
+    "```bash\ntool --step {0}\n```\n\n"
+)
+EDITS = 50
+
+
+def _versions(sections: int) -> List[str]:
+    """
+    The document, then EDITS versions that each change one more line.
+    """
+    rng = random.Random(sections)
+    lines = "".join(SECTION.format(i) for i in range(sections)).split("\n")
+    versions = ["\n".join(lines)]
+    for edit in range(EDITS):
+        idx = rng.randrange(len(lines))
+        if lines[idx] and not lines[idx].startswith(("#", "```", "- ")):
+            lines[idx] += " _edit {}_".format(edit)
+        versions.append("\n".join(lines))
+    return versions
+
+
+def _incremental(versions: List[str]) -> float:
+    handle = IncrementalSlackifier()
+    handle.update(versions[0])
+    start = time.perf_counter()
+    for version in versions[1:]:
+        handle.update(version)
+    return time.perf_counter() - start
+
+
+def _reconvert(versions: List[str]) -> float:
+    start = time.perf_counter()
+    for version in versions[1:]:
+        slackify_markdown(version)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    print(
+        f"{'sections':>8} {'chars':>8} {'incremental ms':>15} {'re-convert ms':>14} {'speedup':>8}"
+    )
+    for sections in (5, 20, 80, 320):
+        versions = _versions(sections)
+        incremental = min(_incremental(versions) for _ in range(3)) / EDITS
+        reconvert = min(_reconvert(versions) for _ in range(3)) / EDITS
+        print(
+            f"{sections:>8} {len(versions[-1]):>8} {incremental * 1e3:>15.3f}"
+            f" {reconvert * 1e3:>14.3f} {reconvert / incremental:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
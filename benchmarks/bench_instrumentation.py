@@ -0,0 +1,75 @@
+"""
+Cost of the instrumentation hooks: per-call time of SlackifyConverter.convert()
+with no observer (the default) and with a HistogramObserver, against the bare
+parse-and-render the converter wraps.
+
+Run with:
+
+    PYTHONPATH=src python benchmarks/bench_instrumentation.py
+"""
+
+import timeit
+
+from corpus import GENERATORS
+from slackify_markdown import HistogramObserver, SlackifyConverter
+from slackify_markdown.slackify import SlackifyMarkdown
+
+# (size in characters, conversions per timing)
+SIZES = ((20, 1000), (200, 200), (20_000, 3))
+REPEAT = 7
+
+
+def _best_interleaved(funcs, number: int):
+    """
+    Best per-call time of each function, timing them in turn on every
+    repeat so machine noise hits all of them alike.
+    """
+    best = [float("inf")] * len(funcs)
+    for _ in range(REPEAT):
+        for idx, func in enumerate(funcs):
+            best[idx] = min(best[idx], timeit.timeit(func, number=number) / number)
+    return best
+
+
+def main() -> None:
+    disabled = SlackifyConverter()
+    enabled = SlackifyConverter(observer=HistogramObserver())
+    md = disabled._md
+    sentinel = SlackifyMarkdown.NEW_LINE
+
+    def bare(text: str) -> str:
+        return md.render(text.replace(sentinel, ""))
+
+    print(
+        f"{'corpus':<14} {'size':>7} {'bare':>10} {'disabled':>10} {'overhead':>9} {'enabled':>10} {'overhead':>9}"
+    )
+    for name, generate in GENERATORS.items():
+        for size, number in SIZES:
+            text = generate(size, seed=1)
+            bare_time, disabled_time, enabled_time = _best_interleaved(
+                [
+                    lambda: bare(text),
+                    lambda: disabled.convert(text),
+                    lambda: enabled.convert(text),
+                ],
+                number,
+            )
+            print(
+                f"{name:<14} {size:>7} {bare_time * 1e6:>8.1f}us "
+                f"{disabled_time * 1e6:>8.1f}us {disabled_time / bare_time - 1:>8.1%} "
+                f"{enabled_time * 1e6:>8.1f}us {enabled_time / bare_time - 1:>8.1%}"
+            )
+
+    # Machine noise on whole conversions easily exceeds the disabled path's
+    # cost, so also time the one extra check it adds on its own.
+    check, tiny = _best_interleaved(
+        [lambda: disabled.observer is not None, lambda: disabled.convert("hi")], 100_000
+    )
+    print(
+        f"\ndisabled path adds one check: {check * 1e9:.1f}ns per call, "
+        f"{check / tiny:.3%} of converting 'hi'"
+    )
+
+
+if __name__ == "__main__":
+    main()
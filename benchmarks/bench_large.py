@@ -0,0 +1,100 @@
+"""
+Large-document mode: slackify_large() across 1..N worker processes versus
+serial slackify_markdown() on a multi-megabyte mixed document, with wall time
+and peak resident memory of the whole process tree.
+
+Every mode runs in a fresh child process so peak RSS figures don't carry over
+between modes. Run with:
+
+    PYTHONPATH=src python benchmarks/bench_large.py [--size-mb 10] [--workers 4]
+"""
+
+import argparse
+import hashlib
+import os
+import resource
+import subprocess
+import sys
+import time
+from typing import List
+
+from corpus import GENERATORS
+
+_PIECE_CHARS = 20_000
+
+
+def document(size: int, seed: int = 0) -> str:
+    """
+    A runbook-like document: every corpus class in turn, in 20 KB pieces.
+    """
+    parts: List[str] = []
+    total = 0
+    names = sorted(GENERATORS)
+    while total < size:
+        generate = GENERATORS[names[len(parts) % len(names)]]
+        part = generate(_PIECE_CHARS, seed=seed + len(parts))
+        parts.append(part)
+        total += len(part) + 2
+    return "\n\n".join(parts)
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is in KiB on Linux; the largest worker stands in for the pool.
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return (own + children) / 1024
+
+
+def _child(mode: str, size: int, workers: int) -> None:
+    from slackify_markdown import slackify_large, slackify_markdown
+
+    text = document(size)
+    start = time.perf_counter()
+    if mode == "serial":
+        output = slackify_markdown(text)
+    else:
+        output = slackify_large(text, workers=workers)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{elapsed:.3f} {_peak_rss_mb():.1f} {hashlib.sha1(output.encode()).hexdigest()}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size-mb", type=float, default=10)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--child", nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        mode, size, workers = args.child
+        _child(mode, int(size), int(workers))
+        return
+
+    size = int(args.size_mb * 1_000_000)
+    modes = [("serial", 1)] + [
+        ("large", workers)
+        for workers in sorted({1, 2, args.workers})
+        if workers <= args.workers
+    ]
+    print(f"document: {size / 1e6:g} MB, {os.cpu_count()} CPUs")
+    print(f"{'mode':<16} {'seconds':>9} {'speedup':>8} {'peak RSS MB':>12}")
+    baseline = None
+    expected_hash = None
+    for mode, workers in modes:
+        out = subprocess.run(
+            [sys.executable, __file__, "--child", mode, str(size), str(workers)],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.split()
+        elapsed, rss, output_hash = float(out[0]), float(out[1]), out[2]
+        expected_hash = expected_hash or output_hash
+        assert output_hash == expected_hash, "output differs from the serial path"
+        baseline = baseline or elapsed
+        label = mode if mode == "serial" else f"large x{workers}"
+        print(f"{label:<16} {elapsed:>9.2f} {baseline / elapsed:>7.2f}x {rss:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
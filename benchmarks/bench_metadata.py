@@ -0,0 +1,75 @@
+"""
+Cost of collecting entities: SlackifyConverter.convert() against
+convert_with_metadata(), and against convert() followed by regex re-scans of
+the output for links, mentions and code blocks.
+
+Run with:
+
+    PYTHONPATH=src python benchmarks/bench_metadata.py
+"""
+
+import re
+import timeit
+from typing import Dict, List
+
+from corpus import GENERATORS
+from slackify_markdown import SlackifyConverter
+
+SIZES = (200, 20_000)
+REPEAT = 9
+# Each timing converts the input often enough to take about this long.
+TIMING_SECONDS = 0.05
+
+_LINK_RE = re.compile(r"<(https?://[^|>]+)")
+_MENTION_RE = re.compile(r"<[@#!][^>]*>")
+_CODE_RE = re.compile(r"^```\n(.*?)^```$", re.MULTILINE | re.DOTALL)
+
+
+def _rescan(output: str) -> Dict[str, List]:
+    """
+    What a caller does without convert_with_metadata(): one regex pass over
+    the output per entity kind.
+    """
+    return {
+        "links": _LINK_RE.findall(output),
+        "mentions": _MENTION_RE.findall(output),
+        "code_blocks": [len(code) for code in _CODE_RE.findall(output)],
+    }
+
+
+def _best_interleaved(funcs, number: int):
+    best = [float("inf")] * len(funcs)
+    for _ in range(REPEAT):
+        for idx, func in enumerate(funcs):
+            best[idx] = min(best[idx], timeit.timeit(func, number=number) / number)
+    return best
+
+
+def main() -> None:
+    converter = SlackifyConverter()
+    print(
+        f"{'corpus':<14} {'size':>7} {'convert':>11} {'metadata':>11} {'overhead':>9}"
+        f" {'re-scan':>11} {'overhead':>9}"
+    )
+    for name, generate in GENERATORS.items():
+        for size in SIZES:
+            text = generate(size, seed=1)
+            once = timeit.timeit(lambda: converter.convert(text), number=1)
+            number = max(1, int(TIMING_SECONDS / once))
+            plain, collected, rescanned = _best_interleaved(
+                [
+                    lambda: converter.convert(text),
+                    lambda: converter.convert_with_metadata(text),
+                    lambda: _rescan(converter.convert(text)),
+                ],
+                number,
+            )
+            print(
+                f"{name:<14} {size:>7} {plain * 1e3:>9.3f}ms {collected * 1e3:>9.3f}ms"
+                f" {collected / plain - 1:>8.1%} {rescanned * 1e3:>9.3f}ms"
+                f" {rescanned / plain - 1:>8.1%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
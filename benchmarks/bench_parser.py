@@ -0,0 +1,43 @@
+"""
+Parse time of the full gfm-like preset versus the pruned mrkdwn rule set
+(``MRKDWN_RULES``), per corpus class, for short messages and large documents.
+
+Run with:
+
+    PYTHONPATH=src python benchmarks/bench_parser.py
+"""
+
+import timeit
+
+from corpus import GENERATORS
+from slackify_markdown.slackify import SlackifyMarkdown, build_parser
+
+# (size in characters, parses per timing)
+SIZES = ((300, 500), (200_000, 2))
+REPEAT = 5
+
+
+def _best(func, number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=REPEAT)) / number
+
+
+def main() -> None:
+    full = build_parser(SlackifyMarkdown, pruned=False)
+    pruned = build_parser(SlackifyMarkdown)
+
+    print(f"{'corpus':<14} {'size':>8} {'full':>10} {'pruned':>10} {'saved':>7}")
+    for name, generate in GENERATORS.items():
+        for size, number in SIZES:
+            text = generate(size, seed=1)
+            assert full.render(text) == pruned.render(text)
+            full_time = _best(lambda: full.parse(text), number)
+            pruned_time = _best(lambda: pruned.parse(text), number)
+            saved = 1 - pruned_time / full_time
+            print(
+                f"{name:<14} {size:>8} {full_time * 1000:>8.3f}ms "
+                f"{pruned_time * 1000:>8.3f}ms {saved:>6.1%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
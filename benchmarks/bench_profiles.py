@@ -0,0 +1,77 @@
+"""
+Cost of customizing the output: a SlackifyConverter with a RenderProfile
+against the default converter, and against the default converter followed
+by the regex passes a caller needs to get the same output from the default
+(swap the bullet glyphs, halve the indentation, restyle headings).
+
+Run with:
+
+    PYTHONPATH=src python benchmarks/bench_profiles.py
+"""
+
+import re
+import timeit
+
+from corpus import GENERATORS
+from slackify_markdown import RenderProfile, SlackifyConverter
+
+SIZES = (200, 20_000)
+REPEAT = 9
+# Each timing converts the input often enough to take about this long.
+TIMING_SECONDS = 0.05
+
+PROFILE = RenderProfile(
+    bullets=("-",), indent="  ", heading_format="*{text}* :pushpin:"
+)
+
+_BULLET_RE = re.compile(r"^((?:    )*)[•◦▪]   ", re.MULTILINE)
+_HEADING_RE = re.compile(r"^(\*[^\n]*\*)$", re.MULTILINE)
+
+
+def _rewrite(output: str) -> str:
+    """
+    What a caller does without a profile. The heading pass can't tell a
+    heading from a bold-only paragraph, so it is only right on documents
+    without those.
+    """
+    output = _BULLET_RE.sub(lambda m: "  " * (len(m.group(1)) // 4) + "-   ", output)
+    return _HEADING_RE.sub(r"\1 :pushpin:", output)
+
+
+def _best_interleaved(funcs, number: int):
+    best = [float("inf")] * len(funcs)
+    for _ in range(REPEAT):
+        for idx, func in enumerate(funcs):
+            best[idx] = min(best[idx], timeit.timeit(func, number=number) / number)
+    return best
+
+
+def main() -> None:
+    default = SlackifyConverter()
+    profiled = SlackifyConverter(profile=PROFILE)
+    print(
+        f"{'corpus':<14} {'size':>7} {'default':>11} {'profile':>11} {'overhead':>9}"
+        f" {'rewrite':>11} {'overhead':>9}"
+    )
+    for name, generate in GENERATORS.items():
+        for size in SIZES:
+            text = generate(size, seed=1)
+            once = timeit.timeit(lambda: default.convert(text), number=1)
+            number = max(1, int(TIMING_SECONDS / once))
+            plain, custom, rewritten = _best_interleaved(
+                [
+                    lambda: default.convert(text),
+                    lambda: profiled.convert(text),
+                    lambda: _rewrite(default.convert(text)),
+                ],
+                number,
+            )
+            print(
+                f"{name:<14} {size:>7} {plain * 1e3:>9.3f}ms {custom * 1e3:>9.3f}ms"
+                f" {custom / plain - 1:>8.1%} {rewritten * 1e3:>9.3f}ms"
+                f" {rewritten / plain - 1:>8.1%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Cost of streaming an LLM-style answer token by token: StreamingSlackifier
+versus re-running slackify_markdown() on the whole buffer after every token,
+and streaming one long list or fence, which stays open until it ends.
+
+Run with:
+
+    PYTHONPATH=src python benchmarks/bench_streaming.py
+"""
+
+import time
+
+from slackify_markdown import StreamingSlackifier, slackify_markdown
+
+SECTION = (
+    "## Step {0}\n\n"
+    "Run the **migration** with `tool --step {0}` and check <@U{0}>'s notes.\n\n"
+    "- verify the _output_\n- compare with [docs](https://example.com/{0})\n\n"
+    "```bash\ntool --step {0}\n```\n\n"
+)
+
+
+# One block that keeps growing: the open block is what gets re-parsed.
+LIST_ITEM = "- step {0}: run **migration** `{0}` and ping <@U{0}>\n"
+FENCE_LINE = "tool --step {0} --notes 'a < b & c'\n"
+
+
+def _split(text: str):
+    # LLM tokens are roughly 4 characters long.
+    bounds = range(0, len(text) + 4, 4)
+    return [text[start:end] for start, end in zip(bounds, bounds[1:])]
+
+
+def _tokens(sections: int):
+    return _split("".join(SECTION.format(i) for i in range(sections)))
+
+
+def _long_list(items: int):
+    return _split("".join(LIST_ITEM.format(i) for i in range(items)))
+
+
+def _long_fence(lines: int):
+    return _split(
+        "```\n" + "".join(FENCE_LINE.format(i) for i in range(lines)) + "```\n"
+    )
+
+
+def _streaming(tokens) -> float:
+    start = time.perf_counter()
+    stream = StreamingSlackifier()
+    for token in tokens:
+        stream.feed(token)
+    stream.finish()
+    return time.perf_counter() - start
+
+
+def _reconvert(tokens) -> float:
+    start = time.perf_counter()
+    buffer = ""
+    for token in tokens:
+        buffer += token
+        slackify_markdown(buffer)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    print(f"{'sections':>8} {'tokens':>7} {'streaming s':>12} {'re-convert s':>13}")
+    for sections in (5, 10, 20, 40):
+        tokens = _tokens(sections)
+        reconvert = _reconvert(tokens) if sections <= 20 else float("nan")
+        print(
+            f"{sections:>8} {len(tokens):>7} {_streaming(tokens):>12.3f} {reconvert:>13.3f}"
+        )
+    print()
+    # Doubling the block should about double the time.
+    print(f"{'lines':>8} {'tokens':>7} {'list s':>12} {'fence s':>13}")
+    for lines in (250, 500, 1000):
+        items, fence = _long_list(lines), _long_fence(lines)
+        print(
+            f"{lines:>8} {len(items):>7} {_streaming(items):>12.3f} {_streaming(fence):>13.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Filling markdown templates: MessageTemplate.render() from
+compile_template() against formatting the template and converting the
+result with SlackifyConverter.convert() every time, and the one-off cost of
+compiling a template.
+
+Run with:
+
+    PYTHONPATH=src python benchmarks/bench_templates.py
+"""
+
+import timeit
+from typing import Any, Dict
+
+from slackify_markdown import SlackifyConverter, compile_template
+
+REPEAT = 9
+# Each timing fills the template often enough to take about this long.
+TIMING_SECONDS = 0.05
+
+TEMPLATES: Dict[str, str] = {
+    "short alert": ":rotating_light: *{service}* is {state}, paged <@{owner}>",
+    "deploy notice": (
+        "# Deployed {service} {version}\n\n"
+        "- **Environment** {env}\n"
+        "- **By** <@{owner}>\n"
+        "- **Changes** [{count} commits]({compare_url})\n\n"
+        "> {summary}\n"
+    ),
+    "incident report": (
+        "# Incident {number}: {title}\n\n"
+        "**Status** {state} since `{since}`\n\n"
+        "## Impact\n\n{summary}\n\n"
+        "## Timeline\n\n"
+        "1. Detected by {detector}\n"
+        "2. Paged <@{owner}>\n"
+        "3. Mitigated: {mitigation}\n\n"
+        "## Log\n\n```\n{log}\n```\n\n"
+        "See the [runbook]({runbook}) and [dashboard]({dashboard}).\n"
+    ),
+}
+
+VALUES: Dict[str, Any] = {
+    "service": "billing-api",
+    "state": "degraded",
+    "owner": "U024BE7LH",
+    "version": "v2.31.0",
+    "env": "production",
+    "count": 14,
+    "compare_url": "https://github.com/acme/billing/compare/v2.30.0...v2.31.0",
+    "summary": "Checkout latency above 2 s for 5% of requests & retries piling up",
+    "number": 482,
+    "title": "Slow checkouts",
+    "since": "2024-05-01T10:42Z",
+    "detector": "latency SLO alert",
+    "mitigation": "rolled back to v2.30.0",
+    "log": "ERROR timeout after 2000ms <upstream=payments>\n" * 3,
+    "runbook": "https://wiki.example.com/runbooks/billing",
+    "dashboard": "https://grafana.example.com/d/billing",
+}
+
+
+def _best_interleaved(funcs, number: int):
+    best = [float("inf")] * len(funcs)
+    for _ in range(REPEAT):
+        for idx, func in enumerate(funcs):
+            best[idx] = min(best[idx], timeit.timeit(func, number=number) / number)
+    return best
+
+
+def main() -> None:
+    converter = SlackifyConverter()
+    print(
+        f"{'template':<16} {'convert':>10} {'render':>10} {'speedup':>8} {'compile':>10}"
+    )
+    for name, source in TEMPLATES.items():
+        template = compile_template(source, converter)
+        values = {key: VALUES[key] for key in template.placeholders}
+        once = timeit.timeit(
+            lambda: converter.convert(source.format(**values)), number=1
+        )
+        number = max(1, int(TIMING_SECONDS / once))
+        convert, render, compile_ = _best_interleaved(
+            [
+                lambda: converter.convert(source.format(**values)),
+                lambda: template.render(**values),
+                lambda: compile_template(source, converter),
+            ],
+            number,
+        )
+        print(
+            f"{name:<16} {convert * 1e6:>8.1f}us {render * 1e6:>8.1f}us"
+            f" {convert / render:>7.0f}x {compile_ * 1e6:>8.1f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
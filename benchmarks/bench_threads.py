@@ -0,0 +1,131 @@
+"""
+Thread scaling of one shared SlackifyConverter: conversions per second with
+1..N threads converting a fixed mixed workload, against the two patterns
+that were safe before conversions became reentrant: a shared converter
+behind a lock, and building the parser and renderer on every call.
+
+On a GIL build no mode scales past one thread; on a free-threaded build
+(e.g. python3.13t) the shared converter should scale with the cores while
+the locked one stays flat. Run with:
+
+    PYTHONPATH=src python benchmarks/bench_threads.py [--threads 8]
+    PYTHONPATH=src python benchmarks/bench_threads.py --python python3.11 --python python3.13t
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import threading
+import time
+from typing import Callable, Dict, List
+
+from corpus import GENERATORS
+
+from slackify_markdown import SlackifyConverter
+from slackify_markdown.slackify import SlackifyMarkdown
+
+_DOC_CHARS = 2_000
+_DOCS_PER_CLASS = 20
+
+
+def workload() -> List[str]:
+    return [
+        generate(_DOC_CHARS, seed=seed)
+        for generate in GENERATORS.values()
+        for seed in range(_DOCS_PER_CLASS)
+    ]
+
+
+def run(
+    convert: Callable[[str], str], docs: List[str], threads: int, rounds: int
+) -> float:
+    """
+    Wall time for ``threads`` threads to convert ``docs`` ``rounds`` times
+    between them, each thread taking an equal share.
+    """
+    jobs = docs * rounds
+    shares = [jobs[idx::threads] for idx in range(threads)]
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(share: List[str]) -> None:
+        barrier.wait()
+        for doc in share:
+            convert(doc)
+
+    pool = [threading.Thread(target=worker, args=(share,)) for share in shares]
+    for thread in pool:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in pool:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=max(4, os.cpu_count() or 1))
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument(
+        "--python",
+        action="append",
+        help="run under these interpreters instead of this one (repeatable)",
+    )
+    args = parser.parse_args()
+    if args.python:
+        for python in args.python:
+            options = ["--threads", str(args.threads), "--rounds", str(args.rounds)]
+            subprocess.run([python, __file__] + options, check=True)
+            print()
+        return
+
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(
+        f"python {sys.version.split()[0]}, GIL {'enabled' if gil else 'disabled'}, "
+        f"{os.cpu_count()} CPUs"
+    )
+    docs = workload()
+    shared = SlackifyConverter()
+    expected = [shared.convert(doc) for doc in docs]
+    lock = threading.Lock()
+
+    def locked(doc: str) -> str:
+        with lock:
+            return shared.convert(doc)
+
+    modes: Dict[str, Callable[[str], str]] = {
+        "shared": shared.convert,
+        "shared + lock": locked,
+        "per-call parser": lambda doc: SlackifyMarkdown(doc).slackify(),
+    }
+    counts = sorted({1, args.threads} | {n for n in (2, 4) if n < args.threads})
+    print(f"{'mode':<16} {'threads':>7} {'docs/s':>9} {'scaling':>8}")
+    for name, convert in modes.items():
+        # Every mode must give the shared converter's output.
+        assert [convert(doc) for doc in docs] == expected, name
+        single = None
+        for threads in counts:
+            rate = len(docs) * args.rounds / run(convert, docs, threads, args.rounds)
+            single = single or rate
+            print(f"{name:<16} {threads:>7} {rate:>9.0f} {rate / single:>7.2f}x")
+
+    # Correctness under contention, on the full thread count.
+    failures: List[int] = []
+
+    def check(offset: int) -> None:
+        for idx in range(len(docs)):
+            pick = (idx + offset) % len(docs)
+            if shared.convert(docs[pick]) != expected[pick]:
+                failures.append(pick)
+
+    pool = [threading.Thread(target=check, args=(n,)) for n in range(args.threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    assert not failures, "shared converter output differs under contention"
+
+
+if __name__ == "__main__":
+    main()
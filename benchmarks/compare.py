@@ -0,0 +1,92 @@
+"""
+Compare two benchmark result files written by benchmarks/run.py.
+
+A case regresses when one of its metrics is worse than the baseline by more
+than the threshold. Exits with status 1 if any case regressed.
+
+Run with:
+
+    python benchmarks/compare.py baseline.json candidate.json [--threshold 0.1]
+"""
+
+import argparse
+import json
+import sys
+from typing import Any, Dict, List, Tuple
+
+# Metrics compared by default; all are "lower is better".
+METRICS = ("p50_ms", "p99_ms", "peak_mem_kb")
+
+
+def compare(
+    baseline: Dict[str, Any],
+    candidate: Dict[str, Any],
+    threshold: float,
+    metrics: Tuple[str, ...] = METRICS,
+) -> Tuple[List[str], List[str]]:
+    """
+    Return (report lines, regressed cases).
+    """
+    lines = [
+        "{:<22} {:<12} {:>12} {:>12} {:>8}".format(
+            "case", "metric", "base", "new", "change"
+        )
+    ]
+    regressed: List[str] = []
+    base_results = baseline["results"]
+    for case, new in candidate["results"].items():
+        old = base_results.get(case)
+        if old is None:
+            lines.append("{:<22} (new case)".format(case))
+            continue
+        for metric in metrics:
+            if not old[metric]:
+                continue
+            change = new[metric] / old[metric] - 1
+            flag = ""
+            if change > threshold:
+                flag = "  REGRESSION"
+                if case not in regressed:
+                    regressed.append(case)
+            lines.append(
+                "{:<22} {:<12} {:>12.3f} {:>12.3f} {:>+7.1%}{}".format(
+                    case, metric, old[metric], new[metric], change, flag
+                )
+            )
+    for case in base_results:
+        if case not in candidate["results"]:
+            lines.append("{:<22} (missing from candidate)".format(case))
+    return lines, regressed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="allowed relative slowdown before a case counts as regressed",
+    )
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+
+    lines, regressed = compare(baseline, candidate, args.threshold)
+    print("\n".join(lines))
+    if regressed:
+        print(
+            "\n{} case(s) regressed by more than {:.0%}: {}".format(
+                len(regressed), args.threshold, ", ".join(regressed)
+            )
+        )
+        sys.exit(1)
+    print("\nno regressions above {:.0%}".format(args.threshold))
+
+
+if __name__ == "__main__":
+    main()
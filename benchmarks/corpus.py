@@ -0,0 +1,143 @@
+"""
+Deterministic synthetic markdown corpus for the benchmark suite.
+
+Every generator takes a target size in characters and a seed and returns
+markdown of roughly that size, so runs on different machines or commits
+convert exactly the same inputs.
+"""
+
+import random
+from typing import Callable, Dict, List
+
+_WORDS = (
+    "deploy service latency error budget rollout canary cluster queue worker "
+    "retry timeout alert owner runbook metric region shard cache index"
+).split()
+
+
+def _sentence(rng: random.Random, words: int = 12) -> str:
+    picked = [rng.choice(_WORDS) for _ in range(words)]
+    # Sprinkle inline formatting over the sentence.
+    for i in range(0, len(picked), 5):
+        picked[i] = rng.choice(("**{}**", "_{}_", "`{}`", "~~{}~~", "{}")).format(
+            picked[i]
+        )
+    return " ".join(picked).capitalize() + "."
+
+
+def paragraphs(size: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    parts: List[str] = []
+    total = 0
+    while total < size:
+        if rng.random() < 0.1:
+            part = "## " + _sentence(rng, 4)
+        else:
+            part = " ".join(_sentence(rng) for _ in range(rng.randint(2, 5)))
+        parts.append(part)
+        total += len(part) + 2
+    return "\n\n".join(parts)
+
+
+def nested_lists(size: int, seed: int = 0, max_depth: int = 6) -> str:
+    rng = random.Random(seed)
+    lines: List[str] = []
+    total = 0
+    depth = 0
+    while total < size:
+        depth = max(0, min(max_depth - 1, depth + rng.choice((-1, 0, 1))))
+        marker = "1." if rng.random() < 0.3 else "-"
+        line = "  " * depth * 2 + marker + " " + _sentence(rng, 6)
+        lines.append(line)
+        total += len(line) + 1
+    return "\n".join(lines)
+
+
+def fences(size: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    parts: List[str] = []
+    total = 0
+    while total < size:
+        code = "\n".join(
+            "    {} = {}({})  # {}".format(
+                rng.choice(_WORDS), rng.choice(_WORDS), rng.randint(0, 99), "<&>"
+            )
+            for _ in range(rng.randint(3, 15))
+        )
+        part = _sentence(rng, 8) + "\n\n```python\n" + code + "\n\n\n```"
+        parts.append(part)
+        total += len(part) + 2
+    return "\n\n".join(parts)
+
+
+def mentions(size: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    parts: List[str] = []
+    total = 0
+    while total < size:
+        part = rng.choice(
+            (
+                "<@U{:05d}>".format(rng.randint(0, 99999)),
+                "<#C{:05d}|general>".format(rng.randint(0, 99999)),
+                "<!here>",
+                "a > b",
+                "x & y",
+                rng.choice(_WORDS),
+            )
+        )
+        parts.append(part)
+        total += len(part) + 1
+    return " ".join(parts)
+
+
+def links(size: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    parts: List[str] = []
+    total = 0
+    while total < size:
+        url = "https://example.com/{}/{}".format(
+            rng.choice(_WORDS), rng.randint(0, 999)
+        )
+        part = rng.choice(
+            (
+                "[{}]({})".format(rng.choice(_WORDS), url),
+                "<{}>".format(url),
+                "![{}]({}.png)".format(rng.choice(_WORDS), url),
+                "[**{}**]({})".format(rng.choice(_WORDS), url),
+            )
+        )
+        parts.append(part)
+        total += len(part) + 1
+    return " ".join(parts)
+
+
+def log(size: int, seed: int = 0) -> str:
+    """
+    Pasted log output: long runs of plain lines with <, > and & in them.
+    """
+    rng = random.Random(seed)
+    lines: List[str] = []
+    total = 0
+    while total < size:
+        line = "2026-05-25T12:{:02d}:{:02d}Z {} <{}> pid={} {} -> {} & done".format(
+            rng.randint(0, 59),
+            rng.randint(0, 59),
+            rng.choice(("INFO", "WARN", "ERROR")),
+            rng.choice(_WORDS),
+            rng.randint(1, 65535),
+            rng.choice(_WORDS),
+            rng.choice(_WORDS),
+        )
+        lines.append(line)
+        total += len(line) + 1
+    return "\n".join(lines)
+
+
+GENERATORS: Dict[str, Callable[..., str]] = {
+    "paragraphs": paragraphs,
+    "nested_lists": nested_lists,
+    "fences": fences,
+    "mentions": mentions,
+    "links": links,
+    "log": log,
+}
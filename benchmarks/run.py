@@ -0,0 +1,126 @@
+"""
+Run the benchmark suite and write the results to JSON.
+
+For every corpus class and size this records per-call latency percentiles,
+throughput and peak traced memory of slackify_markdown().
+
+Run with:
+
+    PYTHONPATH=src python benchmarks/run.py --output results.json [--quick]
+
+and compare two result files with benchmarks/compare.py.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, List, Tuple
+
+import markdown_it
+
+from corpus import GENERATORS
+from slackify_markdown import slackify_markdown
+
+# (characters, iterations); the multi-MB size only runs for the log class,
+# which is what people actually paste at that size.
+SIZES: List[Tuple[int, int]] = [(200, 500), (20_000, 30), (1_000_000, 3)]
+LOG_SIZES: List[Tuple[int, int]] = SIZES + [(4_000_000, 2)]
+QUICK_DIVISOR = 10
+
+
+def _size_label(size: int) -> str:
+    for unit, scale in (("MB", 1_000_000), ("KB", 1_000)):
+        if size >= scale:
+            return "{:g}{}".format(size / scale, unit)
+    return "{}B".format(size)
+
+
+def _percentile(samples: List[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def measure(text: str, iterations: int) -> Dict[str, float]:
+    slackify_markdown(text)  # warm up caches and the shared converter
+
+    samples: List[float] = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        slackify_markdown(text)
+        samples.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    slackify_markdown(text)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    mean = statistics.mean(samples)
+    return {
+        "chars": len(text),
+        "iterations": iterations,
+        "p50_ms": _percentile(samples, 0.50) * 1e3,
+        "p90_ms": _percentile(samples, 0.90) * 1e3,
+        "p99_ms": _percentile(samples, 0.99) * 1e3,
+        "mean_ms": mean * 1e3,
+        "calls_per_s": 1 / mean,
+        "mb_per_s": len(text) / mean / 1e6,
+        "peak_mem_kb": peak / 1024,
+    }
+
+
+def run(quick: bool = False) -> Dict[str, Any]:
+    results: Dict[str, Dict[str, float]] = {}
+    for name, generate in GENERATORS.items():
+        for size, iterations in LOG_SIZES if name == "log" else SIZES:
+            if quick:
+                size = max(200, size // QUICK_DIVISOR)
+                iterations = max(2, iterations // QUICK_DIVISOR)
+            case = "{}/{}".format(name, _size_label(size))
+            results[case] = measure(generate(size, seed=1), iterations)
+            print(
+                "{:<22} p50={:9.3f}ms p99={:9.3f}ms {:7.2f}MB/s peak={:9.0f}KB".format(
+                    case,
+                    results[case]["p50_ms"],
+                    results[case]["p99_ms"],
+                    results[case]["mb_per_s"],
+                    results[case]["peak_mem_kb"],
+                ),
+                file=sys.stderr,
+            )
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "markdown_it": markdown_it.__version__,
+            "quick": quick,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        },
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--output", "-o", default="-", help="JSON file, - for stdout")
+    parser.add_argument(
+        "--quick", action="store_true", help="smaller inputs, fewer runs"
+    )
+    args = parser.parse_args()
+
+    report = run(quick=args.quick)
+    if args.output == "-":
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
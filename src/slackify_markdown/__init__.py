@@ -1,6 +1,107 @@
-from .service import slackify_markdown
-from typing import List
+from __future__ import annotations
 
+import importlib
+
+# Not imported from typing, which alone costs more than the rest of this
+# module. Type checkers treat the name specially.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Dict, List
+
+    from .aio import aslackify_many, aslackify_markdown
+    from .batch import slackify_many
+    from .blockkit import slackify_blocks, slackify_sections
+    from .cache import CacheInfo, ConversionCache
+    from .chunking import slackify_chunks
+    from .converter import SlackifyConverter
+    from .guardrails import ConversionLimits, ConversionResult
+    from .incremental import IncrementalSlackifier, IncrementalUpdate
+    from .instrumentation import ConversionEvent, ConversionObserver, HistogramObserver
+    from .large import slackify_large
+    from .metadata import ConversionMetadata
+    from .profile import RenderProfile
+    from .service import (
+        slackify_bytes,
+        slackify_markdown,
+        slackify_with_metadata,
+        warmup,
+    )
+    from .streaming import StreamingSlackifier
+    from .templates import MessageTemplate, compile_template
+
+# Public name -> submodule that defines it. Submodules are imported on first
+# access (PEP 562), so ``import slackify_markdown`` loads neither markdown-it
+# nor asyncio or multiprocessing until something needs them.
+_EXPORTS: Dict[str, str] = {
+    "aslackify_markdown": "aio",
+    "aslackify_many": "aio",
+    "CacheInfo": "cache",
+    "ConversionCache": "cache",
+    "ConversionEvent": "instrumentation",
+    "ConversionLimits": "guardrails",
+    "ConversionMetadata": "metadata",
+    "ConversionResult": "guardrails",
+    "ConversionObserver": "instrumentation",
+    "HistogramObserver": "instrumentation",
+    "IncrementalSlackifier": "incremental",
+    "IncrementalUpdate": "incremental",
+    "MessageTemplate": "templates",
+    "RenderProfile": "profile",
+    "SlackifyConverter": "converter",
+    "StreamingSlackifier": "streaming",
+    "slackify_markdown": "service",
+    "slackify_bytes": "service",
+    "slackify_with_metadata": "service",
+    "slackify_chunks": "chunking",
+    "slackify_blocks": "blockkit",
+    "slackify_sections": "blockkit",
+    "slackify_many": "batch",
+    "slackify_large": "large",
+    "warmup": "service",
+    "compile_template": "templates",
+}
+
+# Spelled out, not computed from _EXPORTS, so linters see the guarded
+# imports above as re-exports.
 __all__: List[str] = [
+    "aslackify_markdown",
+    "aslackify_many",
+    "CacheInfo",
+    "ConversionCache",
+    "ConversionEvent",
+    "ConversionLimits",
+    "ConversionMetadata",
+    "ConversionResult",
+    "ConversionObserver",
+    "HistogramObserver",
+    "IncrementalSlackifier",
+    "IncrementalUpdate",
+    "MessageTemplate",
+    "RenderProfile",
+    "SlackifyConverter",
+    "StreamingSlackifier",
     "slackify_markdown",
+    "slackify_bytes",
+    "slackify_with_metadata",
+    "slackify_chunks",
+    "slackify_blocks",
+    "slackify_sections",
+    "slackify_many",
+    "slackify_large",
+    "warmup",
+    "compile_template",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module("." + module, __name__), name)
+    # Cache it, so later lookups don't come back here.
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,55 @@
+import asyncio
+from concurrent.futures import Executor
+from typing import Iterable, List, Optional
+
+from slackify_markdown.service import slackify_markdown
+
+# Inputs up to this many characters convert in well under a millisecond, which
+# is cheaper than a round-trip through an executor, so they run inline.
+INLINE_THRESHOLD = 2048
+DEFAULT_MAX_CONCURRENCY = 4
+
+
+async def aslackify_markdown(
+    markdown: str,
+    *,
+    executor: Optional[Executor] = None,
+    inline_threshold: int = INLINE_THRESHOLD,
+) -> str:
+    """
+    Convert markdown to Slack-compatible markdown without blocking the event
+    loop.
+
+    Inputs longer than ``inline_threshold`` characters are converted on
+    ``executor`` (a thread or process pool; the loop's default executor when
+    None). Shorter ones are converted inline.
+    """
+    if len(markdown) <= inline_threshold:
+        return slackify_markdown(markdown)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, slackify_markdown, markdown)
+
+
+async def aslackify_many(
+    texts: Iterable[str],
+    *,
+    executor: Optional[Executor] = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    inline_threshold: int = INLINE_THRESHOLD,
+) -> List[str]:
+    """
+    Convert many markdown strings without blocking the event loop, returning
+    results in input order. At most ``max_concurrency`` conversions are in
+    flight at once.
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def convert(markdown: str) -> str:
+        async with semaphore:
+            return await aslackify_markdown(
+                markdown, executor=executor, inline_threshold=inline_threshold
+            )
+
+    return list(await asyncio.gather(*(convert(text) for text in texts)))
@@ -0,0 +1,77 @@
+from typing import Iterable, Iterator, List, Optional
+
+from slackify_markdown.converter import SlackifyConverter
+from slackify_markdown.service import slackify_markdown
+
+# A chunk should carry enough text that converting it dwarfs the cost of
+# pickling it to a worker and back.
+_MIN_CHUNK_CHARS = 64 * 1024
+# Aim for a few chunks per worker so a slow chunk doesn't leave the others idle.
+_CHUNKS_PER_WORKER = 4
+
+# Set in each worker process by _init_worker().
+_worker_converter: Optional[SlackifyConverter] = None
+
+
+def _init_worker() -> None:
+    global _worker_converter
+    _worker_converter = SlackifyConverter()
+
+
+def _convert_chunk(chunk: List[str]) -> List[str]:
+    assert _worker_converter is not None
+    convert = _worker_converter.convert
+    return [convert(text) for text in chunk]
+
+
+def _chunk_by_size(texts: List[str], target_chars: int) -> Iterator[List[str]]:
+    """
+    Group consecutive texts into chunks of roughly ``target_chars`` characters,
+    keeping input order.
+    """
+    chunk: List[str] = []
+    size = 0
+    for text in texts:
+        chunk.append(text)
+        size += len(text)
+        if size >= target_chars:
+            yield chunk
+            chunk = []
+            size = 0
+    if chunk:
+        yield chunk
+
+
+def slackify_many(texts: Iterable[str], workers: Optional[int] = None) -> List[str]:
+    """
+    Convert many markdown strings to Slack-compatible markdown, in order.
+
+    With ``workers`` greater than 1, the texts are split into chunks sized by
+    their total length and converted across a pool of that many processes,
+    each holding its own pre-built converter. Otherwise everything is
+    converted in the calling process.
+    """
+    if workers is not None and workers < 1:
+        raise ValueError("workers must be at least 1")
+
+    texts = list(texts)
+    if workers is None or workers == 1 or len(texts) < 2:
+        return [slackify_markdown(text) for text in texts]
+
+    total_chars = sum(len(text) for text in texts)
+    target_chars = max(_MIN_CHUNK_CHARS, total_chars // (workers * _CHUNKS_PER_WORKER))
+    chunks = list(_chunk_by_size(texts, target_chars))
+    if len(chunks) == 1:
+        return [slackify_markdown(text) for text in texts]
+
+    # Imported here, so that importing this module doesn't pull in
+    # multiprocessing.
+    from concurrent.futures import ProcessPoolExecutor
+
+    results: List[str] = []
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(chunks)), initializer=_init_worker
+    ) as executor:
+        for converted in executor.map(_convert_chunk, chunks):
+            results.extend(converted)
+    return results
@@ -0,0 +1,486 @@
+import re
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+from markdown_it.token import Token
+
+from slackify_markdown.chunking import slackify_chunks
+from slackify_markdown.converter import SlackifyConverter
+from slackify_markdown.profile import RenderProfile, compile_profile
+from slackify_markdown.service import _default_converter
+from slackify_markdown.slackify import SlackifyMarkdown
+from slackify_markdown.tables import render_table, table_end
+
+# Slack caps the text of a section block at 3,000 characters; rich_text blocks
+# are kept to the same budget.
+DEFAULT_MAX_CHARS = 3000
+
+Element = Dict[str, Any]
+
+_MENTION_RE = re.compile(r"<([@#!])([^>|]*)(?:\|([^>]*))?>")
+_BROADCASTS = ("here", "channel", "everyone")
+_STYLE_TOKENS = {
+    "strong_open": ("bold", True),
+    "strong_close": ("bold", False),
+    "em_open": ("italic", True),
+    "em_close": ("italic", False),
+    "s_open": ("strike", True),
+    "s_close": ("strike", False),
+}
+
+
+def slackify_blocks(
+    markdown: str,
+    max_chars: int = DEFAULT_MAX_CHARS,
+    converter: Optional[SlackifyConverter] = None,
+) -> List[Element]:
+    """
+    Convert markdown to a list of Block Kit ``rich_text`` blocks.
+
+    The markdown-it token stream is walked directly into
+    ``rich_text_section``, ``rich_text_list``, ``rich_text_preformatted`` and
+    ``rich_text_quote`` elements, with bold, italic, strike and code styles,
+    links, and user, channel, user group and broadcast mentions. Tables
+    become preformatted elements laid out as the converter's profile says
+    (see ``RenderProfile``). Each block holds at most ``max_chars``
+    characters of text; larger elements, list items and link texts are split
+    across blocks. A link whose URL alone is longer than ``max_chars`` cannot
+    be split and gets a block of its own that exceeds the limit.
+    """
+    if max_chars < 1:
+        raise ValueError("max_chars must be at least 1")
+    converter = converter or _default_converter
+    text = markdown.replace(SlackifyMarkdown.NEW_LINE, "")
+    elements = BlockKitRenderer(converter.profile).render(converter._parse(text))
+    return _pack_blocks(elements, max_chars)
+
+
+def slackify_sections(
+    markdown: str,
+    max_chars: int = DEFAULT_MAX_CHARS,
+    converter: Optional[SlackifyConverter] = None,
+) -> List[Element]:
+    """
+    Convert markdown to a list of Block Kit ``section`` blocks holding mrkdwn
+    text, each within ``max_chars``.
+    """
+    return [
+        {"type": "section", "text": {"type": "mrkdwn", "text": chunk}}
+        for chunk in slackify_chunks(markdown, max_chars, converter)
+    ]
+
+
+class BlockKitRenderer:
+    """
+    Walks a markdown-it token stream and builds the top-level elements of
+    Block Kit ``rich_text`` blocks. Like ``SlackifyMarkdown``, token types it
+    has no mapping for (``hr``, ``html_*``) are dropped.
+    """
+
+    def __init__(self, profile: Optional[RenderProfile] = None):
+        # Only the table layout is used: Block Kit has its own list markers,
+        # headings and links.
+        self.profile = compile_profile(profile or RenderProfile())
+
+    def render(self, tokens: List[Token]) -> List[Element]:
+        self._elements: List[Element] = []
+        # Open bullet/ordered lists, innermost last, with the number of their
+        # next item, the rich_text_list element their items go into, whether
+        # one of their items is open, and whether the content being built
+        # continues that item after a nested list.
+        self._lists: List[Dict[str, Any]] = []
+        self._quote_depth = 0
+        self._heading = False
+        # Inline elements of the list item or blockquote being built.
+        self._container: Optional[List[Element]] = None
+        # Line prefix of a blockquote inside a list item: Slack list items
+        # can't hold a quote, so its lines stay in the item, marked as text.
+        self._quote_prefix = ""
+        # Marker of a list item inside a blockquote, which Slack can only
+        # show as text.
+        self._item_marker = ""
+
+        idx = 0
+        while idx < len(tokens):
+            token = tokens[idx]
+            if token.type == "table_open":
+                # Rendered whole, like a code block.
+                end = table_end(tokens, idx)
+                self._preformatted(
+                    render_table(tokens[idx:end], self.profile, mrkdwn=False)
+                )
+                idx = end
+                continue
+            handler = getattr(self, "_" + token.type, None)
+            if handler is not None:
+                handler(token)
+            idx += 1
+        return self._elements
+
+    # Block tokens
+
+    def _heading_open(self, token: Token) -> None:
+        self._heading = True
+
+    def _heading_close(self, token: Token) -> None:
+        self._heading = False
+
+    def _inline(self, token: Token) -> None:
+        elements = _render_inline(token.children or [], bold=self._heading)
+        if self._container is not None:
+            if self._container:
+                _append_text(self._container, "\n", {})
+            _append_text(self._container, self._quote_prefix + self._item_marker, {})
+            self._item_marker = ""
+            for element in elements:
+                if element["type"] == "text":
+                    text = element["text"]
+                    if self._quote_prefix:
+                        text = text.replace("\n", "\n" + self._quote_prefix)
+                    _append_text(self._container, text, element.get("style", {}))
+                else:
+                    self._container.append(element)
+        elif elements:
+            self._elements.append({"type": "rich_text_section", "elements": elements})
+
+    def _bullet_list_open(self, token: Token) -> None:
+        self._open_list("bullet", 1)
+
+    def _ordered_list_open(self, token: Token) -> None:
+        start = token.attrs.get("start", 1)
+        self._open_list("ordered", int(start))
+
+    def _open_list(self, style: str, start: int) -> None:
+        self._flush_item()
+        self._lists.append(
+            {
+                "style": style,
+                "next": start,
+                "element": None,
+                "in_item": False,
+                "continued": False,
+            }
+        )
+
+    def _bullet_list_close(self, token: Token) -> None:
+        self._close_list()
+
+    def _ordered_list_close(self, token: Token) -> None:
+        self._close_list()
+
+    def _close_list(self) -> None:
+        self._flush_item()
+        self._lists.pop()
+        if self._lists and self._lists[-1]["in_item"] and not self._quote_depth:
+            # Whatever follows a nested list in the same item still belongs
+            # to that item.
+            self._lists[-1]["continued"] = True
+            self._container = []
+
+    def _list_item_open(self, token: Token) -> None:
+        if self._quote_depth:
+            self._item_marker = (token.info + ". ") if token.info else "• "
+            return
+        self._flush_item()
+        self._container = []
+        self._lists[-1]["in_item"] = True
+
+    def _list_item_close(self, token: Token) -> None:
+        self._flush_item()
+        self._lists[-1]["in_item"] = False
+
+    def _flush_item(self) -> None:
+        """
+        Add the list item being built to the innermost open list. Slack lists
+        are flat, so items of a nested list go into a separate
+        ``rich_text_list`` element with a deeper ``indent``. Content of an
+        item that follows its nested list continues in a list element of the
+        item's ``indent`` that repeats its number, as ``_split_element()``
+        continues an item too long for one block.
+        """
+        if self._container is None or not self._lists or self._quote_depth:
+            return
+        items, self._container = self._container, None
+        current = self._lists[-1]
+        continued, current["continued"] = current["continued"], False
+        if not items:
+            return
+        number = current["next"] - 1 if continued else current["next"]
+        element = current["element"]
+        if element is None or self._elements[-1] is not element:
+            element = {
+                "type": "rich_text_list",
+                "style": current["style"],
+                "indent": len(self._lists) - 1,
+                "elements": [],
+            }
+            if current["style"] == "ordered" and number != 1:
+                element["offset"] = number - 1
+            current["element"] = element
+            self._elements.append(element)
+        element["elements"].append({"type": "rich_text_section", "elements": items})
+        if not continued:
+            current["next"] += 1
+
+    def _blockquote_open(self, token: Token) -> None:
+        if self._quote_depth == 0:
+            if self._container is not None:
+                self._quote_prefix = "> "
+            else:
+                self._container = []
+        self._quote_depth += 1
+
+    def _blockquote_close(self, token: Token) -> None:
+        self._quote_depth -= 1
+        if self._quote_depth == 0:
+            if self._quote_prefix:
+                self._quote_prefix = ""
+                return
+            quoted, self._container = self._container, None
+            if quoted:
+                self._elements.append({"type": "rich_text_quote", "elements": quoted})
+
+    def _fence(self, token: Token) -> None:
+        # Remove deprecated language declarations, as the mrkdwn renderer does.
+        self._preformatted(re.sub(r"^#!.*?\n", "", token.content).rstrip("\n"))
+
+    _code_block = _fence
+
+    def _preformatted(self, content: str) -> None:
+        if self._container is not None:
+            if self._container:
+                _append_text(self._container, "\n", {})
+            _append_text(self._container, content, {"code": True})
+        elif content:
+            self._elements.append(
+                {
+                    "type": "rich_text_preformatted",
+                    "elements": [{"type": "text", "text": content}],
+                }
+            )
+
+
+def _append_text(elements: List[Element], text: str, style: Dict[str, bool]) -> None:
+    """
+    Append a text element, merging it into the previous one if both have the
+    same style.
+    """
+    if not text:
+        return
+    if elements:
+        last = elements[-1]
+        if last["type"] == "text" and last.get("style", {}) == style:
+            last["text"] += text
+            return
+    element: Element = {"type": "text", "text": text}
+    if style:
+        element["style"] = dict(style)
+    elements.append(element)
+
+
+def _append_mentions(
+    elements: List[Element], text: str, style: Dict[str, bool]
+) -> None:
+    """
+    Append ``text``, turning Slack mention syntax into mention elements.
+    """
+    pos = 0
+    for match in _MENTION_RE.finditer(text):
+        kind, target, label = match.groups()
+        mention: Optional[Element] = None
+        if kind == "@" and target:
+            mention = {"type": "user", "user_id": target}
+        elif kind == "#" and target:
+            mention = {"type": "channel", "channel_id": target}
+        elif kind == "!" and target in _BROADCASTS:
+            mention = {"type": "broadcast", "range": target}
+        elif kind == "!" and target.startswith("subteam^"):
+            mention = {"type": "usergroup", "usergroup_id": target.partition("^")[2]}
+        if mention is None:
+            continue
+        start, end = match.span()
+        _append_text(elements, text[pos:start], style)
+        elements.append(mention)
+        pos = end
+    _append_text(elements, text[pos:], style)
+
+
+def _render_inline(tokens: List[Token], bold: bool = False) -> List[Element]:
+    elements: List[Element] = []
+    style: Dict[str, bool] = {"bold": True} if bold else {}
+    link: Optional[Element] = None
+
+    for token in tokens:
+        if token.type in _STYLE_TOKENS:
+            name, enabled = _STYLE_TOKENS[token.type]
+            if bold and name == "bold":
+                continue
+            if enabled:
+                style[name] = True
+            else:
+                style.pop(name, None)
+        elif token.type == "text":
+            if link is not None:
+                link["text"] += token.content
+            else:
+                _append_mentions(elements, token.content, style)
+        elif token.type == "code_inline":
+            if link is not None:
+                link["text"] += token.content
+            else:
+                _append_text(elements, token.content, dict(style, code=True))
+        elif token.type in ("softbreak", "hardbreak"):
+            _append_text(elements, "\n", style)
+        elif token.type == "link_open":
+            link = {"type": "link", "url": token.attrs.get("href", ""), "text": ""}
+            if style:
+                link["style"] = dict(style)
+        elif token.type == "link_close" and link is not None:
+            if not link["text"] or link["text"] == link["url"]:
+                del link["text"]
+            elements.append(link)
+            link = None
+        elif token.type == "image":
+            src = str(token.attrs.get("src", ""))
+            display = token.content or str(token.attrs.get("title", "") or "")
+            parsed = urlparse(src)
+            if parsed.scheme and parsed.netloc:
+                image: Element = {"type": "link", "url": src}
+                if display:
+                    image["text"] = display
+                elements.append(image)
+            else:
+                _append_text(elements, display, style)
+    return elements
+
+
+def _element_size(element: Element) -> int:
+    """
+    Characters of visible text in an element, counting mentions and link
+    URLs as their length in mrkdwn.
+    """
+    if "elements" in element:
+        return sum(_element_size(child) for child in element["elements"])
+    if element["type"] == "text":
+        return len(element["text"])
+    if element["type"] == "link":
+        return len(element["url"]) + len(element.get("text", ""))
+    return len(next(iter(v for k, v in element.items() if k != "type"), ""))
+
+
+def _split_element(element: Element, max_chars: int) -> List[Element]:
+    """
+    Split a top-level element whose text exceeds ``max_chars`` into several
+    elements of the same type, each within the budget. A list item that is
+    too long on its own continues in a list element of the same ``indent``
+    that repeats its number; the items after it keep theirs.
+    """
+    if element["type"] != "rich_text_list":
+        return [
+            dict(element, elements=group)
+            for group in _split_inline(element["elements"], max_chars)
+        ]
+    parts: List[Element] = []
+    current: List[Element] = []
+    size = 0
+    first = 0
+
+    def flush() -> None:
+        nonlocal current, size
+        if current:
+            part = dict(element, elements=current)
+            part.pop("offset", None)
+            # Continue the numbering of an ordered list.
+            offset = element.get("offset", 0) + first
+            if element["style"] == "ordered" and offset:
+                part["offset"] = offset
+            parts.append(part)
+        current, size = [], 0
+
+    for index, item in enumerate(element["elements"]):
+        for group in _split_inline(item["elements"], max_chars):
+            section = dict(item, elements=group)
+            section_size = _element_size(section)
+            if size + section_size > max_chars:
+                flush()
+            if not current:
+                first = index
+            current.append(section)
+            size += section_size
+    flush()
+    return parts
+
+
+def _split_inline(children: List[Element], max_chars: int) -> List[List[Element]]:
+    """
+    Pack inline elements into groups of at most ``max_chars``, cutting text
+    and the text of links where a group fills up. An element that cannot be
+    cut, such as a link whose URL alone is ``max_chars`` or longer, gets a
+    group of its own, which can exceed ``max_chars``.
+    """
+    groups: List[List[Element]] = []
+    current: List[Element] = []
+    size = 0
+
+    def flush() -> None:
+        nonlocal current, size
+        if current:
+            groups.append(current)
+        current, size = [], 0
+
+    for child in children:
+        child_size = _element_size(child)
+        if size + child_size <= max_chars:
+            current.append(child)
+            size += child_size
+            continue
+        if child["type"] == "text":
+            text = child["text"]
+            start = 0
+            while start < len(text):
+                if size >= max_chars:
+                    flush()
+                stop = start + max_chars - size
+                piece = text[start:stop]
+                current.append(dict(child, text=piece))
+                size += len(piece)
+                start = stop
+            continue
+        flush()
+        url_size = len(child.get("url", ""))
+        if child["type"] == "link" and child.get("text") and url_size < max_chars:
+            text = child["text"]
+            room = max_chars - url_size
+            cuts = range(0, len(text), room)
+            for start in cuts[:-1]:
+                stop = start + room
+                groups.append([dict(child, text=text[start:stop])])
+            last = cuts[-1]
+            child = dict(child, text=text[last:])
+        current.append(child)
+        size += _element_size(child)
+        if size >= max_chars:
+            flush()
+    flush()
+    return groups
+
+
+def _pack_blocks(elements: List[Element], max_chars: int) -> List[Element]:
+    blocks: List[Element] = []
+    current: List[Element] = []
+    size = 0
+    for element in elements:
+        element_size = _element_size(element)
+        pieces = [element]
+        if element_size > max_chars:
+            pieces = _split_element(element, max_chars)
+        for piece in pieces:
+            piece_size = _element_size(piece)
+            if current and size + piece_size > max_chars:
+                blocks.append({"type": "rich_text", "elements": current})
+                current, size = [], 0
+            current.append(piece)
+            size += piece_size
+    if current:
+        blocks.append({"type": "rich_text", "elements": current})
+    return blocks
@@ -0,0 +1,151 @@
+import re
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List
+
+from markdown_it.rules_core import StateCore, block, normalize
+from markdown_it.token import Token
+
+from slackify_markdown.slackify import SlackifyMarkdown
+
+if TYPE_CHECKING:
+    from slackify_markdown.converter import SlackifyConverter
+
+# Line breaks the way markdown-it normalizes them before parsing.
+LINE_BREAK_RE = re.compile(r"\r\n|\r|\n")
+# Source is parsed this many characters at a time by iter_structural_blocks().
+DEFAULT_WINDOW_CHARS = 32 * 1024
+
+
+def split_top_level(tokens: List[Token]) -> List[List[Token]]:
+    """
+    Group a flat token stream into one token list per top-level block
+    (paragraph, list, blockquote, fence, ...), in document order.
+
+    The first token of every group carries the block's source line range in
+    ``token.map``.
+    """
+    groups: List[List[Token]] = []
+    for token in tokens:
+        if token.level == 0 and token.nesting >= 0:
+            groups.append([token])
+        else:
+            groups[-1].append(token)
+    return groups
+
+
+class StructuralJoiner:
+    """
+    Materialize the structural renderings of consecutive blocks one at a
+    time, with the same blank-line cap ``render()`` applies to the whole
+    document.
+
+    The trailing run of structural newlines of each rendering is held in
+    ``held`` until the next one arrives, so the cap sees the run whole.
+    """
+
+    def __init__(self) -> None:
+        self.held = ""
+
+    def add(self, structural: str) -> str:
+        """
+        Materialized output of ``structural`` (after any held newlines), up
+        to its trailing structural newlines; empty if it has no content.
+        """
+        structural = self.held + structural
+        body = structural.rstrip(SlackifyMarkdown.NEW_LINE)
+        self.held = SlackifyMarkdown.NEW_LINE * (len(structural) - len(body))
+        if not body:
+            return ""
+        return SlackifyMarkdown.materialize_newlines(body)
+
+
+def require_token_engine(converter: "SlackifyConverter") -> None:
+    """
+    Raise ``ValueError`` unless ``converter`` renders with the token
+    renderer. Block-by-block conversion joins the token renderer's
+    structural renderings, which the tree engine doesn't produce.
+    """
+    if converter.engine != "tokens":
+        raise ValueError(
+            "block-by-block conversion needs a converter with engine='tokens', "
+            "not {!r}".format(converter.engine)
+        )
+
+
+def parse_blocks(
+    converter: "SlackifyConverter", text: str, env: Dict[str, Any]
+) -> List[Token]:
+    """
+    Block-level parse of ``text`` only: the top-level structure, with inline
+    content left unparsed, and link reference definitions collected into
+    ``env["references"]``.
+    """
+    state = StateCore(text, converter._md, env)
+    normalize(state)
+    block(state)
+    return state.tokens
+
+
+def line_offset(text: str, line: int) -> int:
+    """
+    Character offset in ``text`` where source line ``line`` starts.
+    """
+    if line == 0:
+        return 0
+    for count, match in enumerate(LINE_BREAK_RE.finditer(text), 1):
+        if count == line:
+            return match.end()
+    raise ValueError("line {} is past the end of the text".format(line))
+
+
+def may_define_references(text: str) -> bool:
+    """
+    Whether ``text`` might contain a link reference definition (``[id]: url``).
+
+    A definition changes how blocks before it render, so text that may hold
+    one has to be parsed as a whole. This errs on the side of saying yes.
+    """
+    return "]:" in text
+
+
+def iter_structural_blocks(
+    converter: "SlackifyConverter",
+    text: str,
+    window_chars: int = DEFAULT_WINDOW_CHARS,
+) -> Iterator[str]:
+    """
+    Yield the structural rendering (see ``SlackifyMarkdown.render_structural``)
+    of each top-level block in ``text``, in order.
+
+    ``text`` must already be scrubbed of the sentinel char. It is parsed a
+    window of whole lines at a time: every block but the last one in a window
+    is finished, since the next block starts on a complete line, and parsing
+    resumes at the start of that last block. Only one window's tokens are
+    alive at a time. Concatenating the yielded strings gives the structural
+    rendering of the whole document.
+    """
+    if may_define_references(text):
+        window_chars = len(text)
+    pos = 0
+    window = max(window_chars, 1)
+    while pos < len(text):
+        end = text.find("\n", pos + window)
+        end = len(text) if end == -1 else end + 1
+        env: Dict[str, Any] = {}
+        segment = text[pos:end]
+        groups = split_top_level(converter._parse(segment, env))
+        if end == len(text):
+            for group in groups:
+                yield converter._render_structural(group, env)
+            return
+        if len(groups) < 2:
+            # One block fills the whole window (e.g. a huge fence or list):
+            # widen the window until the block ends inside it.
+            window *= 2
+            continue
+        resume = line_offset(segment, groups[-1][0].map[0])
+        for group in groups[:-1]:
+            yield converter._render_structural(group, env)
+        # Drop this window's tokens before the next window is parsed.
+        del groups, group
+        pos += resume
+        window = max(window_chars, 1)
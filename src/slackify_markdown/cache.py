@@ -0,0 +1,110 @@
+import sys
+import threading
+from collections import OrderedDict
+from typing import Hashable, NamedTuple, Optional, Tuple
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    bypasses: int
+    evictions: int
+    entries: int
+    bytes: int
+    max_entries: int
+    max_bytes: int
+
+
+class ConversionCache:
+    """
+    Thread-safe LRU cache of conversion results keyed by the markdown input
+    and a ``variant``: the configuration of the converter that produced
+    them, so converters that render differently can share one cache.
+
+    Entries are evicted least-recently-used first once either ``max_entries``
+    or ``max_bytes`` (memory held by the cached input and output strings) is
+    exceeded. Inputs longer than ``max_input_chars`` bypass the cache so one
+    huge document can't flush everything else.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 16 * 1024 * 1024,
+        max_input_chars: int = 64 * 1024,
+    ):
+        if max_entries < 1 or max_bytes < 1:
+            raise ValueError("max_entries and max_bytes must be at least 1")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_input_chars = max_input_chars
+        self._entries: "OrderedDict[Tuple[Hashable, str], str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._bypasses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def _entry_size(markdown: str, converted: str) -> int:
+        return sys.getsizeof(markdown) + sys.getsizeof(converted)
+
+    def accepts(self, markdown: str) -> bool:
+        return len(markdown) <= self.max_input_chars
+
+    def get(self, markdown: str, variant: Hashable = None) -> Optional[str]:
+        """
+        Return the cached conversion of ``markdown`` by ``variant``, or None
+        on a miss.
+        """
+        with self._lock:
+            if not self.accepts(markdown):
+                self._bypasses += 1
+                return None
+            key = (variant, markdown)
+            converted = self._entries.get(key)
+            if converted is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return converted
+
+    def put(self, markdown: str, converted: str, variant: Hashable = None) -> None:
+        size = self._entry_size(markdown, converted)
+        if not self.accepts(markdown) or size > self.max_bytes:
+            return
+        key = (variant, markdown)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= self._entry_size(markdown, previous)
+            self._entries[key] = converted
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                (_, old_markdown), old_converted = self._entries.popitem(last=False)
+                self._bytes -= self._entry_size(old_markdown, old_converted)
+                self._evictions += 1
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(
+                hits=self._hits,
+                misses=self._misses,
+                bypasses=self._bypasses,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                bytes=self._bytes,
+                max_entries=self.max_entries,
+                max_bytes=self.max_bytes,
+            )
+
+    def clear(self) -> None:
+        """
+        Drop all entries and reset the statistics.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._hits = self._misses = self._bypasses = self._evictions = 0
@@ -0,0 +1,162 @@
+import re
+from typing import Iterator, List, Optional, Tuple
+
+from slackify_markdown.blocks import (
+    StructuralJoiner,
+    iter_structural_blocks,
+    require_token_engine,
+)
+from slackify_markdown.converter import SlackifyConverter
+from slackify_markdown.service import _default_converter
+from slackify_markdown.slackify import SlackifyMarkdown
+
+# Slack recommends keeping message text under 4,000 characters.
+DEFAULT_MAX_CHARS = 4000
+# Room for a fence closed at the end of one chunk and re-opened in the next.
+_MIN_MAX_CHARS = 16
+_FENCE = "```"
+# Links, mentions and entities must never be cut in half.
+_ATOMIC_RE = re.compile(r"<[^<>\n]*>|&(?:amp|lt|gt);")
+_LINE_RE = re.compile(r"[^\n]*\n|[^\n]+")
+
+
+def slackify_chunks(
+    markdown: str,
+    max_chars: int = DEFAULT_MAX_CHARS,
+    converter: Optional[SlackifyConverter] = None,
+) -> Iterator[str]:
+    """
+    Convert markdown to Slack-compatible markdown, yielded as chunks of at
+    most ``max_chars`` characters each.
+
+    The document is parsed a window at a time and rendered block by block
+    (see ``iter_structural_blocks``), so neither the full token list nor the
+    full output string is ever held in memory. Chunks break between top-level blocks where
+    possible. A block too large for one chunk is split between lines, and a
+    line too long for one chunk is split at a space; neither ever cuts inside
+    a ``<url|text>`` link, a mention or an entity, unless that alone is
+    longer than a chunk. A code block that has to span chunks is closed at
+    the end of one chunk and re-opened in the next. Chunks carry no leading
+    or trailing newlines. ``converter`` must use the ``"tokens"`` engine.
+    """
+    if max_chars < _MIN_MAX_CHARS:
+        raise ValueError("max_chars must be at least {}".format(_MIN_MAX_CHARS))
+    converter = converter or _default_converter
+    require_token_engine(converter)
+    return _generate_chunks(markdown, max_chars, converter)
+
+
+def _generate_chunks(
+    markdown: str, max_chars: int, converter: SlackifyConverter
+) -> Iterator[str]:
+    text = markdown.replace(SlackifyMarkdown.NEW_LINE, "")
+    builder = _ChunkBuilder(max_chars)
+    joiner = StructuralJoiner()
+    for structural in iter_structural_blocks(converter, text):
+        part = joiner.add(structural)
+        if part:
+            yield from builder.add(part)
+    yield from builder.flush()
+
+
+class _ChunkBuilder:
+    def __init__(self, max_chars: int):
+        self.max_chars = max_chars
+        self._parts: List[str] = []
+        self._size = 0
+        # Size of the chunk right after a fence was re-opened in it; a chunk
+        # holding nothing more than that has no content of its own.
+        self._empty_size = 0
+
+    def _append(self, text: str) -> None:
+        self._parts.append(text)
+        self._size += len(text)
+
+    def flush(self) -> Iterator[str]:
+        chunk = "".join(self._parts).strip("\n")
+        self._parts = []
+        self._size = self._empty_size = 0
+        if chunk:
+            yield chunk
+
+    def add(self, block: str) -> Iterator[str]:
+        if not self._parts:
+            block = block.lstrip("\n")
+        if self._size + len(block.rstrip("\n")) <= self.max_chars:
+            self._append(block)
+            return
+        yield from self.flush()
+        block = block.lstrip("\n")
+        if len(block.rstrip("\n")) <= self.max_chars:
+            self._append(block)
+            return
+        yield from self._add_lines(block)
+
+    def _break(self, in_fence: bool) -> Iterator[str]:
+        if in_fence:
+            self._append(_FENCE if self._parts[-1].endswith("\n") else "\n" + _FENCE)
+        yield from self.flush()
+        if in_fence:
+            self._append(_FENCE + "\n")
+            self._empty_size = self._size
+
+    def _add_lines(self, block: str) -> Iterator[str]:
+        in_fence = False
+        for line in _LINE_RE.findall(block):
+            content = line.rstrip("\n")
+            # Rendered fences open with ``` at the end of a line (after any
+            # list or quote prefix) and close with ``` at the start of one.
+            closes = in_fence and content.startswith(_FENCE)
+            opens = not in_fence and content.endswith(_FENCE)
+            # Leave room to close the fence if the chunk has to end inside it.
+            reserve = len(_FENCE) + 1 if (in_fence or opens) and not closes else 0
+
+            size = self._size + len(content) + reserve
+            if size > self.max_chars and self._size > self._empty_size:
+                yield from self._break(in_fence)
+            room = self.max_chars - self._size - reserve
+            if len(content) > room:
+                for piece in _split_line(line, room, self.max_chars - reserve - 4):
+                    if self._size + len(piece.rstrip("\n")) + reserve > self.max_chars:
+                        yield from self._break(in_fence)
+                    self._append(piece)
+            else:
+                self._append(line)
+            in_fence = (in_fence and not closes) or opens
+
+
+def _split_line(line: str, first_room: int, room: int) -> Iterator[str]:
+    """
+    Split ``line`` into pieces of at most ``first_room`` characters for the
+    first and ``room`` for the rest, breaking after a space where possible
+    and never inside a link, mention or entity (unless it alone is longer
+    than a piece).
+    """
+    atomic: List[Tuple[int, int]] = [m.span() for m in _ATOMIC_RE.finditer(line)]
+    atomic_idx = 0
+    start = 0
+    end = len(line.rstrip("\n"))
+    limit = max(first_room, 1)
+    while end - start > limit:
+        cut = start + limit
+        space = line.rfind(" ", start + 1, cut)
+        if space != -1:
+            cut = space + 1
+        while atomic_idx < len(atomic) and atomic[atomic_idx][1] <= start:
+            atomic_idx += 1
+        idx = atomic_idx
+        while idx < len(atomic) and atomic[idx][0] < cut:
+            span_start, span_end = atomic[idx]
+            if span_start < cut < span_end:
+                if span_start > start:
+                    cut = span_start
+                elif span_end - start <= limit:
+                    # The piece starts with the span: end it after the span.
+                    cut = span_end
+                break
+            idx += 1
+        yield line[start:cut]
+        start = cut
+        limit = max(room, 1)
+    if start < len(line):
+        yield line[start:]
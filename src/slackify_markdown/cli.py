@@ -0,0 +1,384 @@
+"""
+Command-line converter: ``python -m slackify_markdown`` or ``slackify-markdown``.
+
+Converts stdin, files or whole directories in one process (or one pool of
+worker processes), so batch jobs pay interpreter and parser startup once
+rather than once per document.
+"""
+
+import argparse
+import json
+import pathlib
+import sys
+import time
+from collections import deque
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from slackify_markdown import batch
+from slackify_markdown.converter import SlackifyConverter
+from slackify_markdown.service import _default_converter
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+DEFAULT_SUFFIX = ".mrkdwn"
+DEFAULT_PATTERN = "*.md"
+# Documents are sent to workers in batches of about this many characters, so
+# converting a batch dwarfs the cost of pickling it; a batch also goes out
+# once it holds _BATCH_DOCS documents, so short records don't wait long.
+_BATCH_CHARS = 64 * 1024
+_BATCH_DOCS = 256
+# Batches in flight per worker; bounds memory when the input is huge.
+_BATCHES_PER_WORKER = 4
+
+# One conversion result: (output, seconds spent converting).
+Result = Tuple[str, float]
+
+
+class CLIError(Exception):
+    """
+    Bad input; reported on stderr with exit status 1.
+    """
+
+
+def _convert_timed(
+    texts: List[str], converter: Optional[SlackifyConverter] = None
+) -> List[Result]:
+    # Worker processes convert with the converter batch._init_worker() built.
+    convert = (converter or batch._worker_converter).convert  # type: ignore[union-attr]
+    results: List[Result] = []
+    for text in texts:
+        start = time.perf_counter()
+        converted = convert(text)
+        results.append((converted, time.perf_counter() - start))
+    return results
+
+
+def _batches(items: Iterable[Tuple[Any, str]]) -> Iterator[List[Tuple[Any, str]]]:
+    current: List[Tuple[Any, str]] = []
+    size = 0
+    for item in items:
+        current.append(item)
+        size += len(item[1])
+        if size >= _BATCH_CHARS or len(current) >= _BATCH_DOCS:
+            yield current
+            current, size = [], 0
+    if current:
+        yield current
+
+
+def convert_stream(
+    items: Iterable[Tuple[Any, str]], workers: int = 1, ordered: bool = True
+) -> Iterator[Tuple[Any, str, float]]:
+    """
+    Convert ``(key, markdown)`` pairs lazily, yielding ``(key, output,
+    seconds)``.
+
+    With ``workers`` greater than 1 the documents are converted in batches
+    across a pool of that many processes, with a bounded number of batches in
+    flight. Results come back in input order, or as soon as each batch is
+    done when ``ordered`` is false.
+    """
+    if workers == 1:
+        for key, text in items:
+            converted, seconds = _convert_timed([text], _default_converter)[0]
+            yield key, converted, seconds
+        return
+
+    # Imported here: it pulls in multiprocessing, which single-process runs
+    # don't need at startup.
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+    max_in_flight = workers * _BATCHES_PER_WORKER
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=batch._init_worker
+    ) as pool:
+        in_order: Deque["Future[List[Result]]"] = deque()
+        pending: Set["Future[List[Result]]"] = set()
+        keys: Dict["Future[List[Result]]", List[Any]] = {}
+
+        def collect(future: "Future[List[Result]]") -> Iterator[Tuple[Any, str, float]]:
+            for key, (converted, seconds) in zip(keys.pop(future), future.result()):
+                yield key, converted, seconds
+
+        for chunk in _batches(items):
+            future = pool.submit(_convert_timed, [text for _, text in chunk])
+            keys[future] = [key for key, _ in chunk]
+            if ordered:
+                in_order.append(future)
+                if len(in_order) >= max_in_flight:
+                    yield from collect(in_order.popleft())
+            else:
+                pending.add(future)
+                if len(pending) >= max_in_flight:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for finished in done:
+                        yield from collect(finished)
+        while in_order:
+            yield from collect(in_order.popleft())
+        for finished in pending:
+            yield from collect(finished)
+
+
+def _iter_files(
+    paths: List[str], pattern: str
+) -> Iterator[Tuple[pathlib.Path, pathlib.Path]]:
+    """
+    Yield ``(path, relative output path)`` for every input file, walking
+    directories recursively for files matching ``pattern``.
+    """
+    for name in paths:
+        path = pathlib.Path(name)
+        if path.is_dir():
+            for found in sorted(path.rglob(pattern)):
+                if found.is_file():
+                    yield found, found.relative_to(path)
+        elif path.is_file():
+            yield path, pathlib.Path(path.name)
+        else:
+            raise CLIError("{}: no such file or directory".format(name))
+
+
+def _check_targets(
+    files: Iterable[Tuple[pathlib.Path, pathlib.Path]],
+    output_dir: pathlib.Path,
+    suffix: str,
+) -> None:
+    """
+    Raise ``CLIError`` if two input files would be written to the same
+    output file, e.g. ``a.md`` found in two directory arguments.
+    """
+    sources: Dict[pathlib.Path, pathlib.Path] = {}
+    for path, relative in files:
+        target = (output_dir / relative).with_suffix(suffix)
+        other = sources.setdefault(target, path)
+        if other != path:
+            raise CLIError(
+                "{} and {} would both be written to {}".format(other, path, target)
+            )
+
+
+def _iter_sources(
+    files: Iterable[Tuple[pathlib.Path, pathlib.Path]]
+) -> Iterator[Tuple[Tuple[pathlib.Path, int], str]]:
+    # Keyed by output path and size, so the text itself can be dropped once
+    # it has been converted.
+    for path, relative in files:
+        try:
+            with path.open(encoding="utf-8", newline="") as handle:
+                text = handle.read()
+        except UnicodeDecodeError as exc:
+            raise CLIError("{}: not valid UTF-8: {}".format(path, exc))
+        except OSError as exc:
+            raise CLIError("{}: {}".format(path, exc.strerror))
+        yield (relative, len(text)), text
+
+
+def _iter_ndjson_file(path: pathlib.Path) -> Iterator[Tuple[Dict[str, Any], str]]:
+    try:
+        with path.open(encoding="utf-8") as handle:
+            yield from _iter_records(handle, str(path))
+    except UnicodeDecodeError as exc:
+        raise CLIError("{}: not valid UTF-8: {}".format(path, exc))
+    except OSError as exc:
+        raise CLIError("{}: {}".format(path, exc.strerror))
+
+
+def _iter_records(
+    lines: Iterable[str], source: str
+) -> Iterator[Tuple[Dict[str, Any], str]]:
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            raise CLIError("{}:{}: invalid JSON: {}".format(source, number, exc))
+        if not isinstance(record, dict) or not isinstance(record.get("text"), str):
+            raise CLIError(
+                '{}:{}: expected an object with a string "text"'.format(source, number)
+            )
+        yield record, record["text"]
+
+
+def _percentile(samples: List[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class _Stats:
+    def __init__(self) -> None:
+        self.start = time.perf_counter()
+        self.latencies: List[float] = []
+        self.chars = 0
+
+    def add(self, chars: int, seconds: float) -> None:
+        self.latencies.append(seconds)
+        self.chars += chars
+
+    def report(self, out: Any) -> None:
+        elapsed = time.perf_counter() - self.start
+        count = len(self.latencies)
+        lines = [
+            "documents: {}".format(count),
+            "input: {:.2f} MB".format(self.chars / 1e6),
+            "elapsed: {:.3f} s".format(elapsed),
+            "throughput: {:.1f} docs/s, {:.2f} MB/s".format(
+                count / elapsed if elapsed else 0.0,
+                self.chars / 1e6 / elapsed if elapsed else 0.0,
+            ),
+        ]
+        if count:
+            lines.append(
+                "latency: p50 {:.3f} ms, p90 {:.3f} ms, p99 {:.3f} ms, max {:.3f} ms".format(
+                    *(
+                        _percentile(self.latencies, fraction) * 1000
+                        for fraction in (0.5, 0.9, 0.99, 1.0)
+                    )
+                )
+            )
+        out.write("\n".join(lines) + "\n")
+
+
+def _build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="slackify-markdown",
+        description="Convert markdown to Slack-compatible markdown (mrkdwn).",
+    )
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        metavar="PATH",
+        help="files or directories to convert; reads stdin if none or '-'",
+    )
+    parser.add_argument(
+        "--ndjson",
+        action="store_true",
+        help='read {"id": ..., "text": ...} records, one per line, and write '
+        "them back with the text converted",
+    )
+    parser.add_argument(
+        "-o",
+        "--output-dir",
+        help="write each converted file here (keeping paths relative to the "
+        "input directory) instead of to stdout",
+    )
+    parser.add_argument(
+        "--suffix",
+        default=DEFAULT_SUFFIX,
+        help="file suffix of converted files in --output-dir (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--pattern",
+        default=DEFAULT_PATTERN,
+        help="files to pick up inside directories (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=1,
+        help="number of worker processes (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--unordered",
+        action="store_true",
+        help="with --workers, write results as they finish instead of in input order",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="print a throughput and latency summary to stderr",
+    )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = _build_arg_parser()
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.ndjson and args.output_dir:
+        parser.error("--output-dir cannot be used with --ndjson")
+    stdin_only = not args.paths or args.paths == ["-"]
+    if "-" in args.paths and not stdin_only:
+        parser.error("'-' cannot be combined with other paths")
+    if args.output_dir and stdin_only:
+        parser.error("--output-dir needs file or directory paths")
+    try:
+        pathlib.PurePath("name").with_suffix(args.suffix)
+    except ValueError:
+        parser.error("--suffix must start with a dot, e.g. .txt")
+
+    try:
+        _run(args, stdin_only)
+    except CLIError as exc:
+        sys.stderr.write("{}: error: {}\n".format(parser.prog, exc))
+        return 1
+    except BrokenPipeError:
+        # The reader went away (e.g. piped into head); nothing left to do.
+        sys.stderr.close()
+        return 1
+    return 0
+
+
+def _run(args: argparse.Namespace, stdin_only: bool) -> None:
+    stats = _Stats()
+    out = sys.stdout
+    items: Iterable[Tuple[Any, str]]
+
+    if args.ndjson:
+        if stdin_only:
+            items = _iter_records(sys.stdin, "<stdin>")
+        else:
+            items = (
+                item
+                for path, _ in _iter_files(args.paths, args.pattern)
+                for item in _iter_ndjson_file(path)
+            )
+        for record, converted, seconds in convert_stream(
+            items, args.workers, not args.unordered
+        ):
+            stats.add(len(record["text"]), seconds)
+            out.write(
+                json.dumps(dict(record, text=converted), ensure_ascii=False) + "\n"
+            )
+    elif stdin_only:
+        text = sys.stdin.read()
+        for _, converted, seconds in convert_stream([(None, text)]):
+            stats.add(len(text), seconds)
+            out.write(converted)
+    else:
+        found: Iterable[Tuple[pathlib.Path, pathlib.Path]]
+        found = _iter_files(args.paths, args.pattern)
+        output_dir = pathlib.Path(args.output_dir) if args.output_dir else None
+        if output_dir is not None:
+            # Every output path is checked before anything is written.
+            found = list(found)
+            _check_targets(found, output_dir, args.suffix)
+        files = _iter_sources(found)
+        for (relative, chars), converted, seconds in convert_stream(
+            files, args.workers, not args.unordered
+        ):
+            stats.add(chars, seconds)
+            if output_dir is None:
+                out.write(converted)
+                continue
+            target = (output_dir / relative).with_suffix(args.suffix)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_text(converted, encoding="utf-8")
+    out.flush()
+    if args.stats:
+        stats.report(sys.stderr)
@@ -0,0 +1,269 @@
+import time
+from typing import Any, Dict, List, Optional, Tuple, Type, Union
+
+from markdown_it.token import Token
+
+from slackify_markdown.cache import CacheInfo, ConversionCache
+from slackify_markdown.fastpath import (
+    is_plain_ascii,
+    is_plain_text,
+    render_plain_ascii,
+    render_plain_text,
+)
+from slackify_markdown.guardrails import (
+    ConversionLimits,
+    ConversionResult,
+    LimitExceeded,
+    exceeds_input_limit,
+    install_guards,
+    new_env,
+    plain_text,
+)
+from slackify_markdown.instrumentation import (
+    ConversionEvent,
+    ConversionObserver,
+    count_tokens,
+)
+from slackify_markdown.metadata import METADATA_KEY, ConversionMetadata, new_metadata
+from slackify_markdown.profile import RenderProfile
+from slackify_markdown.slackify import SlackifyMarkdown, build_parser, compile_rules
+from slackify_markdown.tree import SlackifyTreeRenderer
+
+# "tokens": SlackifyMarkdown, the per-token handler renderer.
+# "tree": SlackifyTreeRenderer, the single-pass block-structure walker.
+ENGINES = ("tokens", "tree")
+
+
+class SlackifyConverter:
+    """
+    Reusable Markdown -> Slack mrkdwn converter.
+
+    Building a ``MarkdownIt`` instance (and disabling rules on it) recompiles
+    every rule chain, which costs more than converting a typical short
+    message. The converter does that work once in ``__init__`` and reuses the
+    parser and renderer for every ``convert()`` call.
+
+    Pass a ``ConversionCache`` to skip the parse-and-render path for inputs
+    that were converted before, and ``engine="tree"`` to render with
+    ``SlackifyTreeRenderer`` instead of ``renderer_cls``. Pass an
+    ``observer`` (see ``ConversionObserver``) to get per-phase timings, sizes
+    and token counts of every conversion; without one, conversions are not
+    timed at all.
+
+    Pass ``limits`` (see ``ConversionLimits``) when converting untrusted
+    input: a conversion that hits one of them returns the input as escaped
+    plain text instead (``convert_guarded()`` says which limit was hit).
+
+    Pass a ``profile`` (see ``RenderProfile``) to change how bullets, list
+    indentation, ordered-list markers, headings, links and images are
+    written. Its strings are computed when the converter is built, so a
+    profile costs nothing per conversion; build one converter per profile
+    and reuse it.
+
+    A converter is reentrant and thread-safe: all parse and render state
+    lives in the call, so one instance can serve any number of threads
+    without locking.
+    """
+
+    def __init__(
+        self,
+        renderer_cls: Type[SlackifyMarkdown] = SlackifyMarkdown,
+        cache: Optional[ConversionCache] = None,
+        engine: str = "tokens",
+        observer: Optional[ConversionObserver] = None,
+        limits: Optional[ConversionLimits] = None,
+        profile: Optional[RenderProfile] = None,
+    ):
+        if engine not in ENGINES:
+            raise ValueError(
+                "engine must be one of {}, not {!r}".format(", ".join(ENGINES), engine)
+            )
+        self.renderer_cls = renderer_cls
+        self.cache = cache
+        self.engine = engine
+        self.observer = observer
+        self.limits = limits
+        self.profile = profile
+        # Everything that changes the output, so converters that differ in
+        # it can share a cache without reading each other's entries.
+        self._cache_variant = (renderer_cls, engine, profile)
+        self._tree_renderer = (
+            SlackifyTreeRenderer(profile) if engine == "tree" else None
+        )
+        self._md = build_parser(renderer_cls, profile=profile)
+        self._supported_tokens = frozenset(renderer_cls.SUPPORTED_TOKENS)
+        # Input without any markdown syntax skips the parser. A subclassed
+        # renderer may render plain text differently, so it always parses.
+        self._fast_path = renderer_cls is SlackifyMarkdown
+        if limits is not None:
+            if any(value is not None and value <= 0 for value in limits):
+                raise ValueError("limits must be positive")
+            install_guards(self._md, limits)
+        # Parse and render state is per call (see SlackifyMarkdown and
+        # SlackifyTreeRenderer), so with the rule caches built up front the
+        # converter can be shared by any number of threads.
+        compile_rules(self._md)
+
+    def convert(self, markdown: str) -> str:
+        """
+        Convert markdown to Slack-compatible markdown.
+        """
+        if self.limits is not None:
+            return self.convert_guarded(markdown).text
+        cache = self.cache
+        if cache is None:
+            return self._convert(markdown)
+        converted = cache.get(markdown, self._cache_variant)
+        if converted is None:
+            converted = self._convert(markdown)
+            cache.put(markdown, converted, self._cache_variant)
+        return converted
+
+    def convert_bytes(self, data: Union[bytes, bytearray, memoryview]) -> bytes:
+        """
+        Convert UTF-8 encoded markdown to UTF-8 encoded Slack markdown.
+
+        ASCII input without markdown syntax is scrubbed, scanned and escaped
+        as bytes, without being decoded, copied into a ``str`` or encoded
+        again. Anything else is decoded once (raising ``UnicodeDecodeError``
+        if it is not UTF-8), converted with ``convert()`` and encoded.
+        """
+        plain = self._fast_path and self.observer is None and self.limits is None
+        if plain and is_plain_ascii(data):
+            return render_plain_ascii(data)
+        return self.convert(str(data, "utf-8")).encode("utf-8")
+
+    def convert_guarded(self, markdown: str) -> ConversionResult:
+        """
+        Convert markdown within the converter's ``limits``, falling back to
+        escaped plain text if one is hit. Fallbacks are not cached: the time
+        budget depends on machine load.
+        """
+        cache = self.cache
+        if cache is not None:
+            converted = cache.get(markdown, self._cache_variant)
+            if converted is not None:
+                return ConversionResult(converted)
+        result = self._convert_limited(markdown)
+        if cache is not None and result.degraded is None:
+            cache.put(markdown, result.text, self._cache_variant)
+        return result
+
+    def convert_with_metadata(self, markdown: str) -> Tuple[str, ConversionMetadata]:
+        """
+        Convert markdown and return the result together with the links,
+        images, mentions and code block sizes it contains (see
+        ``ConversionMetadata``), collected by the renderer on the way. The
+        cache is not used: it only holds converted text. With ``limits``, a
+        degraded conversion only reports the mentions in the plain text.
+        """
+        metadata = new_metadata()
+        if self.limits is not None:
+            return self._convert_limited(markdown, metadata).text, metadata
+        return self._convert(markdown, {METADATA_KEY: metadata}), metadata
+
+    def cache_info(self) -> Optional[CacheInfo]:
+        """
+        Statistics of the attached cache, or None if caching is off.
+        """
+        return self.cache.info() if self.cache is not None else None
+
+    def _convert_limited(
+        self, markdown: str, metadata: Optional[ConversionMetadata] = None
+    ) -> ConversionResult:
+        limits = self.limits or ConversionLimits()
+        # The guards only act during the parse, so a conversion that hits
+        # one has not collected anything yet.
+        mentions = None if metadata is None else metadata.mentions
+        if limits.max_input_bytes is not None and exceeds_input_limit(
+            markdown, limits.max_input_bytes
+        ):
+            return ConversionResult(
+                plain_text(markdown, mentions),
+                "input larger than {} bytes".format(limits.max_input_bytes),
+            )
+        env = new_env(limits)
+        if metadata is not None:
+            env[METADATA_KEY] = metadata
+        try:
+            converted = self._convert(markdown, env)
+        except LimitExceeded as exc:
+            return ConversionResult(plain_text(markdown, mentions), str(exc))
+        return ConversionResult(converted)
+
+    def _convert(self, markdown: str, env: Optional[Dict[str, Any]] = None) -> str:
+        if self.observer is not None:
+            return self._convert_observed(markdown, self.observer, env)
+        # Scrub the sentinel char from user input, see SlackifyMarkdown.slackify().
+        text = markdown.replace(SlackifyMarkdown.NEW_LINE, "")
+        if self._fast_path and is_plain_text(text):
+            if env is None or METADATA_KEY not in env:
+                return render_plain_text(text)
+            return render_plain_text(text, env[METADATA_KEY].mentions)
+        if self._tree_renderer is not None:
+            if env is None:
+                return self._tree_renderer.render(self._md.parse(text, {}))
+            tokens = self._md.parse(text, env)
+            return self._tree_renderer.render(tokens, env.get(METADATA_KEY))
+        return self._md.render(text, env)
+
+    def _convert_observed(
+        self,
+        markdown: str,
+        observer: ConversionObserver,
+        env: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """
+        ``_convert()`` with each phase timed separately.
+        """
+        clock = time.perf_counter
+        start = clock()
+        text = markdown.replace(SlackifyMarkdown.NEW_LINE, "")
+        scrubbed = clock()
+        if env is None:
+            env = {}
+        metadata: Optional[ConversionMetadata] = env.get(METADATA_KEY)
+        tokens: List[Token] = []
+        if self._fast_path and is_plain_text(text):
+            # The pre-scan counts as the parse; nothing is rendered.
+            parsed = rendered = clock()
+            converted = render_plain_text(
+                text, None if metadata is None else metadata.mentions
+            )
+            finished = clock()
+        elif self._tree_renderer is not None:
+            tokens = self._md.parse(text, env)
+            parsed = clock()
+            converted = self._tree_renderer.render(tokens, metadata)
+            rendered = finished = clock()
+        else:
+            tokens = self._md.parse(text, env)
+            parsed = clock()
+            renderer = self._md.renderer
+            structural = renderer.render_structural(tokens, self._md.options, env)
+            rendered = clock()
+            converted = renderer.materialize_newlines(structural).rstrip("\n") + "\n"
+            finished = clock()
+
+        counts, dropped = count_tokens(tokens, self._supported_tokens)
+        observer.on_conversion(
+            ConversionEvent(
+                engine=self.engine,
+                input_chars=len(markdown),
+                output_chars=len(converted),
+                scrub_seconds=scrubbed - start,
+                parse_seconds=parsed - scrubbed,
+                render_seconds=rendered - parsed,
+                postprocess_seconds=finished - rendered,
+                token_counts=counts,
+                dropped_tokens=dropped,
+            )
+        )
+        return converted
+
+    def _parse(self, text: str, env: Optional[Dict[str, Any]] = None) -> List[Token]:
+        # ``text`` must already be scrubbed of the sentinel char.
+        return self._md.parse(text, {} if env is None else env)
+
+    def _render_structural(self, tokens: List[Token], env: Dict[str, Any]) -> str:
+        return self._md.renderer.render_structural(tokens, self._md.options, env)
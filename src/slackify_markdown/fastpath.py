@@ -0,0 +1,104 @@
+import re
+from typing import List, Optional
+
+from slackify_markdown.utils import escape_specials, escape_specials_bytes
+
+# Anything that could make markdown-it produce more than paragraphs of plain
+# text, or change the text itself. Deliberately conservative: a false
+# positive only costs the normal parse. Every alternative starts with a
+# literal character, so the regex engine skips in C to the next position
+# where one of them occurs. The checks at the very start and end of the text
+# are done separately.
+_MARKDOWN_TRIGGER_RE = re.compile(
+    # Inline syntax: emphasis, code, links and images, escapes, strikethrough,
+    # and entities; NUL and CR are rewritten by markdown-it's normalize step.
+    r"\*|_|`|\[|\\|\x00|\r|~~|&[#A-Za-z0-9]"
+    # "<" starts an autolink unless it opens a Slack mention. "<#" and "<!"
+    # are only safe without an "@" or ":" before the next bracket, which
+    # could make an e-mail or URI autolink. A mention must also close on its
+    # own line: the renderer escapes each line separately.
+    r"|<(?![@#!])|<[#!][^<>@:]*[@:]|<[@#!][^<>\n]*\n"
+    # Whitespace at either end of a line is stripped, or indents a code block.
+    r"|\n(?<=[^\S\n]\n)|\n[^\S\n]"
+    # Block syntax at the start of a line: headings, blockquotes, bullets,
+    # rules, setext underlines, table delimiter rows and ordered list markers
+    # (fences already match "`" or "~~" above).
+    r"|\n(?:[#>\-+=|:]|\d{1,9}[.)])"
+)
+_TEXT_START_TRIGGER_RE = re.compile(r"[^\S\n]|[#>\-+=]|\d{1,9}[.)]")
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+# The same for UTF-8 input, which is only equivalent for ASCII: first any
+# byte that is not ASCII, or is NUL or the NEW_LINE sentinel (which would
+# need scrubbing).
+_NOT_ASCII_TEXT_BYTES_RE = re.compile(rb"[^\x01\x03-\x7f]")
+# In str patterns and str.isspace(), \x1c-\x1f are whitespace too, and
+# markdown-it strips them as such; in bytes patterns and bytes.isspace()
+# they are not. The bytes patterns spell the str class out instead.
+_ASCII_SPACE_BYTES = b"\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f "
+_INLINE_SPACE_CLASS = r"[\t\x0b\x0c\r\x1c-\x1f ]"
+
+
+def _bytes_pattern(pattern: str) -> "re.Pattern[bytes]":
+    return re.compile(pattern.replace(r"[^\S\n]", _INLINE_SPACE_CLASS).encode("ascii"))
+
+
+_MARKDOWN_TRIGGER_BYTES_RE = _bytes_pattern(_MARKDOWN_TRIGGER_RE.pattern)
+_TEXT_START_TRIGGER_BYTES_RE = _bytes_pattern(_TEXT_START_TRIGGER_RE.pattern)
+_BLANK_LINES_BYTES_RE = re.compile(rb"\n{3,}")
+
+
+def is_plain_text(text: str) -> bool:
+    """
+    True if ``text`` (already scrubbed of the NEW_LINE sentinel) contains no
+    markdown syntax, so ``render_plain_text()`` converts it exactly as a full
+    parse and render would.
+    """
+    last = text[-1:]
+    if last.isspace() and last != "\n":
+        return False
+    if _TEXT_START_TRIGGER_RE.match(text) is not None:
+        return False
+    return _MARKDOWN_TRIGGER_RE.search(text) is None
+
+
+def render_plain_text(text: str, mentions: Optional[List[str]] = None) -> str:
+    """
+    Convert text that passed ``is_plain_text()``: paragraphs separated by at
+    most one blank line, &, < and > escaped, and one trailing newline.
+    Mentions are appended to ``mentions`` if given.
+    """
+    return (
+        escape_specials(_BLANK_LINES_RE.sub("\n\n", text).strip("\n"), mentions) + "\n"
+    )
+
+
+def is_plain_ascii(data: bytes) -> bool:
+    """
+    True if the UTF-8 encoded ``data`` (or any bytes-like object) is ASCII
+    without the NEW_LINE sentinel and passes ``is_plain_text()``, so
+    ``render_plain_ascii()`` converts it without decoding.
+    """
+    if isinstance(data, memoryview):
+        ascii_text = _NOT_ASCII_TEXT_BYTES_RE.search(data) is None
+    else:
+        # NUL matches the trigger below.
+        ascii_text = data.isascii() and b"\x02" not in data
+    if not ascii_text:
+        return False
+    last = bytes(data[-1:])
+    if last and last in _ASCII_SPACE_BYTES and last != b"\n":
+        return False
+    if _TEXT_START_TRIGGER_BYTES_RE.match(data) is not None:
+        return False
+    return _MARKDOWN_TRIGGER_BYTES_RE.search(data) is None
+
+
+def render_plain_ascii(data: bytes) -> bytes:
+    """
+    ``render_plain_text()`` for input that passed ``is_plain_ascii()``.
+    """
+    # bytes() returns bytes input itself, uncopied.
+    text = bytes(data)
+    if b"\n\n\n" in text:
+        text = _BLANK_LINES_BYTES_RE.sub(b"\n\n", text)
+    return escape_specials_bytes(text.strip(b"\n")) + b"\n"
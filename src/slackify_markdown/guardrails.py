@@ -0,0 +1,145 @@
+import time
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from markdown_it import MarkdownIt
+from markdown_it.rules_core import StateCore
+
+from slackify_markdown.slackify import SlackifyMarkdown
+from slackify_markdown.utils import escape_specials
+
+# Key of the per-call _Guard in the markdown-it env. Parses without one (e.g.
+# the windowed parses of slackify_chunks()) are not limited.
+_GUARD_KEY = "slackify_guard"
+# The clock is read once every this many parser steps.
+_CHECK_EVERY = 64
+
+_CONTAINER_OPEN = frozenset(
+    ("bullet_list_open", "ordered_list_open", "blockquote_open")
+)
+_CONTAINER_CLOSE = frozenset(
+    ("bullet_list_close", "ordered_list_close", "blockquote_close")
+)
+
+
+class ConversionLimits(NamedTuple):
+    """
+    Resource limits for ``SlackifyConverter(limits=...)``; ``None`` turns a
+    limit off.
+
+    ``max_input_bytes`` caps the UTF-8 size of the input. ``max_nesting``
+    caps how deeply lists and blockquotes nest. ``max_seconds`` is a
+    wall-clock budget for parsing, checked every few parser steps (each
+    block rule attempt at a line, each line inside a paragraph, list,
+    blockquote or table, and each inline rule attempt at a position), so
+    even a single pathological paragraph or table is cut short.
+    """
+
+    max_input_bytes: Optional[int] = None
+    max_nesting: Optional[int] = None
+    max_seconds: Optional[float] = None
+
+
+class ConversionResult(NamedTuple):
+    """
+    Output of ``SlackifyConverter.convert_guarded()``. ``degraded`` names the
+    limit that was hit, in which case ``text`` is the input as escaped plain
+    text; it is ``None`` for a normal conversion.
+    """
+
+    text: str
+    degraded: Optional[str] = None
+
+
+class LimitExceeded(Exception):
+    """
+    Raised inside the parse when a ``ConversionLimits`` limit is hit.
+    """
+
+
+class _Guard:
+    __slots__ = ("deadline", "max_nesting", "steps")
+
+    def __init__(self, limits: ConversionLimits):
+        self.deadline = (
+            None
+            if limits.max_seconds is None
+            else time.perf_counter() + limits.max_seconds
+        )
+        self.max_nesting = limits.max_nesting
+        self.steps = 0
+
+
+def exceeds_input_limit(markdown: str, max_bytes: int) -> bool:
+    # Every character takes 1 to 4 bytes in UTF-8, so only inputs close to
+    # the limit need encoding to find out.
+    if len(markdown) > max_bytes:
+        return True
+    if len(markdown) * 4 <= max_bytes:
+        return False
+    return len(markdown.encode("utf-8", "surrogatepass")) > max_bytes
+
+
+def plain_text(markdown: str, mentions: Optional[List[str]] = None) -> str:
+    """
+    The degraded output: the input with &, < and > escaped (mentions kept,
+    and appended to ``mentions`` if given) and nothing else interpreted.
+    """
+    text = markdown.replace(SlackifyMarkdown.NEW_LINE, "")
+    return escape_specials(text, mentions).rstrip("\n") + "\n"
+
+
+def new_env(limits: ConversionLimits) -> Dict[str, Any]:
+    """
+    A markdown-it env that makes the rules added by ``install_guards()``
+    enforce ``limits`` on one parse, starting its time budget now.
+    """
+    return {_GUARD_KEY: _Guard(limits)}
+
+
+def install_guards(md: MarkdownIt, limits: ConversionLimits) -> None:
+    """
+    Add the rules that enforce ``limits.max_nesting`` and
+    ``limits.max_seconds`` to ``md``. The time rules come first in the block
+    and inline chains and never match, so they only count steps.
+    """
+    if limits.max_seconds is not None:
+        # Also in the terminator chains that paragraphs, lists, blockquotes
+        # and tables try at each of their lines, so one long block counts a
+        # step per line.
+        md.block.ruler.before(
+            md.block.ruler.get_active_rules()[0],
+            "slackify_budget",
+            _tick,
+            {"alt": ["paragraph", "reference", "blockquote", "list"]},
+        )
+        md.inline.ruler.before(
+            md.inline.ruler.get_active_rules()[0], "slackify_budget", _tick
+        )
+    if limits.max_nesting is not None:
+        md.core.ruler.after("block", "slackify_nesting", _check_nesting)
+
+
+def _tick(state: Any, *args: Any) -> bool:
+    guard: Optional[_Guard] = state.env.get(_GUARD_KEY)
+    if guard is not None and guard.deadline is not None:
+        guard.steps += 1
+        if not guard.steps % _CHECK_EVERY and time.perf_counter() > guard.deadline:
+            raise LimitExceeded("time budget exceeded")
+    return False
+
+
+def _check_nesting(state: StateCore) -> None:
+    # Runs right after the block parse, so input over the limit skips the
+    # inline parse entirely.
+    guard: Optional[_Guard] = state.env.get(_GUARD_KEY)
+    if guard is None or guard.max_nesting is None:
+        return
+    max_nesting = guard.max_nesting
+    depth = 0
+    for token in state.tokens:
+        if token.type in _CONTAINER_OPEN:
+            depth += 1
+            if depth > max_nesting:
+                raise LimitExceeded("nesting deeper than {}".format(max_nesting))
+        elif token.type in _CONTAINER_CLOSE:
+            depth -= 1
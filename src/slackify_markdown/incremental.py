@@ -0,0 +1,273 @@
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from markdown_it.token import Token
+
+from slackify_markdown.blocks import (
+    LINE_BREAK_RE,
+    StructuralJoiner,
+    may_define_references,
+    parse_blocks,
+    require_token_engine,
+    split_top_level,
+)
+from slackify_markdown.converter import SlackifyConverter
+from slackify_markdown.service import _default_converter
+from slackify_markdown.slackify import SlackifyMarkdown
+
+
+class IncrementalUpdate(NamedTuple):
+    """
+    Result of ``IncrementalSlackifier.update()``.
+
+    ``text`` is the conversion of the whole new document, always equal to
+    ``slackify_markdown(new_text)``. ``changed`` lists the ``(start, end)``
+    character ranges of ``text`` rendered by this update, one per re-rendered
+    block, in order. Everything outside them is reused output of blocks that
+    did not change, possibly at a new offset. ``rendered`` and ``reused``
+    count the top-level blocks of each kind.
+    """
+
+    text: str
+    changed: List[Tuple[int, int]]
+    rendered: int
+    reused: int
+
+
+class _Block(NamedTuple):
+    # Offset of the block's first line in the document.
+    start: int
+    # The block's source lines.
+    source: str
+    # Its structural rendering (see SlackifyMarkdown.render_structural).
+    structural: str
+
+
+class IncrementalSlackifier:
+    """
+    Re-convert successive versions of one document, e.g. a message being
+    edited, rendering only the top-level blocks that changed.
+
+    The handle keeps the source, offset and rendering of every top-level
+    block (paragraph, list, fence, ...) of the last version. On ``update()``
+    the blocks that end before the first changed line are kept. Parsing
+    resumes at the start of the first block that could have changed and
+    stops at the first old block boundary after the last changed character
+    that the new parse confirms. The blocks from there on are kept and moved.
+    Only this region is parsed, block-level first. A block in the region
+    whose source matches an old block, wherever it was, reuses that
+    rendering. The rest get the inline parse and are rendered. An edit that
+    changes a neighbour's context is in the region too. For example,
+    deleting the paragraph between two lists merges them into one new block.
+
+    Link reference definitions (``[id]: url``) apply to the whole document,
+    so text that may hold one is block-parsed in full on every update, and
+    when the set of definitions changes, every block is rendered again. A
+    handle is not thread-safe. Blocks are rendered with the token renderer,
+    so a converter built with ``engine="tree"`` raises ``ValueError``.
+    """
+
+    def __init__(self, converter: Optional[SlackifyConverter] = None):
+        self._converter = converter or _default_converter
+        require_token_engine(self._converter)
+        self._source = ""
+        self._blocks: List[_Block] = []
+        self._references: Dict[str, Any] = {}
+        self._text = "\n"
+
+    @property
+    def text(self) -> str:
+        """
+        Conversion of the last version passed to ``update()``.
+        """
+        return self._text
+
+    def update(self, markdown: str) -> IncrementalUpdate:
+        """
+        Convert the new version ``markdown`` of the document, reusing the
+        rendering of every top-level block that is unchanged since the last
+        update.
+        """
+        text = markdown.replace(SlackifyMarkdown.NEW_LINE, "")
+        old_blocks = self._blocks
+        references: Dict[str, Any] = {}
+        if may_define_references(text) or self._references:
+            # Kept blocks were rendered with the old definitions.
+            env: Dict[str, Any] = {}
+            head: List[_Block] = []
+            region = self._parse_region(text, 0, None, env)
+            tail: List[_Block] = []
+            references = env.get("references", {})
+        else:
+            head, region, tail = self._resync(text)
+        if references != self._references:
+            old_blocks = []
+            self._references = references
+
+        # Block source -> structural rendering. A dict lookup hashes the
+        # source, so moved and duplicated blocks are found too.
+        known = {block.source: block.structural for block in old_blocks}
+        blocks = head
+        fresh: Set[int] = set()
+        for start, source in region:
+            structural = known.get(source)
+            if structural is None:
+                structural = self._render(source, references)
+                known[source] = structural
+                fresh.add(len(blocks))
+            blocks.append(_Block(start, source, structural))
+        blocks.extend(tail)
+
+        self._source = text
+        self._blocks = blocks
+        output, changed = _stitch(blocks, fresh)
+        self._text = output
+        return IncrementalUpdate(output, changed, len(fresh), len(blocks) - len(fresh))
+
+    def _resync(
+        self, text: str
+    ) -> Tuple[List[_Block], List[Tuple[int, str]], List[_Block]]:
+        """
+        Split the new version into the old blocks kept before the edit, the
+        parsed (offset, source) of the blocks in the edited region, and the
+        old blocks kept after it, moved to their new offsets.
+        """
+        old, blocks = self._source, self._blocks
+        prefix = _common_prefix(old, text)
+        suffix = _common_suffix(old, text, min(len(old), len(text)) - prefix)
+
+        # An old block is unchanged if the next one starts on a line that is
+        # complete before the first change, and so is the line after it:
+        # markdown decides where a block ends from the line where the next
+        # one starts, plus the line after it when that one is a table header.
+        keep = 0
+        while keep + 1 < len(blocks):
+            end = _second_line_end(old, blocks[keep + 1].start)
+            if end is None or end > prefix:
+                break
+            keep += 1
+        # With no block kept, leading blank lines may have changed too.
+        resume = blocks[keep].start if keep else 0
+
+        # The first old block starting after the last change, with the line
+        # break before it unchanged too, is a candidate to resync at.
+        shift = len(text) - len(old)
+        for idx in range(keep + 1, len(blocks)):
+            start = blocks[idx].start
+            if start > len(old) - suffix and start + shift > resume:
+                region = self._parse_region(text, resume, start + shift, {})
+                if region is not None:
+                    tail = [
+                        _Block(block.start + shift, block.source, block.structural)
+                        for block in blocks[idx:]
+                    ]
+                    return blocks[:keep], region, tail
+                break
+        return blocks[:keep], self._parse_region(text, resume, None, {}), []
+
+    def _parse_region(
+        self, text: str, start: int, stop: Optional[int], env: Dict[str, Any]
+    ) -> Any:
+        """
+        (offset, source) of the top-level blocks from ``start`` to ``stop``
+        (the end of the text if None), or None if no block starts exactly at
+        ``stop``. The line starting at ``stop`` and the one after it are
+        parsed too, to see where the block before it ends.
+        """
+        if stop is None:
+            end = len(text)
+        else:
+            end = _second_line_end(text, stop) or len(text)
+        segment = text[start:end]
+        groups = split_top_level(parse_blocks(self._converter, segment, env))
+        line_starts = [0]
+        line_starts.extend(match.end() for match in LINE_BREAK_RE.finditer(segment))
+        line_starts.append(len(segment))
+        if stop is not None:
+            groups = _groups_before(groups, line_starts, stop - start)
+            if groups is None:
+                return None
+        last_line = len(line_starts) - 1
+        region = []
+        for group in groups:
+            first, last = group[0].map  # type: ignore[misc]
+            begin, end = line_starts[first], line_starts[min(last, last_line)]
+            region.append((start + begin, segment[begin:end]))
+        return region
+
+    def _render(self, source: str, references: Dict[str, Any]) -> str:
+        # A top-level block parses to the same tokens on its own as within
+        # the document, given the document's references.
+        converter = self._converter
+        env: Dict[str, Any] = {}
+        if references:
+            env["references"] = dict(references)
+        return converter._render_structural(converter._parse(source, env), env)
+
+
+def _second_line_end(text: str, pos: int) -> Optional[int]:
+    """
+    Offset just past the line break that ends the line after the one
+    containing ``pos``, or None if the text ends before it.
+    """
+    line = LINE_BREAK_RE.search(text, pos)
+    if line is None:
+        return None
+    line = LINE_BREAK_RE.search(text, line.end())
+    return None if line is None else line.end()
+
+
+def _groups_before(
+    groups: List[List[Token]], line_starts: List[int], offset: int
+) -> Optional[List[List[Token]]]:
+    for idx, group in enumerate(groups):
+        if line_starts[group[0].map[0]] == offset:  # type: ignore[index]
+            return groups[:idx]
+    return None
+
+
+def _stitch(blocks: List[_Block], fresh: Set[int]) -> Tuple[str, List[Tuple[int, int]]]:
+    """
+    Materialize the blocks' structural renderings with a
+    ``StructuralJoiner``. Also returns the output ranges of the blocks whose
+    index is in ``fresh``.
+    """
+    parts: List[str] = []
+    changed: List[Tuple[int, int]] = []
+    length = 0
+    joiner = StructuralJoiner()
+    for idx, block in enumerate(blocks):
+        part = joiner.add(block.structural)
+        if not part:
+            continue
+        if idx in fresh:
+            changed.append(
+                (length + len(part) - len(part.lstrip("\n")), length + len(part))
+            )
+        parts.append(part)
+        length += len(part)
+    output = "".join(parts).rstrip("\n")
+    end = len(output)
+    return output + "\n", [(start, min(range_end, end)) for start, range_end in changed]
+
+
+def _common_prefix(a: str, b: str) -> int:
+    # Binary search over slice comparisons, which run in C.
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        mid = (low + high + 1) // 2
+        if a[:mid] == b[:mid]:
+            low = mid
+        else:
+            high = mid - 1
+    return low
+
+
+def _common_suffix(a: str, b: str, limit: int) -> int:
+    low, high = 0, limit
+    while low < high:
+        mid = (low + high + 1) // 2
+        if a[-mid:] == b[-mid:]:
+            low = mid
+        else:
+            high = mid - 1
+    return low
@@ -0,0 +1,179 @@
+import bisect
+import threading
+from collections import Counter
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Protocol, Tuple
+
+from markdown_it.token import Token
+
+PHASES = ("scrub", "parse", "render", "postprocess")
+
+
+class ConversionEvent(NamedTuple):
+    """
+    What one conversion did. The ``*_seconds`` fields are the phases of
+    ``SlackifyConverter.convert()``: removing the STX sentinel from the input,
+    the markdown-it parse, handler dispatch, and capping and materializing
+    structural newlines. The "tree" engine has no separate post-process, so
+    its ``postprocess_seconds`` is 0. Input without markdown syntax takes
+    the plain-text fast path: its ``parse_seconds`` is the pre-scan and it
+    has no tokens.
+
+    ``token_counts`` counts every token by type, inline children included.
+    ``dropped_tokens`` counts the block tokens the renderer skipped because
+    they are not in ``SlackifyMarkdown.SUPPORTED_TOKENS`` (e.g. ``hr``).
+    """
+
+    engine: str
+    input_chars: int
+    output_chars: int
+    scrub_seconds: float
+    parse_seconds: float
+    render_seconds: float
+    postprocess_seconds: float
+    token_counts: Dict[str, int]
+    dropped_tokens: Dict[str, int]
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(
+            (
+                self.scrub_seconds,
+                self.parse_seconds,
+                self.render_seconds,
+                self.postprocess_seconds,
+            )
+        )
+
+
+class ConversionObserver(Protocol):
+    """
+    Anything with an ``on_conversion(event)`` method can be passed as
+    ``SlackifyConverter(observer=...)``. It is called once per conversion
+    (cache hits are not conversions), on the converting thread, so it should
+    be quick and thread-safe.
+    """
+
+    def on_conversion(self, event: ConversionEvent) -> None:
+        """
+        Receive the ``event`` of one conversion.
+        """
+
+
+def count_tokens(
+    tokens: List[Token], supported: FrozenSet[str]
+) -> Tuple[Dict[str, int], Dict[str, int]]:
+    """
+    Count ``tokens`` (and their inline children) by type, and the top-level
+    tokens whose type is not in ``supported``. A supported ``table_open`` is
+    rendered with everything up to its ``table_close``, so nothing in a
+    table counts as dropped.
+    """
+    counts: Counter = Counter()
+    dropped: Counter = Counter()
+    in_table = False
+    for token in tokens:
+        kind = token.type
+        counts[kind] += 1
+        if kind == "table_open" or kind == "table_close":
+            in_table = kind == "table_open" and kind in supported
+        elif kind not in supported and not in_table:
+            dropped[kind] += 1
+        if token.children:
+            counts.update(child.type for child in token.children)
+    return dict(counts), dict(dropped)
+
+
+class Histogram:
+    """
+    Fixed-memory histogram with geometric buckets: bucket ``i`` holds values
+    up to ``start * factor ** i``, the last bucket everything above.
+    Percentiles are estimated as the upper bound of the bucket they fall in,
+    capped at the largest value seen.
+    """
+
+    def __init__(self, start: float, factor: float = 2.0, buckets: int = 40):
+        self.bounds = [start * factor**idx for idx in range(buckets - 1)]
+        self.counts = [0] * buckets
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def add(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def percentile(self, fraction: float) -> float:
+        if not self.count:
+            return 0.0
+        assert self.max is not None
+        rank = max(1, int(round(fraction * self.count)))
+        seen = 0
+        for idx, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                if idx < len(self.bounds):
+                    return min(self.bounds[idx], self.max)
+                break
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "min": self.min or 0.0,
+            "max": self.max or 0.0,
+            "p50": self.percentile(0.5),
+            "p90": self.percentile(0.9),
+            "p99": self.percentile(0.99),
+        }
+
+
+class HistogramObserver:
+    """
+    Observer that aggregates conversions in memory: a histogram per phase
+    duration (plus the total) and per input and output size, and running
+    totals of token counts and dropped tokens by type. Thread-safe.
+    """
+
+    _TIME_FIELDS = tuple(phase + "_seconds" for phase in PHASES) + ("total_seconds",)
+    _SIZE_FIELDS = ("input_chars", "output_chars")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            # Time buckets run from 1 µs to about 3 days, size buckets from 1 char.
+            self.histograms: Dict[str, Histogram] = {
+                name: Histogram(1e-6) for name in self._TIME_FIELDS
+            }
+            self.histograms.update((name, Histogram(1.0)) for name in self._SIZE_FIELDS)
+            self.token_counts: Counter = Counter()
+            self.dropped_tokens: Counter = Counter()
+
+    def on_conversion(self, event: ConversionEvent) -> None:
+        with self._lock:
+            for name in self._TIME_FIELDS + self._SIZE_FIELDS:
+                self.histograms[name].add(getattr(event, name))
+            self.token_counts.update(event.token_counts)
+            self.dropped_tokens.update(event.dropped_tokens)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """
+        Summaries (count, mean, min, max, p50, p90, p99) of every histogram,
+        plus ``"tokens"`` and ``"dropped_tokens"`` totals.
+        """
+        with self._lock:
+            result: Dict[str, Dict[str, float]] = {
+                name: histogram.summary() for name, histogram in self.histograms.items()
+            }
+            result["tokens"] = dict(self.token_counts)
+            result["dropped_tokens"] = dict(self.dropped_tokens)
+            return result
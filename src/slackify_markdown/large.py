@@ -0,0 +1,268 @@
+import os
+import re
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+from markdown_it.token import Token
+
+from slackify_markdown import batch
+from slackify_markdown.blocks import (
+    LINE_BREAK_RE,
+    StructuralJoiner,
+    may_define_references,
+    parse_blocks,
+    split_top_level,
+)
+from slackify_markdown.converter import SlackifyConverter
+from slackify_markdown.service import _default_converter
+from slackify_markdown.slackify import SlackifyMarkdown
+
+# Target size of the segments a large document is split into.
+DEFAULT_SEGMENT_CHARS = 1024 * 1024
+# Segments in flight per worker; bounds how much of the input is held in
+# pickled copies at once.
+_SEGMENTS_PER_WORKER = 2
+# A blank line followed by a line that starts at column 0 with something
+# other than a list marker: every top-level block that can be open there
+# (paragraph, list, blockquote, indented code) ends at such a line, unless
+# it is inside a fence. That is only a candidate: each cut is verified
+# against the parse (see _convert_segment).
+_CUT_RE = re.compile(r"\n[ \t\r]*\n(?=[^\s\-+*\d])")
+_FENCE_LINE_RE = re.compile(r"^ {0,3}(?:`{3,}|~{3,})", re.MULTILINE)
+
+# (source of the segment plus the first line of the next one, line number of
+# that next segment's start or None for the last segment)
+Segment = Tuple[str, Optional[int]]
+# Runs a function over argument tuples, yielding the results in order.
+Runner = Callable[[Any, Iterator[Tuple[Any, ...]]], Iterator[Any]]
+
+
+def slackify_large(
+    markdown: str,
+    workers: Optional[int] = None,
+    segment_chars: int = DEFAULT_SEGMENT_CHARS,
+) -> str:
+    """
+    Convert a very large markdown document, segment by segment, across
+    ``workers`` processes (default: one per CPU). The output is identical to
+    ``slackify_markdown(markdown)``.
+
+    The document is cut into segments of about ``segment_chars`` characters
+    at top-level block boundaries. Each segment is parsed and rendered on its
+    own, and the structural renderings are stitched back together with the
+    same blank-line cap ``render()`` applies. No process ever holds the token
+    list of the whole document. Link reference definitions, which apply to
+    the whole document, are collected from all segments first and given to
+    every segment. With ``workers=1`` the segments are converted in this
+    process, one at a time.
+    """
+    if workers is not None and workers < 1:
+        raise ValueError("workers must be at least 1")
+    if segment_chars < 1:
+        raise ValueError("segment_chars must be at least 1")
+    text = markdown.replace(SlackifyMarkdown.NEW_LINE, "")
+    cuts = _find_cuts(text, segment_chars)
+    if len(cuts) == 1:
+        return _default_converter.convert(text)
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        return _convert(text, cuts, _run_in_process)
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(cuts)), initializer=batch._init_worker
+    ) as pool:
+        max_in_flight = workers * _SEGMENTS_PER_WORKER
+        return _convert(
+            text, cuts, lambda func, jobs: _bounded_map(pool, max_in_flight, func, jobs)
+        )
+
+
+def _convert(text: str, cuts: List[int], run: Runner) -> str:
+    references: Optional[Dict[str, Any]] = None
+    if may_define_references(text):
+        references = _merge_references(
+            run(_segment_references, ((segment,) for segment in _segments(text, cuts)))
+        )
+        if references is None:
+            # Some cut is not a block boundary, so the definitions found per
+            # segment can't be trusted.
+            return _default_converter.convert(text)
+    structurals = run(
+        _convert_segment, ((segment, references) for segment in _segments(text, cuts))
+    )
+    return _stitch(text, cuts, structurals, references)
+
+
+def _find_cuts(text: str, segment_chars: int) -> List[int]:
+    """
+    Offsets where segments start: the first candidate boundary at least
+    ``segment_chars`` past the previous one, skipping candidates inside a
+    top-level fence.
+    """
+    cuts = [0]
+    in_fence = False
+    fence_scan = 0
+    pos = segment_chars
+    while pos < len(text):
+        match = _CUT_RE.search(text, pos)
+        if match is None:
+            break
+        cut = match.end()
+        for _ in _FENCE_LINE_RE.finditer(text, fence_scan, cut):
+            in_fence = not in_fence
+        fence_scan = cut
+        if in_fence:
+            pos = cut
+            continue
+        cuts.append(cut)
+        pos = cut + segment_chars
+    return cuts
+
+
+def _segment(text: str, start: int, stop: Optional[int]) -> Segment:
+    """
+    The source from ``start`` to ``stop`` plus the line starting at ``stop``,
+    which the parse needs to see to know that the last block ends there.
+    """
+    if stop is None:
+        return text[start:], None
+    line_end = text.find("\n", stop)
+    line_end = len(text) if line_end == -1 else line_end + 1
+    return text[start:line_end], len(LINE_BREAK_RE.findall(text, start, stop))
+
+
+def _split_at(
+    tokens: List[Token], next_line: Optional[int]
+) -> Optional[List[List[Token]]]:
+    """
+    The top-level groups before ``next_line``, or None if no top-level block
+    starts exactly there, i.e. the cut is not a block boundary.
+    """
+    groups = split_top_level(tokens)
+    if next_line is None:
+        return groups
+    for idx, group in enumerate(groups):
+        if group[0].map[0] == next_line:
+            return groups[:idx]
+    return None
+
+
+def _segment_references(
+    segment: Segment, converter: Optional[SlackifyConverter] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Link reference definitions of a segment, found with a block-only parse;
+    None if the segment's end is not a block boundary.
+    """
+    source, next_line = segment
+    env: Dict[str, Any] = {}
+    tokens = parse_blocks(converter or batch._worker_converter, source, env)  # type: ignore[arg-type]
+    if _split_at(tokens, next_line) is None:
+        return None
+    return env.get("references", {})
+
+
+def _convert_segment(
+    segment: Segment,
+    references: Optional[Dict[str, Any]],
+    converter: Optional[SlackifyConverter] = None,
+) -> Optional[str]:
+    """
+    Structural rendering of the blocks in a segment, or None if the
+    segment's end is not a block boundary.
+    """
+    converter = converter or batch._worker_converter
+    source, next_line = segment
+    env: Dict[str, Any] = {}
+    if references:
+        # Earlier definitions win, as when the whole document is parsed.
+        env["references"] = dict(references)
+    groups = _split_at(converter._parse(source, env), next_line)  # type: ignore[union-attr]
+    if groups is None:
+        return None
+    tokens = [token for group in groups for token in group]
+    return converter._render_structural(tokens, env)  # type: ignore[union-attr]
+
+
+def _merge_references(
+    found: Iterator[Optional[Dict[str, Any]]]
+) -> Optional[Dict[str, Any]]:
+    references: Dict[str, Any] = {}
+    for segment_references in found:
+        if segment_references is None:
+            return None
+        for label, definition in segment_references.items():
+            references.setdefault(label, definition)
+    return references
+
+
+def _segments(text: str, cuts: List[int]) -> Iterator[Segment]:
+    for idx, start in enumerate(cuts):
+        stop = cuts[idx + 1] if idx + 1 < len(cuts) else None
+        yield _segment(text, start, stop)
+
+
+def _run_in_process(func: Any, jobs: Iterator[Tuple[Any, ...]]) -> Iterator[Any]:
+    return (func(*args, _default_converter) for args in jobs)
+
+
+def _bounded_map(
+    pool: ProcessPoolExecutor,
+    max_in_flight: int,
+    func: Any,
+    jobs: Iterator[Tuple[Any, ...]],
+) -> Iterator[Any]:
+    """
+    ``pool.map`` that only submits a job once fewer than ``max_in_flight``
+    are pending, so the jobs' arguments are not all alive at once.
+    """
+    in_flight: Deque["Future[Any]"] = deque()
+    for args in jobs:
+        in_flight.append(pool.submit(func, *args))
+        if len(in_flight) >= max_in_flight:
+            yield in_flight.popleft().result()
+    while in_flight:
+        yield in_flight.popleft().result()
+
+
+def _stitch(
+    text: str,
+    cuts: List[int],
+    structurals: Iterator[Optional[str]],
+    references: Optional[Dict[str, Any]],
+) -> str:
+    """
+    Materialize the structural renderings of consecutive segments into the
+    final output. A segment whose end turned out not to be a block boundary
+    (None) is converted again here, together with the segments after it,
+    until a boundary holds.
+    """
+    parts: List[str] = []
+    joiner = StructuralJoiner()
+    skip_until = 0
+    for idx, structural in enumerate(structurals):
+        if idx < skip_until:
+            continue
+        if structural is None:
+            structural, skip_until = _convert_span(text, cuts, idx, references)
+        parts.append(joiner.add(structural))
+    return "".join(parts).rstrip("\n") + "\n"
+
+
+def _convert_span(
+    text: str, cuts: List[int], first: int, references: Optional[Dict[str, Any]]
+) -> Tuple[str, int]:
+    """
+    Convert from ``cuts[first]`` up to the first later cut that is a block
+    boundary, in this process. Returns the structural rendering and the index
+    of the segment to continue with.
+    """
+    for stop_idx in range(first + 1, len(cuts) + 1):
+        stop = cuts[stop_idx] if stop_idx < len(cuts) else None
+        structural = _convert_segment(
+            _segment(text, cuts[first], stop), references, _default_converter
+        )
+        if structural is not None:
+            return structural, stop_idx
+    raise AssertionError("the last segment always ends at a block boundary")
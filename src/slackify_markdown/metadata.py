@@ -0,0 +1,27 @@
+from typing import List, NamedTuple
+
+# Key of the per-call ConversionMetadata in the markdown-it env. Renders
+# without one collect nothing.
+METADATA_KEY = "slackify_metadata"
+
+
+class ConversionMetadata(NamedTuple):
+    """
+    Entities of one conversion, collected while rendering, in document order.
+
+    ``links`` are the URLs of links and autolinks. ``images`` are the source
+    URLs of images, whether or not they are rendered as links. ``mentions``
+    are the Slack mentions (``<@U…>``, ``<#C…>``, ``<!here>``, …) in text as
+    they appear in the output; mentions inside code are not mentions to Slack
+    and are not listed. ``code_blocks`` are the sizes in characters of the
+    content of each fenced or indented code block.
+    """
+
+    links: List[str]
+    images: List[str]
+    mentions: List[str]
+    code_blocks: List[int]
+
+
+def new_metadata() -> ConversionMetadata:
+    return ConversionMetadata([], [], [], [])
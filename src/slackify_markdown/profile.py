@@ -0,0 +1,181 @@
+from functools import lru_cache
+from typing import Any, NamedTuple, Tuple
+
+# List prefixes are precomputed for depths 0 to this; deeper items build
+# theirs when they are rendered.
+_PRECOMPUTED_DEPTHS = 8
+
+
+# The fields of RenderProfile: a NamedTuple class can't define __new__.
+class _RenderProfileFields(NamedTuple):
+    bullets: Tuple[str, ...] = ("•", "◦", "▪")
+    indent: str = "    "
+    bullet_format: str = "{bullet}   "
+    ordered_format: str = "{number}.  "
+    heading_format: str = "*{text}*"
+    link_format: str = "<{url}|{text}>"
+    bare_link_format: str = "<{url}>"
+    image_format: str = "<{url}|{text}>"
+    bare_image_format: str = "<{url}>"
+    table_cell_width: int = 40
+    table_width: int = 120
+    table_rows: int = 100
+
+
+class RenderProfile(_RenderProfileFields):
+    """
+    How lists, headings, links and images are written, for
+    ``SlackifyConverter(profile=...)`` and ``slackify_markdown(profile=...)``.
+    The defaults give the standard output.
+
+    ``bullets`` are the glyphs of list depths 1, 2, 3..., the last one
+    repeating for deeper lists, and ``indent`` is added once per depth below
+    the first. The rest are ``str.format`` templates: ``bullet_format`` gets
+    ``{bullet}``, ``ordered_format`` the item's ``{number}``,
+    ``heading_format`` the heading's ``{text}``, and ``link_format`` and
+    ``image_format`` the ``{url}`` and ``{text}``. Links and images without
+    text use the ``bare_`` templates. ``ordered_format``, ``heading_format``
+    and ``link_format`` must contain their ``{number}`` or ``{text}``
+    exactly once.
+
+    Tables are laid out as aligned columns in a preformatted block: cells
+    longer than ``table_cell_width`` are cut, columns that would make a
+    line longer than ``table_width`` are dropped, and so are the rows after
+    the first ``table_rows``.
+
+    Profiles are immutable and hashable, so they can key a dict of
+    converters; each profile is compiled once. ``bullets`` may be given as
+    any sequence, e.g. a list, and is stored as a tuple.
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, *args: Any, **kwargs: Any) -> "RenderProfile":
+        profile = super().__new__(cls, *args, **kwargs)
+        if isinstance(profile.bullets, tuple):
+            return profile
+        return profile._replace(bullets=tuple(profile.bullets))
+
+
+class CompiledProfile:
+    """
+    The strings a ``RenderProfile`` renders to, computed once: line prefixes
+    per list depth, the halves of the templates that wrap inline content, and
+    whether bold is dropped inside headings. Built by ``compile_profile()``.
+    """
+
+    __slots__ = (
+        "profile",
+        "indent",
+        "bullet_markers",
+        "bullet_prefixes",
+        "ordered_before",
+        "ordered_after",
+        "heading_open",
+        "heading_close",
+        "bold_headings",
+        "link_open",
+        "link_close",
+        "table_cell_width",
+        "table_width",
+        "table_rows",
+    )
+
+    def __init__(self, profile: RenderProfile):
+        if not profile.bullets:
+            raise ValueError("bullets must not be empty")
+        if profile.table_cell_width < 1 or profile.table_width < 1:
+            raise ValueError("table widths must be positive")
+        if profile.table_rows < 1:
+            raise ValueError("table_rows must be positive")
+        self.profile = profile
+        self.indent = profile.indent
+        self.bullet_markers = tuple(
+            self._bullet_marker(depth) for depth in range(_PRECOMPUTED_DEPTHS + 1)
+        )
+        self.bullet_prefixes = tuple(
+            self.indentation(depth) + marker
+            for depth, marker in enumerate(self.bullet_markers)
+        )
+        before, after = _split(profile.ordered_format, "number", "ordered_format")
+        self.ordered_before = _format(before, "ordered_format")
+        self.ordered_after = _format(after, "ordered_format")
+        before, after = _split(profile.heading_format, "text", "heading_format")
+        self.heading_open = _format(before, "heading_format")
+        self.heading_close = _format(after, "heading_format")
+        # Slack has one bold, so bold inside a bold heading would close it.
+        self.bold_headings = "*" in self.heading_open
+        # The link halves keep their {url}; check they format.
+        self.link_open, self.link_close = _split(
+            profile.link_format, "text", "link_format"
+        )
+        _format(self.link_open, "link_format", url="")
+        _format(self.link_close, "link_format", url="")
+        _format(profile.bare_link_format, "bare_link_format", url="")
+        _format(profile.image_format, "image_format", url="", text="")
+        _format(profile.bare_image_format, "bare_image_format", url="")
+        self.table_cell_width = profile.table_cell_width
+        self.table_width = profile.table_width
+        self.table_rows = profile.table_rows
+
+    def indentation(self, depth: int) -> str:
+        return self.indent * max(depth - 1, 0)
+
+    def bullet_marker(self, depth: int) -> str:
+        """
+        Marker of a bullet item in a list at ``depth``, without indentation.
+        """
+        if depth <= _PRECOMPUTED_DEPTHS:
+            return self.bullet_markers[depth]
+        return self._bullet_marker(depth)
+
+    def bullet_prefix(self, depth: int) -> str:
+        """
+        Indentation and marker of a bullet item in a list at ``depth``.
+        """
+        if depth <= _PRECOMPUTED_DEPTHS:
+            return self.bullet_prefixes[depth]
+        return self.indentation(depth) + self._bullet_marker(depth)
+
+    def ordered_marker(self, number: str) -> str:
+        return self.ordered_before + number + self.ordered_after
+
+    def image(self, url: str, text: str) -> str:
+        if text:
+            return self.profile.image_format.format(url=url, text=text)
+        return self.profile.bare_image_format.format(url=url)
+
+    def _bullet_marker(self, depth: int) -> str:
+        bullets = self.profile.bullets
+        bullet = bullets[min(max(depth - 1, 0), len(bullets) - 1)]
+        return _format(self.profile.bullet_format, "bullet_format", bullet=bullet)
+
+
+@lru_cache(maxsize=64)
+def compile_profile(profile: RenderProfile) -> CompiledProfile:
+    """
+    Compile ``profile``, raising ``ValueError`` if one of its templates is
+    malformed. Compiled profiles are cached.
+    """
+    return CompiledProfile(profile)
+
+
+def _split(template: str, field: str, name: str) -> Tuple[str, str]:
+    before, found, after = template.partition("{" + field + "}")
+    if not found or found in after:
+        raise ValueError(
+            "{} must contain {{{}}} once, not {!r}".format(name, field, template)
+        )
+    return before, after
+
+
+def _format(template: str, name: str, **fields: str) -> str:
+    try:
+        return template.format(**fields)
+    except (IndexError, KeyError, ValueError) as exc:
+        raise ValueError(
+            "{} {!r} does not format: {}".format(name, template, exc)
+        ) from None
+
+
+DEFAULT_PROFILE = compile_profile(RenderProfile())
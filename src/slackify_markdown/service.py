@@ -1,8 +1,112 @@
-from slackify_markdown.slackify import SlackifyMarkdown
+from __future__ import annotations
 
+# threading would pull in collections and functools; its Lock is this one.
+import _thread
 
-def slackify_markdown(markdown: str) -> str:
+# See __init__.py: typing is only imported by type checkers.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Dict, Optional, Tuple, Union
+
+    from slackify_markdown.converter import SlackifyConverter
+    from slackify_markdown.metadata import ConversionMetadata
+    from slackify_markdown.profile import RenderProfile
+
+# Shared by every slackify_markdown() call so the parser is only built once.
+# It is built on first use (or by warmup()): importing this module does not
+# import markdown-it.
+_converter: Optional[SlackifyConverter] = None
+_converter_lock = _thread.allocate_lock()
+# One converter per RenderProfile passed to the functions below, oldest
+# dropped first past _MAX_PROFILE_CONVERTERS.
+_profile_converters: Dict[RenderProfile, SlackifyConverter] = {}
+_MAX_PROFILE_CONVERTERS = 32
+
+# Exercises every handler and parser rule on the first conversion.
+_WARMUP_MARKDOWN = (
+    "# Heading\n\n"
+    "Some *em*, **strong**, ~~strike~~, `code`, [link](https://example.com), "
+    "![image](https://example.com/a.png), <@U123> & more\\.\n\n"
+    "- item\n  - nested\n\n"
+    "1. first\n2. second\n\n"
+    "> quote\n\n"
+    "```python\ncode\n```\n\n"
+    "    indented\n\n"
+    "[ref]: https://example.com\n"
+)
+
+
+def _get_default_converter() -> SlackifyConverter:
+    global _converter
+    with _converter_lock:
+        if _converter is None:
+            from slackify_markdown.converter import SlackifyConverter
+
+            _converter = SlackifyConverter()
+    return _converter
+
+
+def _get_profile_converter(profile: RenderProfile) -> SlackifyConverter:
+    converter = _profile_converters.get(profile)
+    if converter is not None:
+        return converter
+    from slackify_markdown.converter import SlackifyConverter
+
+    with _converter_lock:
+        converter = _profile_converters.get(profile)
+        if converter is None:
+            converter = SlackifyConverter(profile=profile)
+            if len(_profile_converters) >= _MAX_PROFILE_CONVERTERS:
+                del _profile_converters[next(iter(_profile_converters))]
+            _profile_converters[profile] = converter
+    return converter
+
+
+def __getattr__(name: str) -> Any:
+    # Modules that take the shared converter as a default import it by name.
+    if name == "_default_converter":
+        return _get_default_converter()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def warmup() -> None:
+    """
+    Import the parser and build the shared converter now, instead of on the
+    first conversion, e.g. during a serverless function's init phase.
+    Safe to call more than once.
+    """
+    _get_default_converter().convert_with_metadata(_WARMUP_MARKDOWN)
+
+
+def slackify_markdown(markdown: str, profile: Optional[RenderProfile] = None) -> str:
+    """
+    Convert markdown to Slack-compatible markdown, written as ``profile``
+    says if given. Each profile's converter is built once and reused.
+    """
+    if profile is not None:
+        return _get_profile_converter(profile).convert(markdown)
+    return (_converter or _get_default_converter()).convert(markdown)
+
+
+def slackify_with_metadata(
+    markdown: str, profile: Optional[RenderProfile] = None
+) -> Tuple[str, ConversionMetadata]:
+    """
+    Convert markdown to Slack-compatible markdown, and return the links,
+    images, mentions and code block sizes it contains.
+    """
+    if profile is not None:
+        return _get_profile_converter(profile).convert_with_metadata(markdown)
+    return (_converter or _get_default_converter()).convert_with_metadata(markdown)
+
+
+def slackify_bytes(
+    data: Union[bytes, bytearray, memoryview], profile: Optional[RenderProfile] = None
+) -> bytes:
     """
-    Convert markdown to Slack-compatible markdown.
+    Convert UTF-8 encoded markdown to UTF-8 encoded Slack-compatible
+    markdown.
     """
-    return SlackifyMarkdown(markdown).slackify()
+    if profile is not None:
+        return _get_profile_converter(profile).convert_bytes(data)
+    return (_converter or _get_default_converter()).convert_bytes(data)
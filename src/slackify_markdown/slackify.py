@@ -1,12 +1,187 @@
 from markdown_it import MarkdownIt
+from markdown_it.common.entities import entities
+from markdown_it.common.utils import fromCodePoint, isValidEntityCode
 from markdown_it.renderer import RendererHTML
+from markdown_it.rules_inline import StateInline
+from markdown_it.rules_inline.text import text as _text_rule
 from markdown_it.token import Token
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Type
 import re
 from urllib.parse import urlparse
+from slackify_markdown.metadata import METADATA_KEY
+from slackify_markdown.profile import (
+    DEFAULT_PROFILE,
+    CompiledProfile,
+    RenderProfile,
+    compile_profile,
+)
+from slackify_markdown.tables import parse_table, render_table
 from slackify_markdown.utils import escape_specials
 
 
+# Parser rules whose tokens the renderers use, by chain. Everything else in
+# the gfm-like preset is a no-op with html and linkify off (html_block,
+# html_inline, linkify), but would still be tried at every paragraph line or
+# inline position. hr stays even though its token is dropped: it ends
+# paragraphs and lists, and stops "***" and "---" lines from parsing as
+# emphasis or setext headings. text_join stays so escaped characters merge
+# into the surrounding text before mentions are recognised.
+MRKDWN_RULES = {
+    "core": ("normalize", "block", "inline", "text_join"),
+    "block": (
+        "code",
+        "fence",
+        "blockquote",
+        "hr",
+        "list",
+        "reference",
+        "heading",
+        "lheading",
+        "table",
+        "paragraph",
+    ),
+    "inline": (
+        "text",
+        "newline",
+        "escape",
+        "backticks",
+        "strikethrough",
+        "emphasis",
+        "link",
+        "image",
+        "autolink",
+        "entity",
+    ),
+    "inline2": ("balance_pairs", "strikethrough", "emphasis", "fragments_join"),
+}
+
+
+# markdown-it collects the text between inline tokens in ``state.pending``
+# with ``+=`` on an attribute, which copies the whole run on every append.
+# On a long line where the text rule keeps stopping (at "<", "&", "!", ...)
+# without a token being pushed, that is quadratic. Flushing the run into a
+# text token every _MAX_PENDING chars bounds each copy; text_join merges the
+# tokens back before rendering.
+_MAX_PENDING = 1024
+
+
+def _text_flushing_pending(state: StateInline, silent: bool) -> bool:
+    pending = state.pending
+    # Never right after a space: the newline rule looks for trailing spaces
+    # in pending to make a hard break and strip them.
+    if len(pending) > _MAX_PENDING and not silent and pending[-1] != " ":
+        state.pushPending()
+    return _text_rule(state, silent)
+
+
+# markdown-it's entity rule matches against ``state.src[pos:]``, a copy of
+# the rest of the paragraph, at every "&": quadratic in a paragraph full of
+# ampersands. This is the same rule, matching in place.
+_DIGITAL_ENTITY_RE = re.compile(r"&#((?:x[a-f0-9]{1,6}|[0-9]{1,7}));", re.IGNORECASE)
+_NAMED_ENTITY_RE = re.compile(r"&([a-z][a-z0-9]{1,31});", re.IGNORECASE)
+
+
+def _entity(state: StateInline, silent: bool) -> bool:
+    src, pos = state.src, state.pos
+    if src[pos] != "&" or pos + 1 >= state.posMax:
+        return False
+    if src[pos + 1] == "#":
+        match = _DIGITAL_ENTITY_RE.match(src, pos)
+        if match is None:
+            return False
+        digits = match.group(1)
+        code = int(digits[1:], 16) if digits[0] in "xX" else int(digits, 10)
+        content = fromCodePoint(code if isValidEntityCode(code) else 0xFFFD)
+    else:
+        match = _NAMED_ENTITY_RE.match(src, pos)
+        if match is None or match.group(1) not in entities:
+            return False
+        content = entities[match.group(1)]
+    if not silent:
+        token = state.push("text_special", "", 0)
+        token.content = content
+        token.markup = match.group(0)
+        token.info = "entity"
+    state.pos = match.end()
+    return True
+
+
+def build_parser(
+    renderer_cls: Type["SlackifyMarkdown"],
+    pruned: bool = True,
+    profile: Optional[RenderProfile] = None,
+) -> MarkdownIt:
+    """
+    Build the MarkdownIt instance used for conversion, rendering with
+    ``renderer_cls`` and, if given, ``profile``. This is the expensive part
+    of a conversion setup, so callers that convert repeatedly should build it
+    once and reuse it.
+
+    By default only ``MRKDWN_RULES`` are enabled, which gives the same output
+    as the full gfm-like preset. ``pruned=False`` builds that full preset
+    instead.
+    """
+    md = MarkdownIt(
+        "gfm-like",
+        renderer_cls=renderer_cls,
+        options_update={
+            "html": False,
+            "linkify": False,
+            "breaks": False,
+        },
+    )
+    md.inline.ruler.at("text", _text_flushing_pending)
+    md.inline.ruler.at("entity", _entity)
+    md.block.ruler.at("table", parse_table, {"alt": ["paragraph", "reference"]})
+    if profile is not None:
+        md.renderer._profile = compile_profile(profile)
+    if not pruned:
+        return md
+    rulers = {
+        "core": md.core.ruler,
+        "block": md.block.ruler,
+        "inline": md.inline.ruler,
+        "inline2": md.inline.ruler2,
+    }
+    for chain, active in md.get_active_rules().items():
+        unused = [name for name in active if name not in MRKDWN_RULES[chain]]
+        if unused:
+            rulers[chain].disable(unused)
+    return md
+
+
+def compile_rules(md: MarkdownIt) -> None:
+    """
+    Build the rule lookup caches of every chain of ``md`` now. markdown-it
+    builds them on first use by assigning an empty cache and then filling
+    it, so a parse running on another thread at that moment could see a
+    partial chain. Call after the last change to the rules.
+    """
+    for ruler in (md.core.ruler, md.block.ruler, md.inline.ruler, md.inline.ruler2):
+        ruler.getRules("")
+
+
+# env key of the current render's _RenderState.
+RENDER_STATE_KEY = "slackify_render_state"
+
+
+class _RenderState:
+    """
+    State of one ``SlackifyMarkdown`` render. It lives in the render's
+    ``env``, not on the renderer, so one renderer (and one converter) can
+    serve any number of concurrent renders.
+    """
+
+    __slots__ = ("in_heading", "list_depth", "link_url", "tables")
+
+    def __init__(self) -> None:
+        self.in_heading = False
+        self.list_depth = 0
+        self.link_url = ""
+        # Tokens of the tables still to render, last table first.
+        self.tables: List[List[Token]] = []
+
+
 # Todo: Clean code before release.
 class SlackifyMarkdown(RendererHTML):
 
@@ -49,8 +224,9 @@ class SlackifyMarkdown(RendererHTML):
         "softbreak",
     ]
 
-    _BULLETS_BY_DEPTH = ("•", "◦", "▪")
-    _INDENT_UNIT = "    "
+    # How lists, headings, links and images are written. build_parser()
+    # replaces it on the instance when a converter has a RenderProfile.
+    _profile: CompiledProfile = DEFAULT_PROFILE
     # U+0002 STX (Start of Text) is the "structural newline" sentinel.
     # Close-handlers emit this instead of "\n" so render() can cap structural-
     # newline runs at 2 (one blank line) without touching real \n inside code
@@ -63,26 +239,55 @@ class SlackifyMarkdown(RendererHTML):
     def __init__(self, markdown_text: str):
         super().__init__()
         self.markdown_text = markdown_text
-        self._in_heading = False
-        self._list_depth = 0
 
     # this is not correctly done, we need to check in an depth for children,
     # the library offers allowed tokens/tags. Move to that instead of this :), todo.
     def render(
         self, tokens: List[Token], options: Dict[str, Any], env: Dict[str, Any]
     ) -> str:
+        rendered = self.render_structural(tokens, options, env)
+        return self.materialize_newlines(rendered).rstrip("\n") + "\n"
+
+    def render_structural(
+        self, tokens: List[Token], options: Dict[str, Any], env: Dict[str, Any]
+    ) -> str:
+        """
+        Render tokens with structural newlines still as NEW_LINE sentinels.
+
+        Handlers never look past the top-level block they belong to, so the
+        structural renderings of consecutive top-level blocks can be
+        concatenated and materialized together to get the whole document.
+        """
+        # The renderer may be reused across documents and threads (see
+        # SlackifyConverter), so every render starts from its own state.
+        state = env[RENDER_STATE_KEY] = _RenderState()
+
+        # A table is rendered whole by table_open, so its other tokens are
+        # set aside for it instead of being rendered one by one.
         final_tokens = []
+        table = None
         for token in tokens:
-            if token.type in self.SUPPORTED_TOKENS:
+            if table is not None:
+                table.append(token)
+                if token.type == "table_close":
+                    table = None
+            elif token.type in self.SUPPORTED_TOKENS:
                 final_tokens.append(token)
+                if token.type == "table_open":
+                    table = [token]
+                    state.tables.append(table)
+        state.tables.reverse()
+
+        return super().render(final_tokens, options, env)
 
-        rendered = super().render(final_tokens, options, env)
+    @staticmethod
+    def materialize_newlines(rendered: str) -> str:
         # Cap structural-newline runs at 2 (one blank line), then materialize
         # to real \n. Code blocks emit real \n directly, so their content is
         # not affected by the cap.
-        rendered = self._NEW_LINE_CAP_RE.sub(self.NEW_LINE * 2, rendered)
-        rendered = rendered.replace(self.NEW_LINE, "\n")
-        return rendered.rstrip("\n") + "\n"
+        sentinel = SlackifyMarkdown.NEW_LINE
+        rendered = SlackifyMarkdown._NEW_LINE_CAP_RE.sub(sentinel * 2, rendered)
+        return rendered.replace(sentinel, "\n")
 
     def hardbreak(
         self,
@@ -107,17 +312,7 @@ class SlackifyMarkdown(RendererHTML):
         # newline-cap machinery in render(). markdown-it-py does not strip
         # ASCII control chars, so we have to do it here.
         text = self.markdown_text.replace(self.NEW_LINE, "")
-        md = MarkdownIt(
-            "gfm-like",
-            renderer_cls=type(self),
-            options_update={
-                "html": False,
-                "linkify": False,
-                "breaks": False,
-            },
-        ).disable("table")
-
-        return md.render(text)
+        return build_parser(type(self)).render(text)
 
     def text(
         self,
@@ -126,7 +321,10 @@ class SlackifyMarkdown(RendererHTML):
         options: Dict[str, Any],
         env: Dict[str, Any],
     ) -> str:
-        return escape_specials(tokens[idx].content)
+        metadata = env.get(METADATA_KEY)
+        if metadata is None:
+            return escape_specials(tokens[idx].content)
+        return escape_specials(tokens[idx].content, metadata.mentions)
 
     def heading_open(
         self,
@@ -135,8 +333,8 @@ class SlackifyMarkdown(RendererHTML):
         options: Dict[str, Any],
         env: Dict[str, Any],
     ) -> str:
-        self._in_heading = True
-        return "*"
+        env[RENDER_STATE_KEY].in_heading = True
+        return self._profile.heading_open
 
     def heading_close(
         self,
@@ -145,8 +343,8 @@ class SlackifyMarkdown(RendererHTML):
         options: Dict[str, Any],
         env: Dict[str, Any],
     ) -> str:
-        self._in_heading = False
-        return f"*{self.NEW_LINE}{self.NEW_LINE}"
+        env[RENDER_STATE_KEY].in_heading = False
+        return f"{self._profile.heading_close}{self.NEW_LINE}{self.NEW_LINE}"
 
     def strong_open(
         self,
@@ -155,7 +353,7 @@ class SlackifyMarkdown(RendererHTML):
         options: Dict[str, Any],
         env: Dict[str, Any],
     ) -> str:
-        if self._in_heading:
+        if env[RENDER_STATE_KEY].in_heading and self._profile.bold_headings:
             return ""
         return "*"
 
@@ -166,7 +364,7 @@ class SlackifyMarkdown(RendererHTML):
         options: Dict[str, Any],
         env: Dict[str, Any],
     ) -> str:
-        if self._in_heading:
+        if env[RENDER_STATE_KEY].in_heading and self._profile.bold_headings:
             return ""
         return "*"
 
@@ -214,14 +412,18 @@ class SlackifyMarkdown(RendererHTML):
         env: Dict[str, Any],
     ) -> str:
         href = tokens[idx].attrs.get("href", "")
+        metadata = env.get(METADATA_KEY)
+        if metadata is not None:
+            metadata.links.append(href)
         only_link = False
         if tokens[idx + 1].nesting == -1:
             only_link = True
 
         if only_link:
-            return f"<{href}"
+            return self._profile.profile.bare_link_format.format(url=href)
         else:
-            return f"<{href}|"
+            env[RENDER_STATE_KEY].link_url = href
+            return self._profile.link_open.format(url=href)
 
     def link_close(
         self,
@@ -230,12 +432,16 @@ class SlackifyMarkdown(RendererHTML):
         options: Dict[str, Any],
         env: Dict[str, Any],
     ) -> str:
+        if tokens[idx - 1].type == "link_open":
+            # Written whole by link_open.
+            return ""
+        close = self._profile.link_close.format(url=env[RENDER_STATE_KEY].link_url)
         content = tokens[idx].content
 
         if content:
-            return f">: {content}\n"
+            return f"{close}: {content}\n"
         else:
-            return ">"
+            return close
 
     def code_inline(
         self,
@@ -257,6 +463,9 @@ class SlackifyMarkdown(RendererHTML):
         content = tokens[idx].content
         # Remove deprecated language declarations (lines starting with #!)
         content = re.sub(r"^#!.*?\n", "", content)
+        metadata = env.get(METADATA_KEY)
+        if metadata is not None:
+            metadata.code_blocks.append(len(content))
         return f"```\n{content}```\n"
 
     def fence(
@@ -269,8 +478,22 @@ class SlackifyMarkdown(RendererHTML):
         content = tokens[idx].content
         # Remove deprecated language declarations (lines starting with #!)
         content = re.sub(r"^#!.*?\n", "", content)
+        metadata = env.get(METADATA_KEY)
+        if metadata is not None:
+            metadata.code_blocks.append(len(content))
         return f"```\n{content}```\n"
 
+    def table_open(
+        self,
+        tokens: List[Token],
+        idx: int,
+        options: Dict[str, Any],
+        env: Dict[str, Any],
+    ) -> str:
+        table = env[RENDER_STATE_KEY].tables.pop()
+        content = render_table(table, self._profile, env.get(METADATA_KEY))
+        return f"```\n{content}\n```\n"
+
     def bullet_list_open(
         self,
         tokens: List[Token],
@@ -278,7 +501,7 @@ class SlackifyMarkdown(RendererHTML):
         options: Dict[str, Any],
         env: Dict[str, Any],
     ) -> str:
-        self._list_depth += 1
+        env[RENDER_STATE_KEY].list_depth += 1
         return ""
 
     def bullet_list_close(
@@ -288,7 +511,7 @@ class SlackifyMarkdown(RendererHTML):
         options: Dict[str, Any],
         env: Dict[str, Any],
     ) -> str:
-        self._list_depth -= 1
+        env[RENDER_STATE_KEY].list_depth -= 1
         return self.NEW_LINE
 
     def list_item_open(
@@ -298,11 +521,11 @@ class SlackifyMarkdown(RendererHTML):
         options: Dict[str, Any],
         env: Dict[str, Any],
     ) -> str:
-        indent = self._INDENT_UNIT * max(self._list_depth - 1, 0)
+        depth = env[RENDER_STATE_KEY].list_depth
         if tokens[idx].info:
-            return f"{indent}{tokens[idx].info}.  "
-        depth_idx = min(max(self._list_depth - 1, 0), len(self._BULLETS_BY_DEPTH) - 1)
-        return f"{indent}{self._BULLETS_BY_DEPTH[depth_idx]}   "
+            profile = self._profile
+            return profile.indentation(depth) + profile.ordered_marker(tokens[idx].info)
+        return self._profile.bullet_prefix(depth)
 
     def list_item_close(
         self,
@@ -320,7 +543,7 @@ class SlackifyMarkdown(RendererHTML):
         options: Dict[str, Any],
         env: Dict[str, Any],
     ) -> str:
-        self._list_depth += 1
+        env[RENDER_STATE_KEY].list_depth += 1
         return ""
 
     def ordered_list_close(
@@ -330,7 +553,7 @@ class SlackifyMarkdown(RendererHTML):
         options: Dict[str, Any],
         env: Dict[str, Any],
     ) -> str:
-        self._list_depth -= 1
+        env[RENDER_STATE_KEY].list_depth -= 1
         return self.NEW_LINE
 
     def paragraph_open(
@@ -381,16 +604,15 @@ class SlackifyMarkdown(RendererHTML):
         env: Dict[str, Any],
     ) -> str:
         src = tokens[idx].attrs.get("src", "")
+        metadata = env.get(METADATA_KEY)
+        if metadata is not None:
+            metadata.images.append(src)
         title = tokens[idx].attrs.get("title", "")
         display_text = tokens[idx].content or title
 
         parsed_url = urlparse(src)
 
         if parsed_url.scheme and parsed_url.netloc:
-            output = "<" + src
-            if display_text:
-                output += "|" + display_text
-            output += ">"
-            return output
+            return self._profile.image(src, display_text)
         else:
             return display_text
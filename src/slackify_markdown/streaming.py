@@ -0,0 +1,334 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+from markdown_it.token import Token
+
+from slackify_markdown.blocks import (
+    LINE_BREAK_RE,
+    StructuralJoiner,
+    line_offset,
+    require_token_engine,
+    split_top_level,
+)
+from slackify_markdown.converter import SlackifyConverter
+from slackify_markdown.service import _default_converter
+from slackify_markdown.slackify import SlackifyMarkdown
+
+
+class StreamingSlackifier:
+    """
+    Incrementally convert markdown that arrives in chunks, e.g. LLM tokens.
+
+    Top-level blocks (paragraphs, lists, fences, ...) are rendered once, as
+    soon as the next block has started on a complete line and the line after
+    it is complete too; only the blocks after that are re-rendered on each
+    ``feed()``. The last, open block is rendered as if the stream ended
+    there, so an unclosed fence shows as a closed code block and unclosed
+    emphasis shows as literal text until its closing delimiter arrives. The
+    finished lines of an open fence and the finished items of an open list
+    are rendered once too, so a long fence or list is not re-parsed on
+    every feed.
+
+    ``finish()`` returns exactly ``slackify_markdown(full_text)``. A link
+    reference definition (``[id]: url``) can change blocks before it, so once
+    one shows up the whole buffer is re-rendered on every feed and ``stable``
+    is no longer guaranteed to be a prefix of the final output.
+
+    Blocks are rendered with the token renderer, so a converter built with
+    ``engine="tree"`` raises ``ValueError``.
+    """
+
+    def __init__(self, converter: Optional[SlackifyConverter] = None):
+        self._converter = converter or _default_converter
+        require_token_engine(self._converter)
+        # Source not yet committed to a finished block.
+        self._tail = ""
+        # Every chunk fed so far, for the reference-definition fallback.
+        self._chunks: List[str] = []
+        # Materialized output of the committed blocks, plus the trailing run
+        # of structural newlines that can't be capped until more text arrives.
+        self._stable: List[str] = []
+        self._joiner = StructuralJoiner()
+        # The rendered start of the tail's first block, when it is a fence
+        # or list whose finished lines or items were cut from the tail.
+        self._head: Optional[_Head] = None
+        # A subclassed renderer may render a fence or list item from more
+        # than its own tokens, so only the stock one renders them piecemeal.
+        self._cuts_blocks = self._converter.renderer_cls is SlackifyMarkdown
+        self._has_references = False
+        self._finished = False
+
+    @property
+    def stable(self) -> str:
+        """
+        Output of the finished blocks; later feeds only append to it.
+        """
+        return "".join(self._stable)
+
+    def feed(self, chunk: str) -> str:
+        """
+        Add a chunk of markdown and return the conversion of everything fed so
+        far.
+        """
+        if self._finished:
+            raise ValueError("feed() called after finish()")
+        chunk = chunk.replace(SlackifyMarkdown.NEW_LINE, "")
+        self._chunks.append(chunk)
+        if self._has_references:
+            return self._converter.convert("".join(self._chunks))
+        self._tail += chunk
+        return self._render(final=False)
+
+    def finish(self) -> str:
+        """
+        Mark the end of the stream and return the final conversion.
+        """
+        self._finished = True
+        if self._has_references:
+            return self._converter.convert("".join(self._chunks))
+        return self._render(final=True)
+
+    def _render(self, final: bool) -> str:
+        env: Dict[str, Any] = {}
+        groups = split_top_level(self._converter._parse(self._tail, env))
+        if env.get("references"):
+            self._has_references = True
+            return self._converter.convert("".join(self._chunks))
+
+        # A block is finished once the next block starts on a complete line
+        # and the line after that is complete too: markdown decides where a
+        # block ends from those two lines alone (the second one only matters
+        # for a table header, which needs its delimiter row). A block starting
+        # on a partial line could still turn out to continue the one before
+        # it (e.g. "2" becoming "2. item", or "| a |" over "|--" becoming a
+        # paragraph line once "b|" arrives).
+        complete_lines = len(LINE_BREAK_RE.findall(self._tail))
+        if final:
+            commit = len(groups)
+        else:
+            commit = 0
+            for idx in range(len(groups) - 1, 0, -1):
+                if groups[idx][0].map[0] + 1 < complete_lines:
+                    commit = idx
+                    break
+
+        if commit:
+            text, rest = self._render_groups(groups[:commit], env)
+            self._head = None
+            for part in (text, self._joiner.add(rest)):
+                if part:
+                    self._stable.append(part)
+            if commit < len(groups):
+                offset = line_offset(self._tail, groups[commit][0].map[0])
+                self._tail = self._tail[offset:]
+                groups = groups[commit:]
+            else:
+                self._tail = ""
+                groups = []
+
+        text = ""
+        pending = self._joiner.held
+        if groups:
+            text, rest = self._render_groups(groups, env)
+            pending += rest
+            # Token maps are line numbers in the tail before any commit.
+            if len(groups) == 1 and not commit and not final and self._cuts_blocks:
+                self._cut_head(groups[0], complete_lines)
+        pending = (text + SlackifyMarkdown.materialize_newlines(pending)).rstrip("\n")
+        if pending:
+            return "".join(self._stable) + pending + "\n"
+        return "".join(self._stable).rstrip("\n") + "\n"
+
+    def _render_groups(
+        self, groups: List[List[Token]], env: Dict[str, Any]
+    ) -> Tuple[str, str]:
+        # The head's materialized text, then the structural rendering of the
+        # rest of the groups.
+        head = self._head
+        first = 0 if head is None else 1
+        tokens = [token for group in groups[first:] for token in group]
+        rest = self._converter._render_structural(tokens, env) if tokens else ""
+        if head is None:
+            return "", rest
+        text, structural = head.render(groups[0], self._converter, env)
+        return text, structural + rest
+
+    def _cut_head(self, group: List[Token], complete_lines: int) -> None:
+        """
+        Render the finished lines of a fence, or the finished items of a
+        list, that is the only block in the tail, and cut them from it.
+        """
+        kind = group[0].type
+        opened = self._head is not None
+        if kind == "fence":
+            cut = _cut_fence(group[0], self._tail, opened, self._converter)
+        elif kind in ("bullet_list_open", "ordered_list_open"):
+            cut = _cut_list(group, self._tail, complete_lines, opened, self._converter)
+        else:
+            return
+        if cut is None:
+            return
+        tight, spread, loose, self._tail = cut
+        if self._head is None:
+            # Newlines held before the block now join onto the head.
+            self._head = _Head(kind, self._joiner.held)
+            self._joiner.held = ""
+        self._head.add(tight, spread, loose)
+
+
+# The rendered start of a fence. The renderer drops a first line starting
+# with #!, so a cut never leaves such a line first in the tail.
+_FENCE_OPEN = "```\n"
+_FENCE_CLOSE = "```\n"
+_SHEBANG = "#!"
+
+
+class _Head:
+    """
+    The materialized start of the open block, cut from the tail. The tail
+    keeps a stand-in for it, so the rest still parses as the same block:
+    the fence's opening line, or a one-line item in front of the list's
+    remaining items.
+
+    A list renders differently once any of its items is loose, so its
+    items are kept rendered both ways; ``loose`` is set once one of the
+    cut items is known to be. A fence renders the same either way.
+    """
+
+    __slots__ = ("kind", "loose", "_texts", "_joiners")
+
+    def __init__(self, kind: str, held: str):
+        self.kind = kind
+        self.loose = False
+        # Rendered tight, then rendered loose.
+        self._texts = ["", ""]
+        self._joiners = [StructuralJoiner(), StructuralJoiner()]
+        for joiner in self._joiners:
+            joiner.held = held
+
+    def add(self, tight: str, spread: str, loose: bool) -> None:
+        self.loose = self.loose or loose
+        for idx, structural in enumerate((tight, spread)):
+            self._texts[idx] += self._joiners[idx].add(structural)
+
+    def render(
+        self, group: List[Token], converter: SlackifyConverter, env: Dict[str, Any]
+    ) -> Tuple[str, str]:
+        """
+        The head's text and the structural rendering of the rest of the
+        block, which ``group`` holds after the stand-in.
+        """
+        if self.kind == "fence":
+            loose = False
+            rest = converter._render_structural(group, env)
+            opener_end = len(_FENCE_OPEN)
+            rest = rest[opener_end:]
+        else:
+            # The stand-in's paragraph says whether the other items are
+            # tight; the stand-in itself is left out.
+            items = _item_starts(group)
+            loose = self.loose or not group[2].hidden
+            rest_start = items[1]
+            tokens = [group[0]] + _spread(group[rest_start:], loose)
+            rest = converter._render_structural(tokens, env)
+        variant = 1 if loose else 0
+        return self._texts[variant], self._joiners[variant].held + rest
+
+
+def _cut_fence(
+    token: Token, tail: str, opened: bool, converter: SlackifyConverter
+) -> Optional[Tuple[str, str, bool, str]]:
+    # Every content line but the last complete one; the rest of the fence
+    # must start with a complete line that the renderer keeps.
+    lines = token.content.split("\n")
+    cut = len(lines) - 2
+    while cut > 0 and lines[cut].startswith(_SHEBANG):
+        cut -= 1
+    if cut <= 0:
+        return None
+    content = "".join(line + "\n" for line in lines[:cut])
+    rendered = converter._render_structural([token.copy(content=content)], {})
+    body_start, body_end = len(_FENCE_OPEN), len(rendered) - len(_FENCE_CLOSE)
+    body = rendered[body_start:body_end]
+    if not opened:
+        body = _FENCE_OPEN + body
+    opener_start = line_offset(tail, token.map[0])
+    opener_end = line_offset(tail, token.map[0] + 1)
+    rest_start = line_offset(tail, token.map[0] + 1 + cut)
+    opener = tail[opener_start:opener_end]
+    rest = tail[rest_start:]
+    return body, body, False, opener + rest
+
+
+def _cut_list(
+    group: List[Token],
+    tail: str,
+    complete_lines: int,
+    opened: bool,
+    converter: SlackifyConverter,
+) -> Optional[Tuple[str, str, bool, str]]:
+    items = _item_starts(group)
+    # The stand-in item is never cut again.
+    first = 1 if opened else 0
+    # Like a block, an item is finished once the next one has started on a
+    # complete line and the line after it is complete too.
+    last = first
+    for idx in range(len(items) - 1, first, -1):
+        if group[items[idx]].map[0] + 1 < complete_lines:
+            last = idx
+            break
+    if last == first:
+        return None
+    ordered = group[0].type == "ordered_list_open"
+    marker = ("1" if ordered else "") + group[items[first]].markup
+    start = group[items[first]].map[0]
+    stop = group[items[last]].map[0]
+    # The finished items are parsed once more, between a stand-in item and
+    # the next item's first line, which shows whether they are loose.
+    finished_start = line_offset(tail, start)
+    finished_end = line_offset(tail, stop + 1)
+    finished = tail[finished_start:finished_end]
+    env: Dict[str, Any] = {}
+    tokens = converter._parse(_stand_in(tail, start, marker) + finished, env)
+    parsed = _item_starts(tokens)
+    if env.get("references") or len(split_top_level(tokens)) != 1:
+        return None
+    if len(parsed) != last - first + 2:
+        return None
+    loose = not tokens[2].hidden
+    body_start, body_end = parsed[1], parsed[-1]
+    body = tokens[body_start:body_end]
+    # Rendered as a list on its own, less the NEW_LINE that closes it.
+    tight = converter._render_structural(
+        [tokens[0]] + _spread(body, False) + tokens[-1:], {}
+    )[:-1]
+    spread = converter._render_structural(
+        [tokens[0]] + _spread(body, True) + tokens[-1:], {}
+    )[:-1]
+    rest_start = line_offset(tail, stop)
+    rest = _stand_in(tail, stop, marker) + tail[rest_start:]
+    return tight, spread, loose, rest
+
+
+def _item_starts(tokens: List[Token]) -> List[int]:
+    # Indices of the items of the top-level list in ``tokens``.
+    return [
+        idx
+        for idx, token in enumerate(tokens)
+        if token.type == "list_item_open" and token.level == 1
+    ]
+
+
+def _spread(tokens: List[Token], loose: bool) -> List[Token]:
+    # markdown-it hides the paragraphs of a tight list's items.
+    for token in tokens:
+        if token.level == 2 and token.type in ("paragraph_open", "paragraph_close"):
+            token.hidden = not loose
+    return tokens
+
+
+def _stand_in(tail: str, line: int, marker: str) -> str:
+    # A one-line item of the list, indented like the item on ``line``.
+    line_start = line_offset(tail, line)
+    text = tail[line_start:]
+    indent = text[: len(text) - len(text.lstrip(" \t"))]
+    return indent + marker + " x\n"
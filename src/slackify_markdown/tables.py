@@ -0,0 +1,310 @@
+import re
+from typing import Callable, Dict, List, Optional
+
+from markdown_it.rules_block import StateBlock
+from markdown_it.token import Token
+
+from slackify_markdown.metadata import ConversionMetadata
+from slackify_markdown.profile import DEFAULT_PROFILE, CompiledProfile
+from slackify_markdown.utils import escape_specials
+
+_ALIGN: Dict[Optional[str], Callable[[str, int], str]] = {
+    "text-align:left": str.ljust,
+    "text-align:right": str.rjust,
+    "text-align:center": str.center,
+}
+_ELLIPSIS = "…"
+_SEPARATOR = " | "
+# Adjacent backticks in a cell; a run of three would close the code block.
+_BACKTICKS_RE = re.compile(r"`(?=`)")
+# Goes between adjacent backticks; it takes up no room on the line.
+_ZERO_WIDTH_SPACE = "\u200b"
+
+# A delimiter row: only pipes, dashes, colons and spaces.
+_DELIMITER_ROW_RE = re.compile(r"[|:-][|: \t-]+")
+_DELIMITER_CELL_RE = re.compile(r":?-+:?")
+# Pipes that separate cells; "\|" is a pipe in a cell.
+_PIPE_RE = re.compile(r"(?<!\\)\|")
+# markdown-it ends a table once it has filled in this many missing cells of
+# short rows, so a table can't expand its input without bound.
+_MAX_FILLED_CELLS = 0x10000
+
+
+def parse_table(
+    state: StateBlock, start_line: int, end_line: int, silent: bool
+) -> bool:
+    """
+    markdown-it's GFM table rule, emitting cells only for what
+    ``render_table()`` can show: the columns that fit in the profile's
+    ``table_width`` at one character each, and the first ``table_rows``
+    body rows. The rest of the table still belongs to it, and its full
+    size goes in the ``table_open`` token's ``meta``. A huge table then
+    costs a scan of its lines, not a token and an inline parse per cell.
+    """
+    if start_line + 2 > end_line:
+        return False
+    line = start_line + 1
+    if state.sCount[line] < state.blkIndent or state.is_code_block(line):
+        return False
+    delimiters = _line(state, line)
+    if not _DELIMITER_ROW_RE.fullmatch(delimiters):
+        return False
+    # A "-" followed by a space starts a list item.
+    if delimiters[0] == "-" and delimiters[1] in " \t":
+        return False
+    aligns: List[str] = []
+    columns = delimiters.split("|")
+    for idx, column in enumerate(columns):
+        column = column.strip()
+        if not column:
+            # Empty only before the first pipe or after the last.
+            if idx == 0 or idx == len(columns) - 1:
+                continue
+            return False
+        if not _DELIMITER_CELL_RE.fullmatch(column):
+            return False
+        if column[-1] == ":":
+            aligns.append("center" if column[0] == ":" else "right")
+        elif column[0] == ":":
+            aligns.append("left")
+        else:
+            aligns.append("")
+
+    header = _line(state, start_line).strip()
+    if "|" not in header or state.is_code_block(start_line):
+        return False
+    cells = _split_row(header)
+    column_count = len(cells)
+    if not column_count or column_count != len(aligns):
+        return False
+    if silent:
+        return True
+
+    profile: CompiledProfile = getattr(state.md.renderer, "_profile", DEFAULT_PROFILE)
+    # Columns past this can't fit even if every cell is one character wide.
+    shown = min(
+        column_count,
+        (profile.table_width + len(_SEPARATOR)) // (1 + len(_SEPARATOR)),
+    )
+    parent_type = state.parentType
+    state.parentType = "table"
+    # Like markdown-it, end the table where a blockquote would end.
+    terminators = state.md.block.ruler.getRules("blockquote")
+
+    table_open = state.push("table_open", "table", 1)
+    table_open.map = table_lines = [start_line, 0]
+    token = state.push("thead_open", "thead", 1)
+    token.map = [start_line, start_line + 1]
+    _push_row(state, "th", cells, aligns, shown, start_line)
+    state.push("thead_close", "thead", -1)
+
+    body_lines: Optional[List[int]] = None
+    rows = 0
+    filled = 0
+    line = start_line + 2
+    while line < end_line:
+        if state.sCount[line] < state.blkIndent:
+            break
+        if any(rule(state, line, end_line, True) for rule in terminators):
+            break
+        text = _line(state, line).strip()
+        if not text or state.is_code_block(line):
+            break
+        cells = _split_row(text)
+        filled += column_count - len(cells)
+        if filled > _MAX_FILLED_CELLS:
+            break
+        if rows < profile.table_rows:
+            if body_lines is None:
+                token = state.push("tbody_open", "tbody", 1)
+                token.map = body_lines = [start_line + 2, 0]
+            _push_row(state, "td", cells, aligns, shown, line)
+        rows += 1
+        line += 1
+
+    if body_lines is not None:
+        state.push("tbody_close", "tbody", -1)
+        body_lines[1] = line
+    state.push("table_close", "table", -1)
+    table_lines[1] = line
+    table_open.meta = {"columns": column_count, "rows": rows}
+    state.parentType = parent_type
+    state.line = line
+    return True
+
+
+def _line(state: StateBlock, line: int) -> str:
+    start = state.bMarks[line] + state.tShift[line]
+    end = state.eMarks[line]
+    return state.src[start:end]
+
+
+def _split_row(text: str) -> List[str]:
+    cells = _PIPE_RE.split(text)
+    if cells[0] == "":
+        cells.pop(0)
+    if cells and cells[-1] == "":
+        cells.pop()
+    return cells
+
+
+def _push_row(
+    state: StateBlock,
+    tag: str,
+    cells: List[str],
+    aligns: List[str],
+    shown: int,
+    line: int,
+) -> None:
+    token = state.push("tr_open", "tr", 1)
+    token.map = [line, line + 1]
+    for column in range(shown):
+        token = state.push(tag + "_open", tag, 1)
+        if aligns[column]:
+            token.attrs = {"style": "text-align:" + aligns[column]}
+        token = state.push("inline", "", 0)
+        token.map = [line, line + 1]
+        token.content = (
+            cells[column].replace("\\|", "|").strip() if column < len(cells) else ""
+        )
+        token.children = []
+        state.push(tag + "_close", tag, -1)
+    state.push("tr_close", "tr", -1)
+
+
+def table_end(tokens: List[Token], start: int) -> int:
+    """
+    Index just past the ``table_close`` of the table opening at ``start``,
+    or ``len(tokens)`` if the table is not closed. Tables don't nest.
+    """
+    for idx in range(start + 1, len(tokens)):
+        if tokens[idx].type == "table_close":
+            return idx + 1
+    return len(tokens)
+
+
+def render_table(
+    tokens: List[Token],
+    profile: CompiledProfile,
+    metadata: Optional[ConversionMetadata] = None,
+    mrkdwn: bool = True,
+) -> str:
+    """
+    Lay out the tokens of one table, ``table_open`` to ``table_close``, as
+    column-aligned lines of plain text for a preformatted block, without a
+    trailing newline.
+
+    Cells are cut to the profile's ``table_cell_width`` while they are
+    collected, so column widths are known after one pass over the tokens.
+    Columns that would make a line wider than ``table_width`` are dropped
+    and replaced by one ``…`` column, and rows after the first
+    ``table_rows`` by one ``…`` line; ``parse_table()`` already left most of
+    them out. Links and images in cells are collected into ``metadata`` if
+    given; mentions are not, as the table is a code block.
+
+    With ``mrkdwn`` (the default), cells are laid out first and then
+    escaped like any other text, keeping mentions, and runs of backticks
+    are broken up so a cell can't close the code block. Block Kit
+    preformatted text is shown as is, so it passes ``mrkdwn=False``.
+    """
+    cell_width = profile.table_cell_width
+    rows: List[List[str]] = []
+    row: List[str] = []
+    widths: List[int] = []
+    aligns: List[Callable[[str, int], str]] = []
+    for token in tokens:
+        kind = token.type
+        if kind == "tr_open":
+            row = []
+            rows.append(row)
+        elif kind == "th_open":
+            aligns.append(_ALIGN.get(token.attrs.get("style"), str.ljust))  # type: ignore[arg-type]
+        elif kind == "inline":
+            text = _cell_text(token.children or [], metadata)
+            if len(text) > cell_width:
+                text = text[: cell_width - 1] + _ELLIPSIS
+            column = len(row)
+            if column == len(widths):
+                widths.append(max(len(text), 1))
+            elif len(text) > widths[column]:
+                widths[column] = len(text)
+            row.append(text)
+
+    # The size of the table as parsed, if parse_table() cut it.
+    meta = tokens[0].meta if tokens else {}
+    dropped_columns = meta.get("columns", 0) > len(widths)
+    dropped_rows = meta.get("rows", 0) > len(rows) - 1
+    kept = len(widths)
+    total = sum(widths) + len(_SEPARATOR) * (kept - 1)
+    if total > profile.table_width or dropped_columns:
+        # Make room for the column that marks the dropped ones.
+        budget = profile.table_width - len(_SEPARATOR) - len(_ELLIPSIS)
+        while kept > 1 and total > budget:
+            kept -= 1
+            total -= widths[kept] + len(_SEPARATOR)
+    clipped = kept < len(widths) or dropped_columns
+
+    lines = []
+    for number, row in enumerate(rows):
+        cells = [
+            (aligns[column] if column < len(aligns) else str.ljust)(
+                row[column] if column < len(row) else "", widths[column]
+            )
+            for column in range(kept)
+        ]
+        if mrkdwn:
+            cells = [_escape_cell(cell) for cell in cells]
+        if clipped:
+            cells.append(_ELLIPSIS)
+        lines.append(_SEPARATOR.join(cells).rstrip())
+        if number == 0:
+            rules = ["-" * width for width in widths[:kept]]
+            if clipped:
+                rules.append("-" * len(_ELLIPSIS))
+            lines.append("-+-".join(rules))
+    if dropped_rows:
+        lines.append(_ELLIPSIS)
+    return "\n".join(lines)
+
+
+def _escape_cell(cell: str) -> str:
+    # Escaped after padding: Slack shows an entity as one character, so the
+    # columns stay aligned. Mentions are kept but, as in any code block, not
+    # collected.
+    cell = escape_specials(cell)
+    if "``" in cell:
+        cell = _BACKTICKS_RE.sub("`" + _ZERO_WIDTH_SPACE, cell)
+    return cell
+
+
+def _cell_text(children: List[Token], metadata: Optional[ConversionMetadata]) -> str:
+    # Plain text: a preformatted block shows no formatting, so emphasis
+    # markers are dropped and links show their URL after the text.
+    parts: List[str] = []
+    link_start = 0
+    url = ""
+    for token in children:
+        kind = token.type
+        if kind == "text" or kind == "code_inline":
+            parts.append(token.content)
+        elif kind == "link_open":
+            url = str(token.attrs.get("href", ""))
+            if metadata is not None:
+                metadata.links.append(url)
+            link_start = len(parts)
+        elif kind == "link_close":
+            text = "".join(parts[link_start:])
+            if not text:
+                parts.append(url)
+            elif text != url:
+                parts.append(" (" + url + ")")
+        elif kind == "image":
+            src = str(token.attrs.get("src", ""))
+            if metadata is not None:
+                metadata.images.append(src)
+            parts.append(
+                token.content or str(token.attrs.get("title", "") or "") or src
+            )
+        elif kind == "softbreak" or kind == "hardbreak":
+            parts.append(" ")
+    return "".join(parts)
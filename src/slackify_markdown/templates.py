@@ -0,0 +1,177 @@
+import re
+from string import Formatter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from markdown_it.token import Token
+
+from slackify_markdown.converter import SlackifyConverter
+from slackify_markdown.service import _default_converter
+from slackify_markdown.slackify import SlackifyMarkdown
+from slackify_markdown.utils import escape_specials
+
+_CONVERSIONS: Dict[Optional[str], Callable[[Any], str]] = {
+    None: lambda value: value,
+    "s": str,
+    "r": repr,
+    "a": ascii,
+}
+# http(s) URLs that markdown-it's normalizeLink() returns unchanged: ASCII
+# host, no user info, and only characters it never encodes. Most link values
+# are like this, and normalizeLink() costs more than the rest of a render.
+_PLAIN_URL_RE = re.compile(
+    r"https?://[A-Za-z0-9.\-]+(?::[0-9]+)?(?:[/?#][A-Za-z0-9;/?:&=+$,\-_.!~*'()#]*)?"
+)
+
+
+class MessageTemplate:
+    """
+    A markdown template with ``{name}`` placeholders, converted to Slack
+    mrkdwn once by ``compile_template()``.
+
+    ``render(**values)`` only formats each value, escapes it for the place
+    its placeholder is in and joins it with the precomputed output around
+    it; nothing is parsed. Markdown syntax in a value is never parsed, so a
+    value can't add list items, links or emphasis markers of its own, or
+    break those of the template: its characters come out as a
+    backslash-escaped character in the template would. ``&``, ``<`` and
+    ``>`` are escaped as ``escape_specials()`` does, so Slack mentions in
+    values still work. Values in inline code and code blocks are inserted
+    as they are, like code content, and values in link destinations are
+    URL-encoded like any link destination (unsafe ones, e.g.
+    ``javascript:``, become empty). In an autolink (``<https://...>``),
+    whose text is its destination, the text is URL-encoded too.
+    """
+
+    def __init__(
+        self,
+        template: str,
+        placeholders: Tuple[str, ...],
+        static: List[str],
+        slots: List[Tuple[str, Callable[[Any], str]]],
+    ):
+        self.template = template
+        # Names in the order they first appear in the template.
+        self.placeholders = placeholders
+        self._static = static
+        self._slots = slots
+
+    def render(self, **values: Any) -> str:
+        """
+        The template converted with ``values`` filled in. Like
+        ``str.format()``, raises ``KeyError`` for a missing value.
+        """
+        static = self._static
+        parts = [static[0]]
+        for idx, (name, fill) in enumerate(self._slots, 1):
+            parts.append(fill(values[name]))
+            parts.append(static[idx])
+        return "".join(parts)
+
+
+def compile_template(
+    markdown: str, converter: Optional[SlackifyConverter] = None
+) -> MessageTemplate:
+    """
+    Convert ``markdown`` with ``str.format``-style ``{name}`` placeholders
+    (format specs and ``!r``/``!s``/``!a`` allowed, ``{{`` and ``}}`` for
+    literal braces) into a ``MessageTemplate``, using ``converter`` or the
+    shared one.
+
+    Each placeholder is replaced by a marker that markdown leaves alone, the
+    result is converted once, and the output is cut at the markers. Raises
+    ``ValueError`` for positional placeholders, and for placeholders in a
+    table or an image, whose output depends on the value.
+    """
+    converter = converter or _default_converter
+    text = markdown.replace(SlackifyMarkdown.NEW_LINE, "")
+    # Letters and digits only: no markdown syntax, unchanged by escaping
+    # and URL encoding, and made unique against the template's own text.
+    marker = "zq"
+    while marker in text:
+        marker += "q"
+
+    source: List[str] = []
+    fields: List[Tuple[str, str, Optional[str]]] = []
+    for literal, name, spec, conversion in Formatter().parse(text):
+        source.append(literal)
+        if name is None:
+            continue
+        if not name.isidentifier():
+            raise ValueError("placeholders must be names, not {{{}}}".format(name))
+        if conversion not in _CONVERSIONS:
+            raise ValueError(
+                "unknown conversion !{} for {{{}}}".format(conversion, name)
+            )
+        source.append("{}{}{}".format(marker, len(fields), marker))
+        fields.append((name, spec or "", conversion))
+    source_text = "".join(source)
+
+    kinds = _slot_kinds(converter._parse(source_text), marker, len(fields))
+    converted = converter._convert(source_text)
+    pieces = re.split(re.escape(marker) + r"(\d+)" + re.escape(marker), converted)
+    static = pieces[0::2]
+    slots = []
+    for number in pieces[1::2]:
+        name, spec, conversion = fields[int(number)]
+        slots.append((name, _filler(kinds[int(number)], spec, conversion, converter)))
+    placeholders = tuple(dict.fromkeys(name for name, _, _ in fields))
+    return MessageTemplate(markdown, placeholders, static, slots)
+
+
+def _slot_kinds(tokens: List[Token], marker: str, count: int) -> List[str]:
+    """
+    Where each marker ended up: "text", "code" or "url".
+    """
+    marker_re = re.compile(re.escape(marker) + r"(\d+)" + re.escape(marker))
+    kinds = ["text"] * count
+    in_table = False
+    # An autolink's text is its destination: both are filled as a URL.
+    in_autolink = False
+    stack = list(reversed(tokens))
+    while stack:
+        token = stack.pop()
+        kind = token.type
+        if kind == "table_open" or kind == "table_close":
+            in_table = kind == "table_open"
+            continue
+        found = marker_re.findall(token.content) if token.content else []
+        if kind == "link_open" or kind == "link_close":
+            in_autolink = kind == "link_open" and token.markup == "autolink"
+        if kind == "link_open":
+            found = marker_re.findall(str(token.attrs.get("href", "")))
+            slot = "url"
+        elif in_autolink:
+            slot = "url"
+        elif kind == "image":
+            found += marker_re.findall(str(token.attrs.get("src", "")))
+            slot = "text"
+        elif kind in ("code_inline", "fence", "code_block"):
+            slot = "code"
+        else:
+            slot = "text"
+        if found and (in_table or kind == "image"):
+            raise ValueError("placeholders are not supported in tables or images")
+        for number in found:
+            kinds[int(number)] = slot
+        if token.children:
+            stack.extend(reversed(token.children))
+    return kinds
+
+
+def _filler(
+    kind: str, spec: str, conversion: Optional[str], converter: SlackifyConverter
+) -> Callable[[Any], str]:
+    convert = _CONVERSIONS[conversion]
+    if kind == "code":
+        return lambda value: format(convert(value), spec)
+    if kind == "url":
+        md = converter._md
+
+        def url(value: Any) -> str:
+            href = format(convert(value), spec)
+            if _PLAIN_URL_RE.fullmatch(href):
+                return href
+            return md.normalizeLink(href) if md.validateLink(href) else ""
+
+        return url
+    return lambda value: escape_specials(format(convert(value), spec))
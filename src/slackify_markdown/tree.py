@@ -0,0 +1,227 @@
+import re
+from typing import List, Optional
+from urllib.parse import urlparse
+
+from markdown_it.token import Token
+
+from slackify_markdown.metadata import ConversionMetadata
+from slackify_markdown.profile import CompiledProfile, RenderProfile, compile_profile
+from slackify_markdown.tables import render_table, table_end
+from slackify_markdown.utils import escape_specials
+
+_SHEBANG_RE = re.compile(r"^#!.*?\n")
+
+
+class SlackifyTreeRenderer:
+    """
+    Single-pass renderer that walks the block structure of the token stream
+    itself instead of concatenating per-token handler strings.
+
+    It keeps the container stack (list items, blockquotes) while walking, so
+    it knows the line prefix of every line it writes and how many blank lines
+    separate consecutive blocks. That replaces the NEW_LINE sentinel, the cap
+    regex and the materialize pass: output goes into one list buffer that is
+    joined once. Because every line gets its container prefix, continuation
+    paragraphs, code blocks and line breaks inside list items keep the item's
+    indent, and every line of a blockquote gets the ``> `` prefix.
+
+    Otherwise the output matches ``SlackifyMarkdown`` with the same
+    ``profile``. All state lives in a per-call ``_TreeWalk``, so one instance
+    can render from many threads.
+    """
+
+    def __init__(self, profile: Optional[RenderProfile] = None):
+        self.profile: CompiledProfile = compile_profile(profile or RenderProfile())
+
+    def render(
+        self, tokens: List[Token], metadata: Optional[ConversionMetadata] = None
+    ) -> str:
+        """
+        Render ``tokens``, collecting links, images, mentions and code block
+        sizes into ``metadata`` if given.
+        """
+        return _TreeWalk(self, metadata).run(tokens)
+
+
+class _TreeWalk:
+    def __init__(
+        self, renderer: SlackifyTreeRenderer, metadata: Optional[ConversionMetadata]
+    ):
+        self.metadata = metadata
+        self.mentions = None if metadata is None else metadata.mentions
+        self.profile = renderer.profile
+        self.out: List[str] = []
+        # Prefixes of the open containers, outermost first, and their join.
+        self.prefixes: List[str] = []
+        self.prefix = ""
+        # Block-separating newlines owed before the next write; at most two
+        # (one blank line) are ever written. A blank line only carries the
+        # prefix of containers that stayed open across it.
+        self.pending = 0
+        self.blank_prefix_len = 0
+        self.line_start = True
+        self.list_depth = 0
+        self.in_heading = False
+
+    def run(self, tokens: List[Token]) -> str:
+        idx = 0
+        while idx < len(tokens):
+            token = tokens[idx]
+            idx += 1
+            kind = token.type
+            if kind == "inline":
+                self.write(self.inline(token.children or []))
+            elif kind == "paragraph_close":
+                # Tight-list items have hidden paragraphs; they only need a
+                # single newline between items.
+                self.separate(1 if token.hidden else 2)
+            elif kind == "heading_open":
+                self.in_heading = True
+                self.write(self.profile.heading_open)
+            elif kind == "heading_close":
+                self.in_heading = False
+                self.write(self.profile.heading_close)
+                self.separate(2)
+            elif kind == "list_item_open":
+                self.list_item_open(token)
+            elif kind == "list_item_close":
+                self.pop_prefix()
+            elif kind in ("bullet_list_open", "ordered_list_open"):
+                self.list_depth += 1
+            elif kind in ("bullet_list_close", "ordered_list_close"):
+                self.list_depth -= 1
+                self.separate(1)
+            elif kind == "blockquote_open":
+                if not self.line_start and not self.pending:
+                    # A quote opening a list item starts on the marker's line.
+                    self.out.append("> ")
+                self.push_prefix("> ")
+            elif kind == "blockquote_close":
+                self.pop_prefix()
+                self.separate(1)
+            elif kind in ("fence", "code_block"):
+                self.code(token.content)
+            elif kind == "table_open":
+                end = table_end(tokens, idx - 1)
+                start = idx - 1
+                table = render_table(tokens[start:end], self.profile, self.metadata)
+                self.preformatted(table + "\n")
+                idx = end
+
+        out = self.out
+        # Trailing block separators are dropped; the output always ends in
+        # exactly one newline.
+        while out and not out[-1].rstrip("\n"):
+            out.pop()
+        if out:
+            out[-1] = out[-1].rstrip("\n")
+        out.append("\n")
+        return "".join(out)
+
+    def push_prefix(self, prefix: str) -> None:
+        self.prefixes.append(prefix)
+        self.prefix += prefix
+
+    def pop_prefix(self) -> None:
+        prefix = self.prefixes.pop()
+        self.prefix = self.prefix[: len(self.prefix) - len(prefix)]
+        if self.pending:
+            self.blank_prefix_len = min(self.blank_prefix_len, len(self.prefix))
+
+    def separate(self, newlines: int) -> None:
+        # Nothing to separate from yet, e.g. after an empty blockquote.
+        if not self.out:
+            return
+        if not self.pending:
+            self.blank_prefix_len = len(self.prefix)
+        self.pending += newlines
+
+    def write(self, text: str) -> None:
+        if not text:
+            return
+        out = self.out
+        if self.pending:
+            blank_line = "\n" + self.prefix[: self.blank_prefix_len].rstrip()
+            out.append(blank_line * (min(self.pending, 2) - 1) + "\n" + self.prefix)
+            self.pending = 0
+        elif self.line_start and self.prefix:
+            out.append(self.prefix)
+        out.append(text)
+        self.line_start = text[-1] == "\n"
+
+    def list_item_open(self, token: Token) -> None:
+        if token.info:
+            self.write(self.profile.ordered_marker(token.info))
+        else:
+            self.write(self.profile.bullet_marker(self.list_depth))
+        self.push_prefix(self.profile.indent)
+
+    def code(self, content: str) -> None:
+        # Remove deprecated language declarations (lines starting with #!)
+        content = _SHEBANG_RE.sub("", content, count=1)
+        if self.metadata is not None:
+            self.metadata.code_blocks.append(len(content))
+        self.preformatted(content)
+
+    def preformatted(self, content: str) -> None:
+        self.write("```\n")
+        if content:
+            if self.prefix and "\n" in content[:-1]:
+                blank_prefix = self.prefix.rstrip()
+                lines = content[:-1].split("\n")
+                rest = [self.prefix + line if line else blank_prefix for line in lines]
+                rest[0] = lines[0]
+                content = "\n".join(rest) + content[-1]
+            self.write(content)
+        self.write("```\n")
+
+    def inline(self, children: List[Token]) -> str:
+        parts: List[str] = []
+        append = parts.append
+        metadata = self.metadata
+        mentions = self.mentions
+        profile = self.profile
+        drop_bold = self.in_heading and profile.bold_headings
+        url = ""
+        for idx, token in enumerate(children):
+            kind = token.type
+            if kind == "text":
+                append(escape_specials(token.content, mentions))
+            elif kind in ("softbreak", "hardbreak"):
+                append("\n" + self.prefix)
+            elif kind in ("strong_open", "strong_close"):
+                if not drop_bold:
+                    append("*")
+            elif kind in ("em_open", "em_close"):
+                append("_")
+            elif kind in ("s_open", "s_close"):
+                append("~")
+            elif kind == "code_inline":
+                append(f"`{token.content}`")
+            elif kind == "link_open":
+                url = str(token.attrs.get("href", ""))
+                if metadata is not None:
+                    metadata.links.append(url)
+                if children[idx + 1].nesting == -1:
+                    append(profile.profile.bare_link_format.format(url=url))
+                else:
+                    append(profile.link_open.format(url=url))
+            elif kind == "link_close":
+                # A link without text was written whole at link_open.
+                if children[idx - 1].type != "link_open":
+                    close = profile.link_close.format(url=url)
+                    append(f"{close}: {token.content}\n" if token.content else close)
+            elif kind == "image":
+                if metadata is not None:
+                    metadata.images.append(str(token.attrs.get("src", "")))
+                append(_image(token, profile))
+        return "".join(parts)
+
+
+def _image(token: Token, profile: CompiledProfile) -> str:
+    src = str(token.attrs.get("src", ""))
+    display_text = token.content or str(token.attrs.get("title", "") or "")
+    parsed_url = urlparse(src)
+    if parsed_url.scheme and parsed_url.netloc:
+        return profile.image(src, display_text)
+    return display_text
@@ -1,30 +1,94 @@
 import re
+from functools import partial
+from typing import Callable, List, Optional
 
+# Slack mentions (<@U…>, <#C…>, <!here>, …) pass through untouched, except
+# that & and a bare < inside them are still escaped. Any other &, < or > is
+# escaped as an HTML entity.
+_SPECIALS_RE = re.compile(r"<[@#!][^>]*>|&|<(?![@#!])|>")
+# Escapes inside a mention, and past the last ">" of the text where no mention
+# can close. Keeping the mention alternative out of that region stops every
+# unclosed "<@" from scanning to the end of the text, which would make the
+# escape quadratic.
+_AMP_LT_RE = re.compile(r"&|<(?![@#!])")
+_ESCAPES = {"&": "&amp;", "<": "&lt;", ">": "&gt;"}
+# The same, for UTF-8 encoded text. Mentions are found on their own and the
+# text between them is escaped with bytes.replace(), which runs in C.
+_MENTION_BYTES_RE = re.compile(rb"<[@#!][^>]*>")
+_MENTION_START_BYTES_RE = re.compile(rb"<[@#!]")
+_AMP_LT_BYTES_RE = re.compile(_AMP_LT_RE.pattern.encode("ascii"))
+_BYTE_ESCAPES = {
+    key.encode("ascii"): value.encode("ascii") for key, value in _ESCAPES.items()
+}
 
-# Todo: Clean code before release.
-def escape_specials(text: str) -> str:
-    text = re.sub(r"&", r"&amp;", text)
 
-    text = re.sub(r"<(?![@#!])", r"&lt;", text)
+def _escape_inner(match: "re.Match[str]") -> str:
+    return _ESCAPES[match.group()]
 
-    slack_mentions = []
-    for match in re.finditer(r"<[@#!][^>]*>", text):
-        slack_mentions.append((match.start(), match.end()))
 
-    result = ""
-    for i, char in enumerate(text):
-        if char == ">":
-            is_mention = False
-            for start, end in slack_mentions:
-                if start <= i < end:
-                    is_mention = True
-                    break
+def _escape_special(match: "re.Match[str]") -> str:
+    special = match.group()
+    if len(special) == 1:
+        return _ESCAPES[special]
+    return _AMP_LT_RE.sub(_escape_inner, special)
 
-            if is_mention:
-                result += ">"
-            else:
-                result += "&gt;"
-        else:
-            result += char
 
-    return result
+def _escape_special_into(mentions: List[str], match: "re.Match[str]") -> str:
+    special = match.group()
+    if len(special) == 1:
+        return _ESCAPES[special]
+    escaped = _AMP_LT_RE.sub(_escape_inner, special)
+    mentions.append(escaped)
+    return escaped
+
+
+def escape_specials(text: str, mentions: Optional[List[str]] = None) -> str:
+    """
+    Escape &, < and > for Slack mrkdwn in a single pass, leaving Slack
+    mentions intact. If a ``mentions`` list is given, every mention is
+    appended to it as it appears in the output.
+    """
+    last_gt = text.rfind(">")
+    if last_gt == -1:
+        return _AMP_LT_RE.sub(_escape_inner, text)
+    if mentions is None:
+        escape: Callable[["re.Match[str]"], str] = _escape_special
+    else:
+        escape = partial(_escape_special_into, mentions)
+    cut = last_gt + 1
+    head = _SPECIALS_RE.sub(escape, text[:cut])
+    tail = text[cut:]
+    if tail:
+        tail = _AMP_LT_RE.sub(_escape_inner, tail)
+    return head + tail
+
+
+def _escape_inner_bytes(match: "re.Match[bytes]") -> bytes:
+    return _BYTE_ESCAPES[match.group()]
+
+
+def _replace_specials(data: bytes) -> bytes:
+    return data.replace(b"&", b"&amp;").replace(b"<", b"&lt;").replace(b">", b"&gt;")
+
+
+def escape_specials_bytes(data: bytes) -> bytes:
+    """
+    ``escape_specials()`` for UTF-8 encoded text. Returns ``data`` itself if
+    there is nothing to escape.
+    """
+    if _MENTION_START_BYTES_RE.search(data) is None:
+        return _replace_specials(data)
+    # Before the last ">", every "<@", "<#" or "<!" opens a mention, so the
+    # text between mentions has no mention start and every "<" in it is
+    # escaped. Past it, an unclosed "<@" is kept as escape_specials() does.
+    cut = data.rfind(b">") + 1
+    parts = []
+    pos = 0
+    for match in _MENTION_BYTES_RE.finditer(data, 0, cut):
+        start, end = match.span()
+        parts.append(_replace_specials(data[pos:start]))
+        parts.append(_AMP_LT_BYTES_RE.sub(_escape_inner_bytes, match.group()))
+        pos = end
+    parts.append(_replace_specials(data[pos:cut]))
+    parts.append(_AMP_LT_BYTES_RE.sub(_escape_inner_bytes, data[cut:]))
+    return b"".join(parts)
@@ -0,0 +1,24 @@
+import random
+
+import pytest
+
+
+def _random_documents(seed, count, pieces, sizes=(1, 8), separators=("",)):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield "".join(
+            rng.choice(pieces) + rng.choice(separators)
+            for _ in range(rng.randint(*sizes))
+        )
+
+
+@pytest.fixture
+def random_documents():
+    """
+    ``random_documents(seed, count, pieces, sizes=(1, 8), separators=("",))``
+    yields ``count`` documents for the tests that compare two conversions on
+    random input. Each is made of ``sizes[0]`` to ``sizes[1]`` of ``pieces``,
+    each followed by one of ``separators``, all drawn from
+    ``random.Random(seed)``, so a failure can be replayed.
+    """
+    return _random_documents
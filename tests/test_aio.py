@@ -0,0 +1,56 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from slackify_markdown import aslackify_many, aslackify_markdown, slackify_markdown
+
+LARGE = "\n\n".join(
+    "Paragraph {} with **bold**, _italic_ and <@U{}>.\n\n- item\n  - nested".format(
+        i, i
+    )
+    for i in range(1000)
+)
+
+
+def test_aslackify_markdown_matches_sync():
+    assert asyncio.run(aslackify_markdown("**hi**")) == "*hi*\n"
+    assert asyncio.run(aslackify_markdown(LARGE)) == slackify_markdown(LARGE)
+
+
+def test_aslackify_many_preserves_order():
+    texts = ["**{}**".format(i) for i in range(20)] + [LARGE[:5000]]
+    expected = [slackify_markdown(text) for text in texts]
+    assert asyncio.run(aslackify_many(texts, max_concurrency=2)) == expected
+
+
+def test_aslackify_many_rejects_bad_concurrency():
+    with pytest.raises(ValueError):
+        asyncio.run(aslackify_many(["a"], max_concurrency=0))
+
+
+def test_large_conversion_does_not_block_event_loop():
+    async def measure():
+        max_lag = 0.0
+        done = False
+
+        async def ticker():
+            nonlocal max_lag
+            while not done:
+                start = time.perf_counter()
+                await asyncio.sleep(0.001)
+                max_lag = max(max_lag, time.perf_counter() - start - 0.001)
+
+        tick = asyncio.ensure_future(ticker())
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            start = time.perf_counter()
+            await aslackify_markdown(LARGE, executor=executor)
+            elapsed = time.perf_counter() - start
+        done = True
+        await tick
+        return elapsed, max_lag
+
+    elapsed, max_lag = asyncio.run(measure())
+    # Converted inline, the loop would stall for the whole conversion.
+    assert max_lag < elapsed / 4
@@ -0,0 +1,34 @@
+import pytest
+
+from slackify_markdown import slackify_many, slackify_markdown
+from slackify_markdown import batch
+
+TEXTS = [
+    "**bold** message {}".format(i) if i % 3 else "- item {}\n  - nested".format(i)
+    for i in range(50)
+]
+
+
+def test_slackify_many_serial_matches_loop():
+    assert slackify_many(TEXTS) == [slackify_markdown(text) for text in TEXTS]
+
+
+def test_slackify_many_accepts_iterables():
+    assert slackify_many(iter(TEXTS[:3])) == [slackify_markdown(t) for t in TEXTS[:3]]
+    assert slackify_many([]) == []
+
+
+def test_slackify_many_workers_preserve_order(monkeypatch):
+    # Force many small chunks so the pool actually gets used.
+    monkeypatch.setattr(batch, "_MIN_CHUNK_CHARS", 100)
+    assert slackify_many(TEXTS, workers=2) == [slackify_markdown(t) for t in TEXTS]
+
+
+def test_slackify_many_rejects_bad_workers():
+    with pytest.raises(ValueError):
+        slackify_many(TEXTS, workers=0)
+
+
+def test_chunk_by_size_groups_by_length():
+    chunks = list(batch._chunk_by_size(["aaaa", "bb", "c", "dddddd", "e"], 5))
+    assert chunks == [["aaaa", "bb"], ["c", "dddddd"], ["e"]]
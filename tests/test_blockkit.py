@@ -0,0 +1,260 @@
+from slackify_markdown import slackify_blocks, slackify_sections
+from slackify_markdown.blockkit import _element_size
+
+
+def _elements(markdown, **kwargs):
+    blocks = slackify_blocks(markdown, **kwargs)
+    assert all(block["type"] == "rich_text" for block in blocks)
+    return [element for block in blocks for element in block["elements"]]
+
+
+def test_paragraph_styles_merge_and_nest():
+    assert _elements("plain **bold _both_** ~~gone~~ `code`") == [
+        {
+            "type": "rich_text_section",
+            "elements": [
+                {"type": "text", "text": "plain "},
+                {"type": "text", "text": "bold ", "style": {"bold": True}},
+                {
+                    "type": "text",
+                    "text": "both",
+                    "style": {"bold": True, "italic": True},
+                },
+                {"type": "text", "text": " "},
+                {"type": "text", "text": "gone", "style": {"strike": True}},
+                {"type": "text", "text": " "},
+                {"type": "text", "text": "code", "style": {"code": True}},
+            ],
+        }
+    ]
+
+
+def test_heading_is_bold_section():
+    assert _elements("# Title **x**") == [
+        {
+            "type": "rich_text_section",
+            "elements": [{"type": "text", "text": "Title x", "style": {"bold": True}}],
+        }
+    ]
+
+
+def test_mentions_and_links():
+    section = _elements(
+        "<@U1> <#C2|general> <!here> <!subteam^S3|team> [docs](https://e.com) <https://a.b>"
+    )[0]
+    kinds = [e for e in section["elements"] if e["type"] != "text"]
+    assert kinds == [
+        {"type": "user", "user_id": "U1"},
+        {"type": "channel", "channel_id": "C2"},
+        {"type": "broadcast", "range": "here"},
+        {"type": "usergroup", "usergroup_id": "S3"},
+        {"type": "link", "url": "https://e.com", "text": "docs"},
+        {"type": "link", "url": "https://a.b"},
+    ]
+
+
+def test_nested_lists_flatten_with_indent():
+    elements = _elements("- a\n- b\n  - c\n    1. d\n- e\n\n3. x\n4. y")
+    summary = [
+        (
+            e["style"],
+            e["indent"],
+            e.get("offset"),
+            [i["elements"][0]["text"] for i in e["elements"]],
+        )
+        for e in elements
+    ]
+    assert summary == [
+        ("bullet", 0, None, ["a", "b"]),
+        ("bullet", 1, None, ["c"]),
+        ("ordered", 2, None, ["d"]),
+        ("bullet", 0, None, ["e"]),
+        ("ordered", 0, 2, ["x", "y"]),
+    ]
+
+
+def test_quote_and_preformatted():
+    elements = _elements("> quoted <@U1>\n> - item\n\n```\n#!python\ncode <&>\n```")
+    assert elements == [
+        {
+            "type": "rich_text_quote",
+            "elements": [
+                {"type": "text", "text": "quoted "},
+                {"type": "user", "user_id": "U1"},
+                {"type": "text", "text": "\n• item"},
+            ],
+        },
+        {
+            "type": "rich_text_preformatted",
+            "elements": [{"type": "text", "text": "code <&>"}],
+        },
+    ]
+
+
+def test_blocks_respect_size_limit():
+    markdown = "\n\n".join("paragraph number {}".format(i) for i in range(100))
+    markdown += "\n\n```\n" + "x" * 250 + "\n```"
+    blocks = slackify_blocks(markdown, max_chars=100)
+    sizes = [
+        sum(
+            len(leaf["text"])
+            for element in block["elements"]
+            for leaf in element["elements"]
+        )
+        for block in blocks
+    ]
+    assert len(blocks) > 20
+    assert max(sizes) <= 100
+    preformatted = "".join(
+        element["elements"][0]["text"]
+        for block in blocks
+        for element in block["elements"]
+        if element["type"] == "rich_text_preformatted"
+    )
+    assert preformatted == "x" * 250
+
+
+def test_long_ordered_list_keeps_numbering_across_blocks():
+    markdown = "\n".join("{}. item {}".format(i, i) for i in range(1, 31))
+    lists = _elements(markdown, max_chars=50)
+    assert len(lists) > 1
+    counted = 0
+    for element in lists:
+        assert element.get("offset", 0) == counted
+        counted += len(element["elements"])
+    assert counted == 30
+
+
+def test_oversized_list_item_continues_in_a_list_of_the_same_indent():
+    markdown = "1. a\n2. " + "word " * 1000 + "\n   - nested\n3. c"
+    blocks = slackify_blocks(markdown, max_chars=3000)
+    assert max(_element_size(block) for block in blocks) <= 3000
+    lists = [element for block in blocks for element in block["elements"]]
+    assert [(e["indent"], e.get("offset"), len(e["elements"])) for e in lists] == [
+        (0, None, 1),
+        (0, 1, 1),
+        (0, 1, 1),
+        (1, None, 1),
+        (0, 2, 1),
+    ]
+    text = "".join(leaf["text"] for leaf in lists[1]["elements"][0]["elements"])
+    text += "".join(leaf["text"] for leaf in lists[2]["elements"][0]["elements"])
+    assert text == ("word " * 1000).strip()
+
+
+def test_oversized_bullet_item_is_split():
+    blocks = slackify_blocks("- " + "word " * 1000, max_chars=3000)
+    assert [_element_size(block) for block in blocks] == [3000, 1999]
+    assert all("offset" not in e for b in blocks for e in b["elements"])
+
+
+def test_oversized_link_text_is_split_into_links():
+    url = "https://e.com/a"
+    blocks = slackify_blocks("see [" + "x" * 250 + "](" + url + ") end", max_chars=100)
+    assert max(_element_size(block) for block in blocks) <= 100
+    links = [
+        leaf
+        for block in blocks
+        for element in block["elements"]
+        for leaf in element["elements"]
+        if leaf["type"] == "link"
+    ]
+    assert {link["url"] for link in links} == {url}
+    assert "".join(link["text"] for link in links) == "x" * 250
+
+
+def test_quote_in_list_item_stays_in_the_item():
+    assert _elements("- a\n\n  > q\n  > r\n\n  b\n- c") == [
+        {
+            "type": "rich_text_list",
+            "style": "bullet",
+            "indent": 0,
+            "elements": [
+                {
+                    "type": "rich_text_section",
+                    "elements": [{"type": "text", "text": "a\n> q\n> r\nb"}],
+                },
+                {
+                    "type": "rich_text_section",
+                    "elements": [{"type": "text", "text": "c"}],
+                },
+            ],
+        }
+    ]
+
+
+def test_paragraph_after_nested_list_continues_the_item():
+    assert _elements("- a\n  - b\n\n  tail of a") == [
+        {
+            "type": "rich_text_list",
+            "style": "bullet",
+            "indent": 0,
+            "elements": [
+                {
+                    "type": "rich_text_section",
+                    "elements": [{"type": "text", "text": "a"}],
+                }
+            ],
+        },
+        {
+            "type": "rich_text_list",
+            "style": "bullet",
+            "indent": 1,
+            "elements": [
+                {
+                    "type": "rich_text_section",
+                    "elements": [{"type": "text", "text": "b"}],
+                }
+            ],
+        },
+        {
+            "type": "rich_text_list",
+            "style": "bullet",
+            "indent": 0,
+            "elements": [
+                {
+                    "type": "rich_text_section",
+                    "elements": [{"type": "text", "text": "tail of a"}],
+                }
+            ],
+        },
+    ]
+
+
+def test_item_continued_after_nested_list_repeats_its_number():
+    elements = _elements("3. a\n   1. b\n\n   tail\n4. c")
+    summary = [
+        (
+            e["indent"],
+            e.get("offset"),
+            [i["elements"][0]["text"] for i in e["elements"]],
+        )
+        for e in elements
+    ]
+    assert summary == [(0, 2, ["a"]), (1, None, ["b"]), (0, 2, ["tail", "c"])]
+
+
+def test_sections_use_mrkdwn_chunks():
+    sections = slackify_sections("**a**\n\n" + "word " * 1000, max_chars=3000)
+    assert sections[0]["text"] == {
+        "type": "mrkdwn",
+        "text": sections[0]["text"]["text"],
+    }
+    assert sections[0]["text"]["text"].startswith("*a*")
+    assert all(len(s["text"]["text"]) <= 3000 for s in sections)
+    # The short paragraph fills a chunk on its own; the long one is split.
+    assert len(sections) == 3
+
+
+def test_link_with_oversized_url_gets_a_block_of_its_own():
+    url = "https://example.com/?q=" + "a" * 3100
+    blocks = slackify_blocks("see [x](" + url + ") and some trailing text")
+    assert [_element_size(block) for block in blocks] == [4, len(url) + 1, 23]
+    assert blocks[1]["elements"][0]["elements"] == [
+        {"type": "link", "url": url, "text": "x"}
+    ]
+
+
+def test_link_longer_than_a_tiny_budget_is_not_cut():
+    blocks = slackify_blocks("[abc](http://a.b) tail", max_chars=2)
+    assert [_element_size(block) for block in blocks] == [13, 2, 2, 1]
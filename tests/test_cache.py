@@ -0,0 +1,112 @@
+import threading
+
+import pytest
+
+from slackify_markdown import (
+    ConversionCache,
+    RenderProfile,
+    SlackifyConverter,
+    slackify_markdown,
+)
+
+
+def test_cached_converter_matches_uncached():
+    converter = SlackifyConverter(cache=ConversionCache())
+    for markdown in ["**a**", "- b", "**a**", "- b", "**a**"]:
+        assert converter.convert(markdown) == slackify_markdown(markdown)
+    info = converter.cache_info()
+    assert (info.hits, info.misses, info.entries) == (3, 2, 2)
+    assert info.bytes > 0
+
+
+def test_converters_sharing_a_cache_keep_their_own_output():
+    cache = ConversionCache()
+    plain = RenderProfile(bullets=("-",), heading_format="{text}")
+    converters = [
+        SlackifyConverter(cache=cache),
+        SlackifyConverter(cache=cache, engine="tree"),
+        SlackifyConverter(cache=cache, profile=plain),
+    ]
+    markdown = "# Title\n\n- a\n\n  b"
+    expected = [
+        SlackifyConverter(engine=c.engine, profile=c.profile).convert(markdown)
+        for c in converters
+    ]
+    assert len(set(expected)) == 3
+    for _ in range(2):
+        assert [c.convert(markdown) for c in converters] == expected
+    assert cache.info().entries == 3
+
+
+def test_uncached_converter_has_no_cache_info():
+    assert SlackifyConverter().cache_info() is None
+
+
+def test_evicts_least_recently_used_by_count():
+    cache = ConversionCache(max_entries=2)
+    cache.put("a", "A")
+    cache.put("b", "B")
+    assert cache.get("a") == "A"
+    cache.put("c", "C")
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    assert cache.get("c") == "C"
+    assert cache.info().evictions == 1
+
+
+def test_evicts_by_total_bytes():
+    entry_size = ConversionCache._entry_size("k0", "x" * 100)
+    cache = ConversionCache(max_entries=100, max_bytes=entry_size * 3)
+    for i in range(10):
+        cache.put("k{}".format(i), "x" * 100)
+    info = cache.info()
+    assert info.entries == 3
+    assert info.bytes <= info.max_bytes
+    assert info.evictions == 7
+
+
+def test_replacing_entry_keeps_byte_count_accurate():
+    cache = ConversionCache()
+    cache.put("a", "short")
+    cache.put("a", "a much longer value")
+    assert cache.info().bytes == ConversionCache._entry_size("a", "a much longer value")
+
+
+def test_large_inputs_bypass_cache():
+    converter = SlackifyConverter(cache=ConversionCache(max_input_chars=10))
+    big = "**" + "x" * 20 + "**"
+    assert converter.convert(big) == converter.convert(big)
+    info = converter.cache_info()
+    assert (info.entries, info.bypasses, info.misses) == (0, 2, 0)
+
+
+def test_clear_resets_entries_and_stats():
+    cache = ConversionCache()
+    cache.put("a", "A")
+    cache.get("a")
+    cache.clear()
+    assert cache.info()[:6] == (0, 0, 0, 0, 0, 0)
+
+
+def test_rejects_bad_limits():
+    with pytest.raises(ValueError):
+        ConversionCache(max_entries=0)
+
+
+def test_cache_is_thread_safe():
+    cache = ConversionCache(max_entries=8)
+
+    def hammer(offset):
+        for i in range(2000):
+            key = str((i + offset) % 16)
+            if cache.get(key) is None:
+                cache.put(key, key * 3)
+
+    threads = [threading.Thread(target=hammer, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    info = cache.info()
+    assert info.entries <= 8
+    assert info.hits + info.misses == 8000
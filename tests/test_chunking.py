@@ -0,0 +1,126 @@
+import re
+import tracemalloc
+
+import pytest
+
+from slackify_markdown import slackify_chunks, slackify_markdown
+from slackify_markdown.service import _default_converter
+
+DOCUMENT = "\n\n".join(
+    [
+        "# Incident report",
+        "Paragraph with **bold**, <@U12345> and [a link](https://example.com/x).",
+        "- item one\n- item two\n  - nested item",
+        "```\n" + "\n".join("line {} <&>".format(i) for i in range(40)) + "\n```",
+        "> quoted text",
+        " ".join(
+            "word{} <https://example.com/{}|link {}>".format(i, i, i) for i in range(60)
+        ),
+    ]
+)
+
+ATOMIC_RE = re.compile(r"<[^<>\n]*>|&(?:amp|lt|gt);")
+
+
+def _atoms(text):
+    return ATOMIC_RE.findall(text)
+
+
+def test_small_document_is_one_chunk():
+    markdown = "**hi** <@U1>\n\n- a\n- b"
+    assert list(slackify_chunks(markdown)) == [slackify_markdown(markdown).strip("\n")]
+
+
+@pytest.mark.parametrize("max_chars", [60, 100, 250, 1000])
+def test_chunks_respect_limit_and_keep_content(max_chars):
+    chunks = list(slackify_chunks(DOCUMENT, max_chars=max_chars))
+    full = slackify_markdown(DOCUMENT)
+    assert all(0 < len(chunk) <= max_chars for chunk in chunks)
+    # Fences re-opened across chunks add ``` pairs; everything else is kept.
+    joined = "".join(chunks).replace("```", "")
+    assert re.sub(r"\s", "", joined) == re.sub(r"\s", "", full.replace("```", ""))
+    # No link, mention or entity is ever cut in half.
+    assert [atom for chunk in chunks for atom in _atoms(chunk)] == _atoms(full)
+
+
+@pytest.mark.parametrize("max_chars", [60, 200])
+def test_fence_spanning_chunks_is_reopened(max_chars):
+    chunks = list(slackify_chunks(DOCUMENT, max_chars=max_chars))
+    for chunk in chunks:
+        assert chunk.count("```") % 2 == 0, chunk
+    fenced = [chunk for chunk in chunks if "line 10 " in chunk or "line 39 " in chunk]
+    assert all(chunk.startswith("```") or "```\n" in chunk for chunk in fenced)
+
+
+def test_long_line_in_fence_is_split():
+    markdown = "```\n" + "x" * 100 + "\n```"
+    chunks = list(slackify_chunks(markdown, max_chars=40))
+    assert all(len(chunk) <= 40 and chunk.count("```") == 2 for chunk in chunks)
+    assert "".join(c.replace("```", "").strip("\n") for c in chunks) == "x" * 100
+
+
+def test_link_at_the_start_of_a_piece_is_not_cut():
+    link = "[see the full incident report](https://example.com/incidents/1234)"
+    markdown = "x" * 30 + " " + link + " and more text here"
+    chunks = list(slackify_chunks(markdown, max_chars=69))
+    assert all(len(chunk) <= 69 for chunk in chunks)
+    assert [atom for chunk in chunks for atom in _atoms(chunk)] == [
+        "<https://example.com/incidents/1234|see the full incident report>"
+    ]
+
+
+def test_rejects_tiny_limit():
+    with pytest.raises(ValueError):
+        slackify_chunks("text", max_chars=4)
+
+
+def test_windowed_parse_matches_full_conversion():
+    from slackify_markdown.blocks import iter_structural_blocks
+    from slackify_markdown.slackify import SlackifyMarkdown
+
+    markdown = "\n\n".join([DOCUMENT] * 20) + "\n\n```\n" + "big fence\n" * 500 + "```"
+    for window in (10, 500, 5000):
+        structural = "".join(
+            iter_structural_blocks(_default_converter, markdown, window)
+        )
+        rendered = SlackifyMarkdown.materialize_newlines(structural).rstrip("\n") + "\n"
+        assert rendered == slackify_markdown(markdown)
+
+
+def test_huge_input_is_parsed_about_once(monkeypatch):
+    calls = []
+    parse = _default_converter._parse
+
+    def counting_parse(text, env=None):
+        calls.append(len(text))
+        return parse(text, env)
+
+    monkeypatch.setattr(_default_converter, "_parse", counting_parse)
+    markdown = "\n\n".join([DOCUMENT] * 50)
+    chunks = list(slackify_chunks(markdown, max_chars=3000))
+    # Parsed window by window; only the block straddling each window edge is
+    # parsed twice, and the output is never re-parsed.
+    assert len(calls) > 1
+    assert sum(calls) < 1.2 * len(markdown)
+    assert len(chunks) > 10
+
+
+def test_chunk_memory_does_not_grow_with_output():
+    markdown = "\n\n".join(
+        "Paragraph {} with **bold** and <@U{}> & more.".format(i, i)
+        for i in range(1500)
+    )
+
+    def peak(func):
+        tracemalloc.start()
+        func()
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return peak_bytes
+
+    def consume_chunks():
+        for _ in slackify_chunks(markdown, max_chars=3000):
+            pass
+
+    # Chunking only holds one parse window of tokens and one chunk of output.
+    assert peak(consume_chunks) < peak(lambda: slackify_markdown(markdown)) / 2
@@ -0,0 +1,131 @@
+import io
+import json
+
+import pytest
+
+from slackify_markdown import cli, slackify_markdown
+
+DOCS = [
+    "**bold** {}".format(i) if i % 2 else "- item {}\n  - nested".format(i)
+    for i in range(40)
+]
+
+
+def _run(monkeypatch, capsys, argv, stdin=""):
+    monkeypatch.setattr("sys.stdin", io.StringIO(stdin))
+    status = cli.main(argv)
+    captured = capsys.readouterr()
+    return status, captured.out, captured.err
+
+
+def test_converts_stdin(monkeypatch, capsys):
+    status, out, _ = _run(monkeypatch, capsys, [], "# Title\n\n**x** & <@U1>")
+    assert status == 0
+    assert out == slackify_markdown("# Title\n\n**x** & <@U1>")
+
+
+def test_converts_files_and_directories(monkeypatch, capsys, tmp_path):
+    source = tmp_path / "in"
+    (source / "sub").mkdir(parents=True)
+    (source / "a.md").write_text("**a**")
+    (source / "sub" / "b.md").write_text("- b")
+    (source / "skip.txt").write_text("**no**")
+    single = tmp_path / "single.markdown"
+    single.write_text("_c_")
+    output = tmp_path / "out"
+
+    status, out, _ = _run(
+        monkeypatch, capsys, [str(source), str(single), "-o", str(output)]
+    )
+
+    assert status == 0 and out == ""
+    assert (output / "a.mrkdwn").read_text() == "*a*\n"
+    assert (output / "sub" / "b.mrkdwn").read_text() == "•   b\n"
+    assert (output / "single.mrkdwn").read_text() == "_c_\n"
+    assert not (output / "skip.mrkdwn").exists()
+
+
+def test_files_without_output_dir_go_to_stdout(monkeypatch, capsys, tmp_path):
+    (tmp_path / "a.md").write_text("**a**")
+    (tmp_path / "b.md").write_text("**b**")
+    _, out, _ = _run(monkeypatch, capsys, [str(tmp_path)])
+    assert out == "*a*\n*b*\n"
+
+
+def test_ndjson_records_keep_their_fields(monkeypatch, capsys):
+    lines = [
+        json.dumps({"id": i, "text": text, "lang": "en"}) for i, text in enumerate(DOCS)
+    ]
+    status, out, _ = _run(monkeypatch, capsys, ["--ndjson"], "\n".join(lines) + "\n\n")
+    records = [json.loads(line) for line in out.splitlines()]
+    assert status == 0
+    assert records == [
+        {"id": i, "text": slackify_markdown(text), "lang": "en"}
+        for i, text in enumerate(DOCS)
+    ]
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_ndjson_with_workers(monkeypatch, capsys, ordered):
+    # Force many small batches so several are in flight at once.
+    monkeypatch.setattr(cli, "_BATCH_DOCS", 3)
+    monkeypatch.setattr(cli, "_BATCHES_PER_WORKER", 1)
+    lines = [json.dumps({"id": i, "text": text}) for i, text in enumerate(DOCS)]
+    argv = ["--ndjson", "--workers", "2"] + ([] if ordered else ["--unordered"])
+    _, out, _ = _run(monkeypatch, capsys, argv, "\n".join(lines))
+    records = [json.loads(line) for line in out.splitlines()]
+    if ordered:
+        assert [record["id"] for record in records] == list(range(len(DOCS)))
+    assert sorted(records, key=lambda record: record["id"]) == [
+        {"id": i, "text": slackify_markdown(text)} for i, text in enumerate(DOCS)
+    ]
+
+
+def test_stats_summary(monkeypatch, capsys):
+    _, _, err = _run(monkeypatch, capsys, ["--stats"], "hello")
+    assert "documents: 1" in err
+    assert "docs/s" in err and "p99" in err
+
+
+def test_bad_ndjson_record_is_reported(monkeypatch, capsys):
+    status, _, err = _run(monkeypatch, capsys, ["--ndjson"], '{"id": 1}\n')
+    assert status == 1
+    assert '<stdin>:1: expected an object with a string "text"' in err
+
+
+def test_missing_path_is_reported(monkeypatch, capsys, tmp_path):
+    status, _, err = _run(monkeypatch, capsys, [str(tmp_path / "nope.md")])
+    assert status == 1
+    assert "no such file or directory" in err
+
+
+def test_output_path_collision_is_reported(monkeypatch, capsys, tmp_path):
+    for name in ("one", "two"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "a.md").write_text("**a**")
+    output = tmp_path / "out"
+    argv = [str(tmp_path / "one"), str(tmp_path / "two"), "-o", str(output)]
+    status, _, err = _run(monkeypatch, capsys, argv)
+    assert status == 1
+    assert "would both be written to {}".format(output / "a.mrkdwn") in err
+    assert not output.exists()
+
+
+def test_non_utf8_file_is_reported(monkeypatch, capsys, tmp_path):
+    (tmp_path / "a.md").write_text("fine", encoding="utf-8")
+    (tmp_path / "b.md").write_bytes(b"caf\xe9")
+    status, _, err = _run(monkeypatch, capsys, [str(tmp_path)])
+    assert status == 1
+    assert "b.md: not valid UTF-8" in err
+    status, _, err = _run(monkeypatch, capsys, ["--ndjson", str(tmp_path / "b.md")])
+    assert status == 1
+    assert "b.md: not valid UTF-8" in err
+
+
+def test_rejects_bad_arguments(monkeypatch, capsys):
+    with pytest.raises(SystemExit):
+        _run(monkeypatch, capsys, ["--workers", "0"])
+    with pytest.raises(SystemExit):
+        _run(monkeypatch, capsys, ["--ndjson", "-o", "out"])
+    with pytest.raises(SystemExit):
+        _run(monkeypatch, capsys, ["-o", "out", "--suffix", "txt", "in.md"])
@@ -0,0 +1,137 @@
+"""
+Growth-rate checks. Every feature family is converted at geometrically
+increasing sizes, and the exponent ``k`` of ``time ~ size ** k`` is fitted by
+least squares on the log-log points. Linear code fits ``k`` close to 1 on
+any machine, and a quadratic path pushes it towards 2, however fast the
+machine is.
+"""
+
+import gc
+import math
+import time
+
+import pytest
+
+from slackify_markdown import SlackifyConverter
+
+# Fail when the fitted exponent is above this. Conversions measure 0.9-1.15
+# here, and a path that is quadratic at these sizes measures well above 1.5.
+MAX_EXPONENT = 1.35
+SIZES = [8_000 * 2**step for step in range(4)]
+REPEAT = 3
+
+
+def _repeat_to(unit, size, separator=""):
+    count = max(1, size // (len(unit) + len(separator)))
+    return separator.join(unit.format(idx) for idx in range(count)) + "\n"
+
+
+def nested_lists(size):
+    # Items cycling through six levels, one list.
+    lines = []
+    length = idx = 0
+    while length < size:
+        line = "    " * (idx % 6) + "- item {} with **bold** and `code`".format(idx)
+        lines.append(line)
+        length += len(line) + 1
+        idx += 1
+    return "\n".join(lines) + "\n"
+
+
+def blockquotes(size):
+    # One quote: lazy continuation lines with a nested quote every few lines.
+    return _repeat_to("> quoted line {} with _em_\n> > nested", size, "\n")
+
+
+def emphasis_runs(size):
+    # One long line of delimiter runs for balance_pairs and fragments_join.
+    return _repeat_to("**bold {}** _it_ ~~gone~~ *x* __u__ ", size)
+
+
+def mentions(size):
+    # One long line where the inline text rule stops at almost every word.
+    return _repeat_to("<@U{}> hi <#C1|general> & <!here> > ", size)
+
+
+def links(size):
+    return _repeat_to(
+        "[text {}](https://example.com/p) <https://a.io> ![i](https://e.com/a.png)",
+        size,
+        "\n",
+    )
+
+
+def fenced_code(size):
+    return _repeat_to("```py\n" + "x = {0} & <y>\n" * 20 + "```", size, "\n\n")
+
+
+def tables(size):
+    # One CSV-like table, wider than the column and width limits.
+    header = "| " + " | ".join("col {}".format(idx) for idx in range(12)) + " |\n"
+    rule = "|" + "---|" * 12 + "\n"
+    row = "| " + " | ".join(["**{0}** [v](https://e.com/{0})"] * 12) + " |"
+    return header + rule + _repeat_to(row, size, "\n")
+
+
+FAMILIES = [
+    nested_lists,
+    blockquotes,
+    emphasis_runs,
+    mentions,
+    links,
+    fenced_code,
+    tables,
+]
+
+
+def _best_times(convert, documents):
+    # Sizes are interleaved so machine noise hits all of them alike; the
+    # collector is paused so its pauses don't land on one size.
+    best = [float("inf")] * len(documents)
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(REPEAT):
+            for idx, document in enumerate(documents):
+                start = time.perf_counter()
+                convert(document)
+                best[idx] = min(best[idx], time.perf_counter() - start)
+    finally:
+        if enabled:
+            gc.enable()
+    return best
+
+
+def growth_exponent(sizes, times):
+    """
+    Least-squares slope of log(time) over log(size).
+    """
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(seconds) for seconds in times]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    covariance = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    return covariance / sum((x - mean_x) ** 2 for x in xs)
+
+
+def test_growth_exponent_fit():
+    sizes = [1000, 2000, 4000, 8000]
+    assert growth_exponent(sizes, [size * 1e-6 for size in sizes]) == pytest.approx(1.0)
+    assert growth_exponent(
+        sizes, [size**2 * 1e-9 for size in sizes]
+    ) == pytest.approx(2.0)
+
+
+@pytest.mark.parametrize("engine", ["tokens", "tree"])
+@pytest.mark.parametrize("family", FAMILIES, ids=lambda family: family.__name__)
+def test_conversion_time_grows_linearly(family, engine):
+    convert = SlackifyConverter(engine=engine).convert
+    documents = [family(size) for size in SIZES]
+    sizes = [len(document) for document in documents]
+    exponent = growth_exponent(sizes, _best_times(convert, documents))
+    if exponent > MAX_EXPONENT:
+        # Measure once more before failing, so one noisy run doesn't.
+        exponent = min(
+            exponent, growth_exponent(sizes, _best_times(convert, documents))
+        )
+    assert exponent <= MAX_EXPONENT, "time grows as size ** {:.2f}".format(exponent)
@@ -148,12 +148,13 @@ For more information, visit our <https://example.com|official website>.
 
 *Table*
 
-| Feature    | Description         |
-|------------|---------------------|
-| Speed      | Fast performance    |
-| Usability  | Easy to use         |
-| Security   | Top-notch protection|
-
+```
+Feature   | Description
+----------+---------------------
+Speed     | Fast performance
+Usability | Easy to use
+Security  | Top-notch protection
+```
 *Footnotes*
 
 This project is a game-changer[^1].
@@ -757,9 +758,11 @@ def test_full_document_with_all_patterns():
         "```\n"
         "The code above will produce mrkdwn ready to post to Slack.\n\n"
         "*API surface*\n\n"
-        "| Function | Description |\n"
-        "|----------|-------------|\n"
-        "| slackify_markdown(text) | Convert Markdown to mrkdwn |\n\n"
+        "```\n"
+        "Function                | Description\n"
+        "------------------------+---------------------------\n"
+        "slackify_markdown(text) | Convert Markdown to mrkdwn\n"
+        "```\n"
         "(Tables are passed through as raw text — Slack does not render Markdown tables.)\n\n"
         "*Things to watch out for*\n\n"
         "> *Important:* Slack mentions like <@U12345>, <#C99999|general>, "
@@ -0,0 +1,98 @@
+import sys
+import threading
+
+import pytest
+
+from slackify_markdown import SlackifyConverter, slackify_markdown
+from slackify_markdown.slackify import SlackifyMarkdown
+
+SAMPLES = [
+    "",
+    "plain text",
+    "**Bold** and _Italic_ with `inline code`.",
+    "# Heading with **bold**\n\nText after.",
+    "- a\n  - b\n    - c\n      - d\n\npara",
+    "1. one\n2. two\n   - nested\n",
+    "> quote with <@U123> & <tag>\n\n> second",
+    "```python\nx = 1\n\n\n\ny = 2\n```\n",
+    "[link](https://example.com) and ![img](https://example.com/a.png)",
+    "before\x02\x02\x02after",
+]
+
+
+@pytest.mark.parametrize("markdown", SAMPLES)
+def test_converter_matches_per_call_renderer(markdown):
+    converter = SlackifyConverter()
+    assert converter.convert(markdown) == SlackifyMarkdown(markdown).slackify()
+
+
+def test_converter_reuse_is_stateless():
+    converter = SlackifyConverter()
+    expected = [SlackifyMarkdown(markdown).slackify() for markdown in SAMPLES]
+    for _ in range(3):
+        assert [converter.convert(markdown) for markdown in SAMPLES] == expected
+
+
+def test_converter_recovers_after_unbalanced_state():
+    converter = SlackifyConverter()
+    # A render cut off inside a heading and a list leaves its state behind.
+    tokens = converter._parse("# **title**\n\n- a\n  - b\n")
+    unbalanced = [token for token in tokens if not token.type.endswith("_close")]
+    converter._render_structural(unbalanced, {})
+    assert converter.convert("**bold**\n\n- item") == "*bold*\n\n•   item\n"
+
+
+def test_slackify_markdown_uses_shared_converter():
+    assert slackify_markdown("**a**") == SlackifyConverter().convert("**a**")
+
+
+def _contended_documents():
+    # Headings with bold inside (heading state) next to lists of varying
+    # depth (list depth), so a render that sees another thread's state
+    # drops or doubles a "*" or picks the wrong bullet and indent.
+    documents = []
+    for idx in range(24):
+        depth = 1 + idx % 5
+        nested = "\n".join(
+            "    " * level + "- level {}".format(level) for level in range(depth)
+        )
+        documents.append(
+            "# **Title {}** end\n\n{}\n\n## **Sub** {}\n\n1. one\n   - **x**\n\ntail".format(
+                idx, nested, idx
+            )
+        )
+    return documents
+
+
+@pytest.mark.parametrize("engine", ["tokens", "tree"])
+def test_shared_converter_under_thread_contention(engine):
+    converter = SlackifyConverter(engine=engine)
+    documents = _contended_documents()
+    expected = [converter.convert(document) for document in documents]
+    threads = 8
+    barrier = threading.Barrier(threads)
+    failures = []
+
+    def worker(offset):
+        barrier.wait()
+        for round_idx in range(10):
+            for idx in range(len(documents)):
+                pick = (idx + offset + round_idx) % len(documents)
+                if converter.convert(documents[pick]) != expected[pick]:
+                    failures.append(pick)
+
+    interval = sys.getswitchinterval()
+    # Switch threads as often as possible, so renders interleave on GIL
+    # builds too.
+    sys.setswitchinterval(1e-6)
+    try:
+        pool = [
+            threading.Thread(target=worker, args=(offset,)) for offset in range(threads)
+        ]
+        for thread in pool:
+            thread.start()
+        for thread in pool:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+    assert failures == []
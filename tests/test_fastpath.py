@@ -0,0 +1,161 @@
+import pytest
+
+from slackify_markdown import SlackifyConverter
+from slackify_markdown.fastpath import (
+    is_plain_ascii,
+    is_plain_text,
+    render_plain_ascii,
+    render_plain_text,
+)
+from slackify_markdown.slackify import SlackifyMarkdown, build_parser
+
+FULL = build_parser(SlackifyMarkdown)
+CONVERTER = SlackifyConverter()
+
+# Pieces of short status messages, with every character class the pre-scan
+# looks at: markdown punctuation, whitespace, mentions, entities and digits.
+PIECES = [
+    "deploy finished",
+    "ok",
+    "AT&T",
+    "a & b",
+    "x > y",
+    "<@U123>",
+    "<#C1|general>",
+    "<!here>",
+    "<#C1|a@b.co>",
+    "<!x:y>",
+    "<http://a.b>",
+    "<@U1",
+    "<",
+    ">",
+    "&amp;",
+    "&#35;",
+    "# ",
+    "#1",
+    "1.",
+    "2)",
+    "2024",
+    "- ",
+    "+",
+    "=",
+    "~",
+    "~~",
+    "*",
+    "_",
+    "`",
+    "[x]",
+    "!",
+    "|",
+    " | ",
+    ":--",
+    "\\",
+    " ",
+    "  ",
+    "\t",
+    "\x0b",
+    "\x0c",
+    "\x1c",
+    "\x1d",
+    "\x1e",
+    "\x1f",
+    "\xa0",
+    "\n",
+    "\n",
+    "\n\n",
+    "\n\n\n",
+    "\r\n",
+    "é",
+    " ",
+]
+
+
+def test_fast_and_full_paths_agree_on_random_messages(random_documents):
+    plain = 0
+    for text in random_documents(7, 5000, PIECES, sizes=(0, 10)):
+        expected = FULL.render(text)
+        if is_plain_text(text):
+            plain += 1
+            assert render_plain_text(text) == expected, repr(text)
+        assert CONVERTER.convert(text) == expected, repr(text)
+    # The generator must actually exercise the fast path.
+    assert plain > 300
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Build 1234 passed, <@U1> ping <#C2|ops> & <!here>\n\n\n\nnext paragraph",
+        "",
+        "\n\n",
+        "x > y and a & b",
+        "~5 minutes left",
+    ],
+)
+def test_plain_messages_take_the_fast_path(text):
+    assert is_plain_text(text)
+    assert CONVERTER.convert(text) == FULL.render(text)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "**bold**",
+        "snake_case",
+        "`code`",
+        "[link](https://e.com)",
+        "~~gone~~",
+        "&amp;",
+        "<https://e.com>",
+        "<#a@b.co>",
+        "<@U1\n>",
+        " leading space",
+        "trailing space ",
+        "# heading",
+        "> quote",
+        "- item",
+        "1. item",
+        "title\n===",
+        "line\r\nbreak",
+        "escaped \\*",
+    ],
+)
+def test_markdown_is_not_plain_text(text):
+    assert not is_plain_text(text)
+
+
+def test_subclassed_renderer_always_parses(monkeypatch):
+    class Shouting(SlackifyMarkdown):
+        def text(self, tokens, idx, options, env):
+            return tokens[idx].content.upper()
+
+    assert SlackifyConverter(renderer_cls=Shouting).convert("quiet") == "QUIET\n"
+
+
+def test_bytes_and_str_paths_agree_on_random_messages(random_documents):
+    ascii_plain = 0
+    for text in random_documents(19, 3000, PIECES, sizes=(0, 10)):
+        data = text.encode("utf-8")
+        expected = CONVERTER.convert(text).encode("utf-8")
+        if is_plain_ascii(data):
+            ascii_plain += 1
+            assert is_plain_text(text)
+            assert render_plain_ascii(data) == expected, repr(text)
+        for buffer in (data, bytearray(data), memoryview(data)):
+            assert CONVERTER.convert_bytes(buffer) == expected, repr(text)
+    assert ascii_plain > 300
+
+
+@pytest.mark.parametrize(
+    "data", [b"caf\xc3\xa9", b"nbsp\xc2\xa0", b"a\x02b", b"nul\x00"]
+)
+def test_non_ascii_and_control_bytes_take_the_str_path(data):
+    assert not is_plain_ascii(data)
+    assert CONVERTER.convert_bytes(data) == CONVERTER.convert(
+        data.decode("utf-8")
+    ).encode("utf-8")
+
+
+def test_invalid_utf8_raises():
+    with pytest.raises(UnicodeDecodeError):
+        CONVERTER.convert_bytes(b"\xff plain")
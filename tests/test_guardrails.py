@@ -0,0 +1,126 @@
+import random
+import time
+
+import pytest
+
+from slackify_markdown import (
+    ConversionCache,
+    ConversionLimits,
+    SlackifyConverter,
+    slackify_markdown,
+)
+from slackify_markdown.guardrails import plain_text
+
+LIMITS = ConversionLimits(max_input_bytes=200_000, max_nesting=8, max_seconds=0.1)
+# Generous slack over max_seconds for a loaded CI machine; the point is that
+# no case runs anywhere near its unguarded cost.
+TIME_BOUND = 1.0
+
+# A table row with far more cells than fit on a line.
+_WIDE_ROW = "|c" * 2000 + "|\n"
+
+# Inputs that cost far more CPU than their size suggests.
+ADVERSARIAL = {
+    "open_brackets": "[" * 150_000,
+    "nested_link_openers": "[a](" * 40_000,
+    "emphasis_runs": "*_" * 75_000,
+    "star_a": "*a" * 75_000,
+    "mention_openers": "<@" * 75_000,
+    "backticks": "`a``" * 40_000,
+    "gt_run": ">" * 190_000,
+    "deep_quote_lines": "\n".join(">" * i + " x" for i in range(600)),
+    "deep_list": "\n".join("  " * i + "- x" for i in range(400)),
+    "autolink_openers": "<http://a" * 20_000,
+    "wide_table": _WIDE_ROW + "|-" * 2000 + "|\n" + _WIDE_ROW * 45,
+}
+
+
+@pytest.fixture(scope="module")
+def guarded():
+    return SlackifyConverter(limits=LIMITS)
+
+
+def test_normal_input_is_unaffected(guarded):
+    markdown = "# Title\n\n- a\n  - **b**\n\n> quote <@U1> & c"
+    result = guarded.convert_guarded(markdown)
+    assert result == (slackify_markdown(markdown), None)
+    assert guarded.convert(markdown) == slackify_markdown(markdown)
+
+
+def test_input_size_limit_counts_utf8_bytes():
+    converter = SlackifyConverter(limits=ConversionLimits(max_input_bytes=10))
+    result = converter.convert_guarded("**ten chars")
+    assert result.degraded == "input larger than 10 bytes"
+    assert converter.convert_guarded("**éé**").degraded is None
+    result = converter.convert_guarded("**ééé** <")
+    assert result.degraded == "input larger than 10 bytes"
+    assert result.text == "**ééé** &lt;\n"
+
+
+@pytest.mark.parametrize("engine", ["tokens", "tree"])
+def test_nesting_limit(engine):
+    converter = SlackifyConverter(engine=engine, limits=ConversionLimits(max_nesting=2))
+    assert converter.convert_guarded("- a\n  - b").degraded is None
+    result = converter.convert_guarded("> - a\n>   - b")
+    assert result.degraded == "nesting deeper than 2"
+    assert result.text == "&gt; - a\n&gt;   - b\n"
+
+
+def test_time_budget_cuts_a_single_paragraph_short():
+    converter = SlackifyConverter(limits=ConversionLimits(max_seconds=0.05))
+    start = time.perf_counter()
+    result = converter.convert_guarded("[" * 300_000)
+    assert time.perf_counter() - start < TIME_BOUND
+    assert result.degraded == "time budget exceeded"
+    assert result.text == "[" * 300_000 + "\n"
+
+
+def test_time_budget_cuts_a_single_table_short():
+    converter = SlackifyConverter(limits=ConversionLimits(max_seconds=0.05))
+    markdown = "| a | b |\n|---|---|\n" + "| x | y |\n" * 200_000
+    start = time.perf_counter()
+    result = converter.convert_guarded(markdown)
+    assert time.perf_counter() - start < TIME_BOUND
+    assert result.degraded == "time budget exceeded"
+
+
+def test_degraded_results_are_not_cached():
+    cache = ConversionCache()
+    converter = SlackifyConverter(cache=cache, limits=ConversionLimits(max_nesting=1))
+    converter.convert("> > x")
+    converter.convert("> x")
+    assert cache.info().entries == 1
+
+
+def test_unguarded_parses_are_not_limited():
+    converter = SlackifyConverter(limits=ConversionLimits(max_nesting=1))
+    assert converter._parse("> > x")
+
+
+def test_rejects_bad_limits():
+    with pytest.raises(ValueError):
+        SlackifyConverter(limits=ConversionLimits(max_seconds=0))
+
+
+@pytest.mark.parametrize("name", sorted(ADVERSARIAL))
+def test_adversarial_input_is_time_bounded(guarded, name):
+    markdown = ADVERSARIAL[name]
+    start = time.perf_counter()
+    result = guarded.convert_guarded(markdown)
+    assert time.perf_counter() - start < TIME_BOUND, result.degraded
+    if result.degraded:
+        assert result.text == plain_text(markdown)
+
+
+def test_fuzzed_input_is_time_bounded(guarded):
+    rng = random.Random(5)
+    alphabet = "*_~`[]()<>!#-+.1 \n\\&@|:ahttp"
+    for _ in range(30):
+        size = rng.choice((1_000, 10_000, 100_000))
+        markdown = "".join(rng.choice(alphabet) for _ in range(size))
+        start = time.perf_counter()
+        result = guarded.convert_guarded(markdown)
+        assert time.perf_counter() - start < TIME_BOUND, repr(markdown[:80])
+        assert result.text.endswith("\n")
+        if result.degraded is None and size < 100_000:
+            assert result.text == slackify_markdown(markdown)
@@ -0,0 +1,36 @@
+import subprocess
+import sys
+
+import slackify_markdown
+from slackify_markdown import service, slackify_markdown as convert, warmup
+
+
+def test_package_import_does_not_load_the_parser():
+    # A fresh interpreter: this one has imported everything already.
+    code = (
+        "import sys\n"
+        "from slackify_markdown import slackify_markdown\n"
+        "heavy = ('markdown_it', 'asyncio', 'multiprocessing', 'slackify_markdown.converter')\n"
+        "print([name for name in heavy if name in sys.modules])\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "[]"
+
+
+def test_warmup_builds_the_shared_converter():
+    warmup()
+    converter = service._converter
+    assert converter is not None
+    warmup()
+    assert service._converter is converter
+    assert service._default_converter is converter
+    assert convert("**hi**") == "*hi*\n"
+
+
+def test_every_export_resolves():
+    assert sorted(slackify_markdown.__all__) == sorted(slackify_markdown._EXPORTS)
+    for name in slackify_markdown.__all__:
+        assert getattr(slackify_markdown, name) is not None
+        assert name in dir(slackify_markdown)
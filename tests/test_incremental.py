@@ -0,0 +1,99 @@
+import random
+
+from slackify_markdown import IncrementalSlackifier, slackify_markdown
+
+BLOCKS = [
+    "Paragraph with **bold**, _em_, <@U1> & a [link](https://e.com).",
+    "lazy\ncontinuation line",
+    "# Heading",
+    "Setext\n===",
+    "- bullet\n- list\n  - nested",
+    "- loose\n\n- list\n\n  continued",
+    "1. one\n2. two",
+    "3) three",
+    "> quote\n> more",
+    "```python\nx = 1\n\n\n\ny = 2\n```",
+    "~~~\nunclosed tilde fence",
+    "    indented\n\n    code",
+    "***",
+    "[ref link][docs] and [docs]",
+    "[docs]: https://docs.example.com",
+    "line with trailing spaces  \nhard break",
+    "\r\nCRLF paragraph\r\n",
+    "plain words",
+    "| a | b |\n|---|:-:|\n| 1 | 2 |",
+    "header\n| a |\n|--|",
+    "",
+]
+SEPARATORS = ("\n\n", "\n\n\n", "\n", "\n \n")
+
+
+def _edit(rng, parts):
+    """
+    Insert, delete or replace a block, or splice in raw characters that can
+    change a neighbour's context (merge lists, open a fence, ...).
+    """
+    choice = rng.random()
+    idx = rng.randrange(len(parts) + 1)
+    if choice < 0.3 or not parts:
+        parts.insert(idx, rng.choice(BLOCKS) + rng.choice(SEPARATORS))
+    elif choice < 0.5:
+        del parts[min(idx, len(parts) - 1)]
+    elif choice < 0.7:
+        parts[min(idx, len(parts) - 1)] = rng.choice(BLOCKS) + rng.choice(SEPARATORS)
+    else:
+        part = parts[min(idx, len(parts) - 1)]
+        pos = rng.randrange(len(part) + 1)
+        insert = rng.choice(
+            ("x", "- ", "\n", "```\n", "> ", "**", "\n\n", "2. ", "===", "|", "\n|--|")
+        )
+        parts[min(idx, len(parts) - 1)] = part[:pos] + insert + part[pos:]
+
+
+def test_matches_conversion_from_scratch(random_documents):
+    rng = random.Random(17)
+    for seed in range(30):
+        # One block and its separator per part.
+        count = rng.randint(0, 12)
+        parts = list(random_documents(seed, count, BLOCKS, (1, 1), SEPARATORS))
+        handle = IncrementalSlackifier()
+        for _ in range(25):
+            _edit(rng, parts)
+            markdown = "".join(parts)
+            update = handle.update(markdown)
+            assert update.text == slackify_markdown(markdown)
+            assert handle.text == update.text
+
+
+def test_only_changed_blocks_are_rendered():
+    blocks = ["# Title", "first **paragraph**", "- a\n- b", "last paragraph"]
+    handle = IncrementalSlackifier()
+    first = handle.update("\n\n".join(blocks))
+    assert (first.rendered, first.reused) == (4, 0)
+
+    blocks[1] = "first **edited** paragraph"
+    update = handle.update("\n\n".join(blocks))
+    assert (update.rendered, update.reused) == (1, 3)
+    assert [update.text[start:end] for start, end in update.changed] == [
+        "first *edited* paragraph"
+    ]
+
+    unchanged = handle.update("\n\n".join(blocks))
+    assert (unchanged.rendered, unchanged.reused, unchanged.changed) == (0, 4, [])
+
+
+def test_context_changes_rerender_neighbours():
+    handle = IncrementalSlackifier()
+    handle.update("- a\n\nbetween\n\n- b\n")
+    # Without the paragraph the two lists become one loose list.
+    update = handle.update("- a\n\n- b\n")
+    assert update.text == slackify_markdown("- a\n\n- b\n")
+    assert update.rendered == 1
+
+    # A definition changes how earlier blocks render.
+    handle.update("[x][r]\n\nother\n")
+    update = handle.update("[x][r]\n\nother\n\n[r]: https://example.com\n")
+    assert update.text == slackify_markdown(
+        "[x][r]\n\nother\n\n[r]: https://example.com\n"
+    )
+    assert update.rendered == 2
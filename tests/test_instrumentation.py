@@ -0,0 +1,103 @@
+import threading
+
+import pytest
+
+from slackify_markdown import (
+    ConversionCache,
+    HistogramObserver,
+    SlackifyConverter,
+    slackify_markdown,
+)
+from slackify_markdown.instrumentation import Histogram
+
+MARKDOWN = "# Title\n\n***\n\n- a **b**\n- <@U1> & c\n\n```\nx\n```"
+
+
+class Recorder:
+    def __init__(self):
+        self.events = []
+
+    def on_conversion(self, event):
+        self.events.append(event)
+
+
+@pytest.mark.parametrize("engine", ["tokens", "tree"])
+def test_observed_conversion_matches_and_reports_phases(engine):
+    recorder = Recorder()
+    converter = SlackifyConverter(engine=engine, observer=recorder)
+    converted = converter.convert(MARKDOWN)
+    assert converted == SlackifyConverter(engine=engine).convert(MARKDOWN)
+
+    (event,) = recorder.events
+    assert event.engine == engine
+    assert event.input_chars == len(MARKDOWN)
+    assert event.output_chars == len(converted)
+    phases = [
+        event.scrub_seconds,
+        event.parse_seconds,
+        event.render_seconds,
+        event.postprocess_seconds,
+    ]
+    assert all(seconds >= 0 for seconds in phases)
+    assert event.total_seconds == pytest.approx(sum(phases))
+    if engine == "tree":
+        assert event.postprocess_seconds == 0
+
+
+def test_token_counts_include_children_and_dropped_tokens():
+    recorder = Recorder()
+    SlackifyConverter(observer=recorder).convert(MARKDOWN)
+    (event,) = recorder.events
+    assert event.token_counts["list_item_open"] == 2
+    assert event.token_counts["strong_open"] == 1
+    assert event.token_counts["fence"] == 1
+    assert event.dropped_tokens == {"hr": 1}
+
+
+def test_rendered_tables_are_not_dropped_tokens():
+    recorder = Recorder()
+    SlackifyConverter(observer=recorder).convert("| a |\n|---|\n| 1 |\n\n***")
+    (event,) = recorder.events
+    assert event.token_counts["thead_open"] == 1
+    assert event.dropped_tokens == {"hr": 1}
+
+
+def test_cache_hits_are_not_observed():
+    recorder = Recorder()
+    converter = SlackifyConverter(cache=ConversionCache(), observer=recorder)
+    converter.convert(MARKDOWN)
+    converter.convert(MARKDOWN)
+    assert len(recorder.events) == 1
+
+
+def test_histogram_observer_aggregates_across_threads():
+    observer = HistogramObserver()
+    converter = SlackifyConverter(observer=observer)
+
+    def work():
+        for _ in range(25):
+            assert converter.convert(MARKDOWN) == slackify_markdown(MARKDOWN)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    snapshot = observer.snapshot()
+    assert snapshot["parse_seconds"]["count"] == 100
+    assert snapshot["input_chars"]["p50"] == len(MARKDOWN)
+    assert snapshot["tokens"]["fence"] == 100
+    assert snapshot["dropped_tokens"] == {"hr": 100}
+    observer.reset()
+    assert observer.snapshot()["total_seconds"]["count"] == 0
+
+
+def test_histogram_percentiles_are_bucket_bounds():
+    histogram = Histogram(1.0)
+    for value in [1, 2, 3, 5, 100]:
+        histogram.add(value)
+    assert histogram.percentile(0.6) == 4
+    assert histogram.percentile(0.99) == 100
+    assert histogram.summary()["mean"] == pytest.approx(22.2)
+    assert Histogram(1.0).percentile(0.5) == 0.0
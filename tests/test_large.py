@@ -0,0 +1,76 @@
+import pytest
+
+from slackify_markdown import slackify_large, slackify_markdown
+from slackify_markdown import large
+
+BLOCKS = [
+    "Paragraph with **bold**, _em_, <@U1> & a [link](https://e.com).",
+    "lazy\ncontinuation line",
+    "# Heading",
+    "Setext\n===",
+    "- bullet\n- list\n  - nested",
+    "- loose\n\n- list\n\n  continued",
+    "1. one\n2. two",
+    "3) three",
+    "> quote\n> more",
+    "```python\nx = 1\n\n\n\ny = 2\n```",
+    "~~~\nunclosed tilde fence",
+    "````\n```\n\nnot a boundary\n````",
+    "    indented\n\n    code",
+    "***",
+    "[ref link][docs] and [docs]",
+    "[docs]: https://docs.example.com",
+    "[docs]: https://second-definition-loses.example.com",
+    "line with trailing spaces  \nhard break",
+    "\r\nCRLF paragraph\r\n",
+    "plain words",
+]
+SEPARATORS = ("\n\n", "\n\n\n", "\n", "\n \n")
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_matches_serial_conversion(workers, random_documents):
+    count = 40 if workers == 1 else 5
+    for markdown in random_documents(workers, count, BLOCKS, (5, 60), SEPARATORS):
+        expected = slackify_markdown(markdown)
+        assert slackify_large(markdown, workers=workers, segment_chars=80) == expected
+
+
+def test_references_apply_across_segments():
+    filler = "filler paragraph\n\n" * 50
+    markdown = "[early use][ref]\n\n" + filler + "[ref]: https://late.example\n"
+    assert large._find_cuts(markdown, 100)[1:]
+    assert slackify_large(markdown, workers=1, segment_chars=100) == slackify_markdown(
+        markdown
+    )
+
+
+def test_cut_that_is_not_a_boundary_is_reconverted(monkeypatch):
+    # The fence check sees ```` and ``` as open + close, so it offers a cut
+    # inside the code block; the parse rejects it.
+    markdown = "intro\n\n````\n```\n\nstill code\n\nmore code\n````\n\nafter\n"
+    cuts = large._find_cuts(markdown, 10)
+    assert markdown.index("still code") in cuts
+    calls = []
+    convert_span = large._convert_span
+    monkeypatch.setattr(
+        large,
+        "_convert_span",
+        lambda *args: calls.append(args[2]) or convert_span(*args),
+    )
+    assert slackify_large(markdown, workers=1, segment_chars=10) == slackify_markdown(
+        markdown
+    )
+    assert calls
+
+
+def test_small_documents_are_converted_directly():
+    assert large._find_cuts("a\n\nb", 100) == [0]
+    assert slackify_large("**a**\n\nb") == "*a*\n\nb\n"
+
+
+def test_rejects_bad_arguments():
+    with pytest.raises(ValueError):
+        slackify_large("a", workers=0)
+    with pytest.raises(ValueError):
+        slackify_large("a", segment_chars=0)
@@ -0,0 +1,91 @@
+import pytest
+
+from slackify_markdown import (
+    ConversionLimits,
+    ConversionMetadata,
+    SlackifyConverter,
+    slackify_markdown,
+    slackify_with_metadata,
+)
+from slackify_markdown.slackify import SlackifyMarkdown
+
+
+class _NoFastPath(SlackifyMarkdown):
+    # A subclassed renderer always takes the full parse.
+    pass
+
+
+CONVERTERS = [
+    SlackifyConverter(),
+    SlackifyConverter(engine="tree"),
+    SlackifyConverter(_NoFastPath),
+]
+PIECES = [
+    "plain words",
+    "<@U1>",
+    "<#C2|general>",
+    "<!here>",
+    "<@U3",
+    "a & b > c",
+    "[docs](https://docs.example.com)",
+    "<https://auto.example.com>",
+    "![chart](https://img.example.com/c.png)",
+    "![local](chart.png)",
+    "`<@U4>`",
+    "**<@U5>**",
+    "[<@U6>](https://e.com)",
+    "\n```\n#!/bin/sh\n<@U7>\n```\n",
+    "\n\n    indented\n    code\n\n",
+    "\n\n- item <!channel>\n",
+    "\n\n> quote [q](https://q.example.com)\n",
+    "\n",
+    "\n\n",
+]
+
+
+def test_collects_entities_in_document_order():
+    markdown = (
+        "Ping <@U1> & <#C2|ops>: see [docs](https://docs.example.com) or "
+        "<https://status.example.com>.\n\n![graph](https://img.example.com/g.png)\n\n"
+        "```\nx = `<@U9>`\n```\n\n    two\n    lines\n"
+    )
+    text, metadata = slackify_with_metadata(markdown)
+    assert text == slackify_markdown(markdown)
+    assert metadata == ConversionMetadata(
+        links=["https://docs.example.com", "https://status.example.com"],
+        images=["https://img.example.com/g.png"],
+        mentions=["<@U1>", "<#C2|ops>"],
+        code_blocks=[len("x = `<@U9>`\n"), len("two\nlines\n")],
+    )
+
+
+def test_plain_text_fast_path_collects_mentions():
+    text, metadata = slackify_with_metadata("hi <@U1>, <!here> & <#C1|x>")
+    assert text == "hi <@U1>, <!here> &amp; <#C1|x>\n"
+    assert metadata == ConversionMetadata([], [], ["<@U1>", "<!here>", "<#C1|x>"], [])
+
+
+def test_engines_and_fast_path_agree(random_documents):
+    for markdown in random_documents(18, 300, PIECES, separators=("", " ")):
+        results = [
+            converter.convert_with_metadata(markdown) for converter in CONVERTERS
+        ]
+        # The tree engine only differs in line prefixes, which carry no entities.
+        assert results[0][0] == CONVERTERS[0].convert(markdown)
+        assert results[0] == results[2]
+        assert results[0][1] == results[1][1]
+
+
+@pytest.mark.parametrize(
+    "limits, markdown",
+    [
+        (ConversionLimits(max_input_bytes=10), "<@U1> and [x](https://e.com) " * 3),
+        (ConversionLimits(max_nesting=2), "> > > <@U1> [x](https://e.com)"),
+    ],
+)
+def test_degraded_conversion_reports_mentions_only(limits, markdown):
+    text, metadata = SlackifyConverter(limits=limits).convert_with_metadata(markdown)
+    assert metadata == ConversionMetadata(
+        [], [], ["<@U1>"] * markdown.count("<@U1>"), []
+    )
+    assert "<@U1>" in text
@@ -0,0 +1,108 @@
+import ast
+import pathlib
+import random
+
+import pytest
+from markdown_it.rules_inline.entity import entity
+from markdown_it.rules_inline.text import text
+
+from slackify_markdown.slackify import SlackifyMarkdown, build_parser
+from slackify_markdown.tree import SlackifyTreeRenderer
+
+FULL = build_parser(SlackifyMarkdown, pruned=False)
+PRUNED = build_parser(SlackifyMarkdown)
+TREE = SlackifyTreeRenderer()
+# PRUNED with markdown-it's own text and entity rules.
+STOCK = build_parser(SlackifyMarkdown)
+STOCK.inline.ruler.at("text", text)
+STOCK.inline.ruler.at("entity", entity)
+
+
+def _test_corpus():
+    """
+    Every markdown string the conversion tests feed in.
+    """
+    tree = ast.parse(pathlib.Path(__file__).with_name("test_convert.py").read_text())
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.Assign) or not isinstance(node.value, ast.Constant):
+            continue
+        if any(getattr(target, "id", None) == "markdown" for target in node.targets):
+            yield node.value.value
+
+
+# Fragments for everything the pruned rules could affect: raw HTML, tables,
+# bare URLs, rules, entities, escapes and autolinks, next to what the
+# renderer does support.
+FRAGMENTS = [
+    "plain words",
+    "<div>html block</div>",
+    "<span>inline</span> html",
+    "<!-- comment -->",
+    "<@U123> <#C1|general> <!here> <!subteam^S1|team>",
+    "| a | b |\n|---|---|\n| 1 | 2 |",
+    "https://bare.example.com www.example.com",
+    "<https://auto.link> <mail@example.com>",
+    "***",
+    "---",
+    "text\n---",
+    "&amp; &copy; &#35; & < >",
+    "\\* \\_ \\< \\> \\[x\\]",
+    "**bold** _em_ ~~strike~~ `code`",
+    "[link](https://e.com) ![img](https://e.com/a.png)",
+    "[ref]\n\n[ref]: https://ref.example",
+    "- item\n  - nested",
+    "1. one\n2. two",
+    "> quote\n> more",
+    "```\ncode <b>\n```",
+    "    indented",
+    "# heading",
+    "line  \nbreak",
+    "",
+]
+
+
+@pytest.mark.parametrize("markdown", list(_test_corpus()))
+def test_pruned_parser_matches_full_preset_on_test_corpus(markdown):
+    assert PRUNED.render(markdown) == FULL.render(markdown)
+
+
+def test_pruned_parser_matches_full_preset_on_fuzzed_documents(random_documents):
+    separators = ("\n", "\n\n", " ")
+    for markdown in random_documents(11, 1500, FRAGMENTS, separators=separators):
+        assert PRUNED.render(markdown) == FULL.render(markdown), repr(markdown)
+        assert TREE.render(PRUNED.parse(markdown)) == TREE.render(
+            FULL.parse(markdown)
+        ), repr(markdown)
+
+
+def test_pruned_parser_skips_unused_rules():
+    active = PRUNED.get_active_rules()
+    for rule in ("html_block", "html_inline", "linkify"):
+        assert all(rule not in chain for chain in active.values())
+
+
+def test_linear_inline_rules_match_markdown_it():
+    # Long runs of text that push no token, so the pending text is flushed,
+    # with line breaks (hard ones too) right at the flush point, and every
+    # kind of entity now and then.
+    plain = [
+        "word ",
+        "<@U1> & <!here> ",
+        "&",
+        "&#",
+        "&bogus;",
+        " ",
+        "  ",
+        "long run " * 50,
+    ]
+    tokens = ["&amp;", "&#35;", "&#x1F600;", "&#9999999;", "**b** ", "`c` ", "\\& "]
+    breaks = ["  \n", " \n", "\n"]
+    rng = random.Random(5)
+    for _ in range(100):
+        parts = []
+        for _ in range(rng.randint(1, 1000)):
+            roll = rng.random()
+            pool = tokens if roll < 0.01 else breaks if roll < 0.015 else plain
+            parts.append(rng.choice(pool))
+        markdown = "".join(parts)
+        assert PRUNED.render(markdown) == STOCK.render(markdown), repr(markdown)
@@ -0,0 +1,128 @@
+import pytest
+
+from slackify_markdown import (
+    RenderProfile,
+    SlackifyConverter,
+    slackify_chunks,
+    slackify_markdown,
+    slackify_with_metadata,
+)
+from slackify_markdown import service
+from slackify_markdown.profile import compile_profile
+
+from tests.test_tree import SAMPLES
+
+PLAIN = RenderProfile(
+    bullets=("-", "+"),
+    indent="  ",
+    bullet_format="{bullet} ",
+    ordered_format="{number}) ",
+    heading_format="_{text}_",
+    link_format="{text} ({url})",
+    bare_link_format="{url}",
+    image_format="{text}: {url}",
+    bare_image_format="image: {url}",
+)
+
+DOCUMENT = (
+    "# Title **bold**\n\n"
+    "- a\n  - b\n    - c\n\n"
+    "3. three\n4. four\n\n"
+    "[docs](https://e.com/d) and [](https://e.com/empty) "
+    "![logo](https://e.com/l.png) ![](https://e.com/x.png)\n"
+)
+
+
+@pytest.mark.parametrize("engine", ["tokens", "tree"])
+@pytest.mark.parametrize("markdown", SAMPLES)
+def test_default_profile_matches_default_output(markdown, engine):
+    default = SlackifyConverter(engine=engine)
+    profiled = SlackifyConverter(engine=engine, profile=RenderProfile())
+    assert profiled.convert(markdown) == default.convert(markdown)
+
+
+@pytest.mark.parametrize("engine", ["tokens", "tree"])
+def test_profile_changes_markers_headings_and_links(engine):
+    converter = SlackifyConverter(engine=engine, profile=PLAIN)
+    assert converter.convert(DOCUMENT) == (
+        "_Title *bold*_\n\n"
+        "- a\n  + b\n    + c\n\n"
+        "3) three\n4) four\n\n"
+        "docs (https://e.com/d) and https://e.com/empty "
+        "logo: https://e.com/l.png image: https://e.com/x.png\n"
+    )
+
+
+@pytest.mark.parametrize("markdown", SAMPLES)
+def test_engines_agree_under_a_profile(markdown):
+    tokens = SlackifyConverter(profile=PLAIN)
+    tree = SlackifyConverter(engine="tree", profile=PLAIN)
+    assert tree.convert(markdown) == tokens.convert(markdown)
+
+
+def test_lists_deeper_than_the_precomputed_prefixes():
+    # Prefixes are precomputed to depth 8; markdown-it stops nesting at 10.
+    markdown = "".join("  " * depth + "- d{}\n".format(depth) for depth in range(9))
+    profile = RenderProfile(bullets=("a", "b"), indent=".")
+    for engine in ("tokens", "tree"):
+        converter = SlackifyConverter(engine=engine, profile=profile)
+        lines = converter.convert(markdown).splitlines()
+        assert lines[0] == "a   d0"
+        assert lines[8] == "." * 8 + "b   d8"
+
+
+def test_profiles_are_hashable_and_compiled_once():
+    twin = RenderProfile(**PLAIN._asdict())
+    assert hash(twin) == hash(PLAIN)
+    assert compile_profile(twin) is compile_profile(PLAIN)
+    with pytest.raises(AttributeError):
+        PLAIN.indent = "\t"
+
+
+def test_bullets_given_as_a_list_are_stored_as_a_tuple():
+    profile = RenderProfile(bullets=["-", "+"])
+    assert profile.bullets == ("-", "+")
+    assert compile_profile(profile) is compile_profile(
+        RenderProfile(bullets=("-", "+"))
+    )
+    assert slackify_markdown("- a\n  - b\n", profile=profile) == "-   a\n    +   b\n"
+
+
+def test_module_functions_reuse_one_converter_per_profile():
+    expected = SlackifyConverter(profile=PLAIN).convert(DOCUMENT)
+    assert slackify_markdown(DOCUMENT, profile=PLAIN) == expected
+    converter = service._profile_converters[PLAIN]
+    text, metadata = slackify_with_metadata(
+        DOCUMENT, profile=RenderProfile(**PLAIN._asdict())
+    )
+    assert text == expected
+    assert metadata.links == ["https://e.com/d", "https://e.com/empty"]
+    assert service._profile_converters[PLAIN] is converter
+    assert slackify_markdown(DOCUMENT) == SlackifyConverter().convert(DOCUMENT)
+
+
+def test_block_features_render_with_the_converter_profile():
+    converter = SlackifyConverter(profile=PLAIN)
+    chunks = slackify_chunks(DOCUMENT, max_chars=40, converter=converter)
+    assert "".join(chunks).replace("\n", "") == converter.convert(DOCUMENT).replace(
+        "\n", ""
+    )
+
+
+@pytest.mark.parametrize(
+    "fields",
+    [
+        {"bullets": ()},
+        {"ordered_format": "{n}. "},
+        {"heading_format": "*heading*"},
+        {"heading_format": "{text} {text}"},
+        {"link_format": "<{href}|{text}>"},
+        {"image_format": "<{url}|{alt}>"},
+        {"bullet_format": "{bullet"},
+        {"table_width": 0},
+        {"table_rows": 0},
+    ],
+)
+def test_malformed_profiles_are_rejected(fields):
+    with pytest.raises(ValueError):
+        SlackifyConverter(profile=RenderProfile(**fields))
@@ -0,0 +1,141 @@
+import random
+
+import pytest
+
+from slackify_markdown import StreamingSlackifier, slackify_markdown
+
+DOCUMENTS = [
+    "",
+    "plain text",
+    "# Title\n\nSome **bold** and _italic_ text.\n\n- a\n- b\n  - c\n\n1. one\n\n2. two\n",
+    "```python\ndef f():\n\n\n    return 1\n```\nafter the fence\n\n> quote\n> more\n\nend",
+    "para\n---\n\nsetext above\n===\n\n    indented code\n\ntext",
+    "1. a\n\n2. b\n\n3\n\n* x\n* y\n\n***\n\n<@U1> & <#C2> > 3",
+    "Line one  \nhard break\r\nwindows line\rold mac\n\n- [link](https://example.com)\n- ![img](https://example.com/i.png)",
+    "- deep\n  - deeper\n    - deepest\n      - bottom\n\n\n\n\nafter gap",
+    "unclosed **bold and `code\n\n```\nunclosed fence\n",
+    "[ref] used before definition\n\n[ref]: https://example.com\n\nafter",
+    "x\n| a | b |\n|--|:-:|\n| 1 | 2 |\n\n| not |\n|-a-|\n",
+    "x\n| a |\n|--b|\n",
+]
+
+
+def _random_chunks(rng, text, longest):
+    chunks, pos = [], 0
+    while pos < len(text):
+        step = rng.randint(1, longest)
+        chunks.append(text[pos:][:step])
+        pos += step
+    return chunks
+
+
+def _chunkings(text, seed):
+    rng = random.Random(seed)
+    yield list(text)
+    yield [text]
+    for _ in range(5):
+        yield _random_chunks(rng, text, 12)
+
+
+@pytest.mark.parametrize("text", DOCUMENTS)
+def test_streaming_matches_full_conversion(text):
+    expected = slackify_markdown(text)
+    has_references = "]:" in text
+    for chunks in _chunkings(text, seed=len(text)):
+        stream = StreamingSlackifier()
+        received = ""
+        for chunk in chunks:
+            received += chunk
+            current = stream.feed(chunk)
+            if not has_references:
+                assert current == slackify_markdown(received)
+                assert expected.startswith(stream.stable)
+        assert stream.finish() == expected
+
+
+BLOCK_PIECES = [
+    "para **b",
+    "old** text",
+    "- item",
+    "  - nested",
+    "1. first",
+    "2",
+    ". second",
+    "> quote",
+    "```",
+    "code",
+    "# head",
+    "---",
+    "    indented",
+    "",
+    "",
+    "<@U1> & > <x",
+    "| a | b |",
+    "|--|--|",
+    "|-",
+    "-|",
+    "| 1 | 2 |",
+]
+
+
+def test_streaming_random_documents(random_documents):
+    rng = random.Random(7)
+    for text in random_documents(7, 150, BLOCK_PIECES, (1, 25), ("\n",)):
+        stream = StreamingSlackifier()
+        received = ""
+        for chunk in _random_chunks(rng, text, 9):
+            received += chunk
+            assert stream.feed(chunk) == slackify_markdown(received), repr(received)
+        assert stream.finish() == slackify_markdown(text)
+
+
+LONG_BLOCKS = [
+    "".join(f"- step {i} with **bold**\n" for i in range(30)),
+    "".join(f"{i + 1}. step {i}\n   more {i}\n" for i in range(20)),
+    # A blank line late in the list makes every item loose.
+    "".join(f"* item {i}\n" for i in range(20)) + "\n* last\n\nafter\n",
+    "  - indented\n" * 20 + "    - nested\n  - back\n",
+    "```sh\n" + "".join(f"run {i} < a & b\n" for i in range(30)) + "```\nafter\n",
+    "~~~\n" + "#!sh\n" * 10 + "echo\n" * 10 + "#!\n~~~\n",
+]
+
+
+@pytest.mark.parametrize("text", LONG_BLOCKS)
+def test_streaming_long_block_matches_full_conversion(text):
+    rng = random.Random(len(text))
+    stream = StreamingSlackifier()
+    received = ""
+    cut = False
+    for chunk in _random_chunks(rng, text, 9):
+        received += chunk
+        assert stream.feed(chunk) == slackify_markdown(received), repr(received)
+        # The finished start of the open block has been rendered once.
+        cut = cut or stream._head is not None
+    assert cut
+    assert stream.finish() == slackify_markdown(text)
+
+
+def test_feed_returns_current_conversion():
+    stream = StreamingSlackifier()
+    assert stream.feed("**bo") == "**bo\n"
+    assert stream.feed("ld**") == "*bold*\n"
+    assert stream.feed("\n\nnext") == "*bold*\n\nnext\n"
+    # "next" could still become e.g. a list marker line, so nothing is final.
+    assert stream.stable == ""
+    assert stream.feed(" line\n") == "*bold*\n\nnext line\n"
+    # "next line" could still become a table header over a delimiter row.
+    assert stream.stable == ""
+    assert stream.feed("more\n") == "*bold*\n\nnext line\nmore\n"
+    assert stream.stable == "*bold*"
+
+
+def test_unclosed_fence_renders_closed():
+    stream = StreamingSlackifier()
+    assert stream.feed("```\nx = 1\n") == "```\nx = 1\n```\n"
+
+
+def test_feed_after_finish_raises():
+    stream = StreamingSlackifier()
+    stream.finish()
+    with pytest.raises(ValueError):
+        stream.feed("more")
@@ -0,0 +1,144 @@
+import pytest
+
+from slackify_markdown import (
+    RenderProfile,
+    SlackifyConverter,
+    slackify_blocks,
+    slackify_chunks,
+    slackify_markdown,
+)
+from slackify_markdown.fastpath import is_plain_text
+
+ENGINES = ["tokens", "tree"]
+
+TABLE = (
+    "| Name | Qty | Note |\n"
+    "|:-----|----:|:----:|\n"
+    "| **apple** | 3 | [shop](https://e.com/a) |\n"
+    "| `pear\\|x` | 12 | ![pic](https://e.com/p.png) |\n"
+    "| fig |\n"
+)
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_table_is_an_aligned_preformatted_block(engine):
+    converter = SlackifyConverter(engine=engine)
+    assert converter.convert("Stock:\n\n" + TABLE + "\nafter") == (
+        "Stock:\n\n"
+        "```\n"
+        "Name   | Qty |          Note\n"
+        "-------+-----+-----------------------\n"
+        "apple  |   3 | shop (https://e.com/a)\n"
+        "pear|x |  12 |          pic\n"
+        "fig    |     |\n"
+        "```\n"
+        "after\n"
+    )
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_table_cells_are_collected_into_metadata(engine):
+    _, metadata = SlackifyConverter(engine=engine).convert_with_metadata(TABLE)
+    assert metadata.links == ["https://e.com/a"]
+    assert metadata.images == ["https://e.com/p.png"]
+    assert metadata.code_blocks == []
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_long_cells_are_cut_and_wide_tables_lose_columns(engine):
+    header = "| " + " | ".join("c{}".format(idx) for idx in range(10)) + " |\n"
+    rule = "|" + "---|" * 10 + "\n"
+    row = "| " + " | ".join(["abcdefgh"] * 10) + " |\n"
+    profile = RenderProfile(table_cell_width=5, table_width=30)
+    converter = SlackifyConverter(engine=engine, profile=profile)
+    assert converter.convert(header + rule + row) == (
+        "```\n"
+        "c0    | c1    | c2    | …\n"
+        "------+-------+-------+--\n"
+        "abcd… | abcd… | abcd… | …\n"
+        "```\n"
+    )
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_rows_past_table_rows_are_dropped(engine):
+    rows = "".join("| {} |\n".format(idx) for idx in range(5))
+    converter = SlackifyConverter(engine=engine, profile=RenderProfile(table_rows=2))
+    assert converter.convert("| n |\n|---|\n" + rows + "\nafter") == (
+        "```\nn\n-\n0\n1\n…\n```\nafter\n"
+    )
+
+
+def test_cells_that_cannot_be_shown_are_not_parsed():
+    header = "|" + "|".join("c" for _ in range(2000)) + "|\n"
+    rule = "|" + "-|" * 2000 + "\n"
+    markdown = header + rule + header * 200
+    tokens = SlackifyConverter()._parse(markdown)
+    # 30 one-character columns fill the default 120-character width.
+    assert sum(token.type == "inline" for token in tokens) == 30 * 101
+    assert tokens[0].meta == {"columns": 2000, "rows": 200}
+    lines = slackify_markdown(markdown).split("\n")
+    assert lines[1] == " | ".join(["c"] * 29 + ["…"])
+    assert lines[-3:] == ["…", "```", ""]
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_cells_are_escaped_after_layout(engine):
+    markdown = "| a | b |\n|---|---|\n| <b> & <!here> | 1 |\n"
+    converter = SlackifyConverter(engine=engine)
+    converted, metadata = converter.convert_with_metadata(markdown)
+    assert converted == (
+        "```\n"
+        "a             | b\n"
+        "--------------+--\n"
+        "&lt;b&gt; &amp; <!here> | 1\n"
+        "```\n"
+    )
+    # The table is a code block, where mentions don't notify.
+    assert metadata.mentions == []
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_backtick_runs_in_cells_cannot_close_the_code_block(engine):
+    markdown = "| ```x | y |\n|---|---|\n| **1** | `` ` `` |\n"
+    converted = SlackifyConverter(engine=engine).convert(markdown)
+    lines = converted.split("\n")
+    assert lines[0] == lines[-2] == "```"
+    assert not any("``" in line for line in lines[1:-2])
+    assert lines[1] == "`\u200b`\u200b`x | y"
+
+
+def test_tree_engine_indents_a_table_in_a_list_item():
+    markdown = "- item\n\n  | a | b |\n  |---|---|\n  | 1 | 2 |\n- next"
+    assert SlackifyConverter(engine="tree").convert(markdown) == (
+        "•   item\n\n    ```\n    a | b\n    --+--\n    1 | 2\n    ```\n•   next\n"
+    )
+
+
+def test_delimiter_rows_are_not_plain_text():
+    for markdown in ("a | b\n:-- | --:\nc | d", "|a|b|\n|-|-|\n|c|d|"):
+        assert not is_plain_text(markdown)
+        assert slackify_markdown(markdown).startswith("```\na")
+
+
+def test_block_kit_table_is_preformatted():
+    blocks = slackify_blocks("| a | b |\n|---|--:|\n| xx | 1 |")
+    assert blocks == [
+        {
+            "type": "rich_text",
+            "elements": [
+                {
+                    "type": "rich_text_preformatted",
+                    "elements": [{"type": "text", "text": "a  | b\n---+--\nxx | 1"}],
+                }
+            ],
+        }
+    ]
+
+
+def test_chunks_split_a_long_table_as_a_code_block():
+    rows = "".join("| row {} | value {} |\n".format(idx, idx) for idx in range(200))
+    markdown = "| key | value |\n|---|---|\n" + rows
+    chunks = list(slackify_chunks(markdown, max_chars=500))
+    assert len(chunks) > 1
+    assert all(chunk.startswith("```") and chunk.endswith("```") for chunk in chunks)
@@ -0,0 +1,132 @@
+import random
+
+import pytest
+
+from slackify_markdown import RenderProfile, SlackifyConverter, compile_template
+
+ENGINES = ["tokens", "tree"]
+
+ALERT = (
+    "# {service} is {state}\n\n"
+    "- **Owner** {owner}\n"
+    "- **Since** `{since}`\n"
+    "- [Runbook]({runbook})\n\n"
+    "```\n{log}\n```\n"
+)
+
+PIECES = [
+    "para {a} **{b}** _{c}_",
+    "- {a}\n- {b}",
+    "1. {c}\n   - {a}",
+    "> {b} quoted",
+    "`{a}` and {b}",
+    "```\n{c}\n```",
+    "# {a} heading",
+    "[{b}](https://e.com/{c}) <@U1>",
+    "{a}{b} & {c}",
+    "{{literal}} {a}",
+]
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_plain_values_match_format_then_convert(engine, random_documents):
+    converter = SlackifyConverter(engine=engine)
+    rng = random.Random(5)
+    words = ["deploy", "api", "ok", "prod", "x"]
+    for source in random_documents(5, 200, PIECES, (1, 5), ("\n\n",)):
+        template = compile_template(source, converter)
+        values = {name: rng.choice(words) for name in "abc"}
+        assert template.render(**values) == converter.convert(
+            source.format(**values)
+        ), source
+
+
+def test_values_are_literal_and_escaped():
+    template = compile_template(ALERT)
+    assert template.render(
+        service="*api* <b>",
+        state="- down & out",
+        owner="<@U123>",
+        since="a < b",
+        runbook="https://e.com/run book",
+        log="x > y\n- not a list",
+    ) == (
+        "**api* &lt;b&gt; is - down &amp; out*\n\n"
+        "•   *Owner* <@U123>\n"
+        "•   *Since* `a < b`\n"
+        "•   <https://e.com/run%20book|Runbook>\n\n"
+        "```\nx > y\n- not a list\n```\n"
+    )
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "https://E.com/a?b=1&c=2#x",
+        "HTTP://e.com:80/x",
+        "https://user@e.com/",
+        "https://e.com/é",
+        "https://e.com/%41%zz",
+        "mailto:a@b.co",
+        "relative/path",
+    ],
+)
+def test_link_values_are_encoded_like_link_destinations(url):
+    template = compile_template("[l]({url})")
+    assert template.render(url=url) == SlackifyConverter().convert("[l](" + url + ")")
+
+
+def test_unsafe_link_values_are_dropped():
+    template = compile_template("[click]({url})")
+    assert template.render(url="javascript:alert(1)") == "<|click>\n"
+
+
+def test_autolink_values_are_encoded_like_link_destinations():
+    template = compile_template("see <https://e.com/issues/{id}>")
+    expected = "see <https://e.com/issues/7|https://e.com/issues/7>\n"
+    assert template.render(id="7") == expected
+    # Can't end the link early or add a label of its own.
+    assert template.render(id="1|x> <!here>") == (
+        "see <https://e.com/issues/1%7Cx%3E%20%3C!here%3E"
+        "|https://e.com/issues/1%7Cx%3E%20%3C!here%3E>\n"
+    )
+
+
+def test_placeholders_and_formatting():
+    template = compile_template("[{label}]({url}) {label} {count:>4} {name!r} {{x}}")
+    assert template.placeholders == ("label", "url", "count", "name")
+    rendered = template.render(label="l", url="u", count=7, name="n")
+    assert rendered == "<u|l> l    7 'n' {x}\n"
+    with pytest.raises(KeyError):
+        template.render(label="l")
+
+
+def test_marker_text_in_the_template_is_kept():
+    template = compile_template("zq0zq zqq1zqq {a}")
+    assert template.render(a="v") == "zq0zq zqq1zqq v\n"
+
+
+def test_template_uses_the_converter_profile():
+    converter = SlackifyConverter(
+        profile=RenderProfile(bullets=("-",), heading_format="{text}")
+    )
+    template = compile_template("# {title}\n\n- {item}", converter)
+    assert template.render(title="t", item="i") == "t\n\n-   i\n"
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "{}",
+        "{0}",
+        "{a.b}",
+        "{a!x}",
+        "{a",
+        "| a |\n|---|\n| {x} |",
+        "![{x}](https://e.com/a.png)",
+        "![a]({x})",
+    ],
+)
+def test_unsupported_placeholders_are_rejected(source):
+    with pytest.raises(ValueError):
+        compile_template(source)
@@ -0,0 +1,106 @@
+import pytest
+
+from slackify_markdown import (
+    IncrementalSlackifier,
+    SlackifyConverter,
+    StreamingSlackifier,
+    slackify_chunks,
+)
+
+TOKENS = SlackifyConverter()
+TREE = SlackifyConverter(engine="tree")
+
+# Documents that avoid the limitations the tree engine fixes (continuation
+# lines in list items and blockquotes), so both engines must agree.
+SAMPLES = [
+    "",
+    "plain text with & < > and <@U123> <#C1|general> <!here>",
+    "**Bold** and _Italic_ with ~~strike~~ and `code`.",
+    "# Heading **bold**\n\n## Second\n\nParagraph.",
+    "- a\n- b\n  - c\n    - d\n      - e\n\nafter",
+    "1. one\n2. two\n   - nested\n3. three\n\n10. ten\n11. eleven",
+    "- loose\n\n- list\n\n- items",
+    "> single line quote\n\nafter",
+    "```python\n#!python\nx = 1\n\n\n\ny = 2\n```\n\n    indented code\n\ntext",
+    "[link](https://example.com) <https://auto.link> ![img](https://e.com/a.png) ![rel](a.png)",
+    "[**bold link**](https://example.com) and [](https://empty.example)",
+    "line one  \nhard break\nsoft break",
+    "para\n\n\n\n\nfar para\n\n***\n\nafter rule",
+    "| a | b | c |\n|:-:|--:|---|\n| 1 | [l](https://e.com) | `x\\|y` |\n\nafter table",
+    "before\x02\x02\x02after",
+]
+
+
+@pytest.mark.parametrize("markdown", SAMPLES)
+def test_tree_engine_matches_token_engine(markdown):
+    assert TREE.convert(markdown) == TOKENS.convert(markdown)
+
+
+def test_tree_engine_matches_on_random_documents(random_documents):
+    pieces = [
+        "para **b** _i_ <@U1> & >",
+        "- item",
+        "* item",
+        "  - nested",
+        "1. first",
+        "> quote",
+        "```",
+        "code",
+        "# head",
+        "---",
+        "",
+        "",
+        "[l](https://e.com)",
+    ]
+    # Keep every block on one line: multi-line blocks inside containers are
+    # exactly where the engines are meant to differ.
+    for markdown in random_documents(3, 300, pieces, (1, 12), ("\n\n",)):
+        assert TREE.convert(markdown) == TOKENS.convert(markdown), repr(markdown)
+
+
+def test_list_item_continuation_keeps_indent():
+    markdown = "- first line\n  soft continuation\n\n  second paragraph\n- next"
+    assert TREE.convert(markdown) == (
+        "•   first line\n    soft continuation\n\n    second paragraph\n\n•   next\n"
+    )
+
+
+def test_nested_item_continuation_keeps_indent():
+    markdown = "1. one\n   - sub\n     more"
+    assert TREE.convert(markdown) == "1.  one\n    ◦   sub\n        more\n"
+
+
+def test_code_block_in_list_item_is_indented():
+    markdown = "- item\n\n  ```\n  code\n\n  more\n  ```\n- next"
+    assert TREE.convert(markdown) == (
+        "•   item\n\n    ```\n    code\n\n    more\n    ```\n•   next\n"
+    )
+
+
+def test_multi_line_blockquote_prefixes_every_line():
+    markdown = "> a\n> b\n>\n> c\n> - item\n\nafter"
+    assert TREE.convert(markdown) == "> a\n> b\n>\n> c\n>\n> •   item\n\nafter\n"
+
+
+def test_blank_line_before_quote_has_no_prefix():
+    assert TREE.convert("# Head\n\n> quote") == "*Head*\n\n> quote\n"
+
+
+@pytest.mark.parametrize("markdown", [">\n\nabc", "> ---\n\nabc"])
+def test_empty_leading_quote_adds_no_newline(markdown):
+    assert TREE.convert(markdown) == "abc\n"
+
+
+def test_unknown_engine_is_rejected():
+    with pytest.raises(ValueError):
+        SlackifyConverter(engine="nope")
+
+
+def test_block_by_block_helpers_reject_the_tree_engine():
+    with pytest.raises(ValueError, match="engine='tokens'"):
+        StreamingSlackifier(TREE)
+    with pytest.raises(ValueError, match="engine='tokens'"):
+        IncrementalSlackifier(TREE)
+    with pytest.raises(ValueError, match="engine='tokens'"):
+        slackify_chunks("- a", converter=TREE)
+    assert StreamingSlackifier(TOKENS).finish() == "\n"
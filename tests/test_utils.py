@@ -0,0 +1,76 @@
+import time
+
+import pytest
+
+from slackify_markdown.utils import escape_specials, escape_specials_bytes
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("", ""),
+        ("a & b", "a &amp; b"),
+        ("<tag> and >x<", "&lt;tag&gt; and &gt;x&lt;"),
+        ("<@U123> hi", "<@U123> hi"),
+        ("<#C1|general> <!here>", "<#C1|general> <!here>"),
+        ("<@U1&x> > 1", "<@U1&amp;x> &gt; 1"),
+        ("<@U1<b>", "<@U1&lt;b>"),
+        ("<@U1 <@U2>", "<@U1 <@U2>"),
+        ("<@unclosed & more", "<@unclosed &amp; more"),
+        ("a > <@U1> > b <@open", "a &gt; <@U1> &gt; b <@open"),
+    ],
+)
+def test_escape_specials(text, expected):
+    assert escape_specials(text) == expected
+
+
+def _best_time(func, arg, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(arg)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+@pytest.mark.parametrize(
+    "unit",
+    [
+        "<@U12345> > ",
+        "> ",
+        "<@U1 ",
+        "<@U1 > <#C1> & <x ",
+    ],
+    ids=["mentions-and-gt", "gt-only", "unclosed-mentions", "mixed"],
+)
+def test_escape_specials_scales_linearly(unit):
+    small = unit * 10_000
+    large = unit * 100_000
+    ratio = _best_time(escape_specials, large) / _best_time(escape_specials, small)
+    # 10x more input should cost roughly 10x; a quadratic path costs ~100x.
+    assert ratio < 30
+
+
+def test_escape_specials_bytes_matches_str(random_documents):
+    pieces = [
+        "<",
+        "@",
+        "#",
+        "!",
+        ">",
+        "&",
+        "a",
+        " ",
+        "\n",
+        "<@U1>",
+        "<#C|x&y<z>",
+        "<!here",
+        "é",
+    ]
+    for text in random_documents(3, 20000, pieces, sizes=(0, 12)):
+        assert escape_specials_bytes(text.encode("utf-8")) == escape_specials(
+            text
+        ).encode("utf-8")
+    collected = []
+    assert escape_specials("<@U1> & <!here>", collected) == "<@U1> &amp; <!here>"
+    assert collected == ["<@U1>", "<!here>"]